@@ -42,6 +42,11 @@ class AdminDashboard:
                     "total_cost": 0.0,
                     "last_reset": datetime.now().isoformat()
                 },
+                "tts_warmup": {
+                    "enabled": True,
+                    "languages": [],  # Empty: every language with a tutor
+                    "phrases": {}  # Extra phrases per language code
+                },
                 "admin_features": {
                     "enable_gemini_tts": False,
                     "enable_cost_tracking": True,
@@ -88,6 +93,16 @@ class AdminDashboard:
         self.save_config()
         return True
     
+    def get_tts_warmup_settings(self) -> Dict[str, Any]:
+        """Get TTS warm-up settings (configs written before warm-up existed get the defaults)"""
+        return {"enabled": True, "languages": [], "phrases": {}, **self.config.get("tts_warmup", {})}
+
+    def update_tts_warmup_settings(self, settings: Dict[str, Any]) -> bool:
+        """Update TTS warm-up settings"""
+        self.config["tts_warmup"] = {**self.get_tts_warmup_settings(), **settings}
+        self.save_config()
+        return True
+    
     def get_google_api_settings(self) -> Dict[str, Any]:
         """Get current Google API settings"""
         return self.config.get("google_api_settings", {
@@ -192,6 +207,12 @@ class AdminDashboard:
             "last_reset": self.config["usage_stats"].get("last_reset", "never")
         }
     
+    def get_effective_tts(self) -> str:
+        """Active TTS tier, or 'system' while Google API services are disabled"""
+        if not self.is_google_api_enabled():
+            return "system"
+        return self.config["tts_settings"].get("active_tts", "system")
+    
     def is_gemini_allowed(self) -> bool:
         """Check if Gemini TTS is allowed"""
         return self.config["tts_settings"]["gemini_enabled"]
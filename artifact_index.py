@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Artifact Index
+In-memory map of generated files (TTS output, uploads) served through /uploads
+"""
+
+import os
+import re
+import time
+import uuid
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from audio_utils import format_for_path, AUDIO_FORMATS
+from tts_cache import normalize_sentence
+
+# Directories served by /uploads, in lookup order
+ARTIFACT_DIRS = [
+    os.path.join('server', 'dist', 'uploads'),
+    'uploads',
+    'tts_output',
+    '.',
+]
+
+# tts_<32 hex>.<ext> names are derived from their content and never change
+CONTENT_ADDRESSED_NAME = re.compile(r'^tts_[0-9a-f]{32}\.[a-z0-9]+$')
+
+
+def content_addressed_name(prefix: str, extension: str, *parts: str) -> str:
+    """Build a filename from a hash of everything that determines the file's content."""
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+    return f"{prefix}_{digest}{extension}"
+
+
+def tts_filename(tts_tier: str, language_code: str, audio_format: str, text: str) -> str:
+    """Content-addressed filename for TTS output of text with the given tier, language and format."""
+    return content_addressed_name(
+        'tts', AUDIO_FORMATS[audio_format][1], tts_tier, language_code, audio_format, normalize_sentence(text)
+    )
+
+
+def is_content_addressed(filename: str) -> bool:
+    """True if the filename is a content hash, so it can be cached forever."""
+    return bool(CONTENT_ADDRESSED_NAME.match(filename))
+
+
+class ArtifactIndex:
+    """Filename -> path index with per-file access statistics"""
+
+    def __init__(self, directories: Optional[List[str]] = None):
+        self.directories = directories or ARTIFACT_DIRS
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        """Index files already on disk (top level of every directory except '.')."""
+        for directory in self.directories:
+            if directory == '.' or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.path.isfile(path) and name not in self._entries:
+                    self._entries[name] = self._entry(path)
+
+    def _entry(self, path: str) -> Dict[str, Any]:
+        stat = os.stat(path)
+        return {
+            "path": path,
+            "size": stat.st_size,
+            "created": stat.st_mtime,
+            "last_access": stat.st_mtime,
+            "hits": 0
+        }
+
+    def register(self, path: str) -> Optional[str]:
+        """Add or refresh a newly written file; returns its filename."""
+        if not path or not os.path.isfile(path):
+            return None
+        name = os.path.basename(path)
+        entry = self._entry(path)
+        with self._lock:
+            previous = self._entries.get(name)
+            if previous:
+                entry["hits"] = previous["hits"]
+            self._entries[name] = entry
+        return name
+
+    def publish(self, result: Dict[str, Any], text: str, language_code: str) -> Optional[str]:
+        """
+        Index the file of a successful synthesis result; returns the filename to serve.
+
+        Real speech is renamed to the content-addressed name of the backend
+        that produced it (result["backend"]) and its actual format. Placeholder
+        audio (silence or tones standing in for failed speech), or audio whose
+        origin is unknown, is moved to a one-off name and not indexed, so it is never served as the immutable
+        audio of its text. result["output_path"] is updated to match.
+        """
+        path = result.get("output_path")
+        if not result.get("success") or not path or not os.path.isfile(path):
+            return None
+
+        audio_format = format_for_path(path)
+        speech = not result.get("placeholder") and result.get("backend") and audio_format in AUDIO_FORMATS
+        if speech:
+            name = tts_filename(result["backend"], language_code, audio_format, text)
+        else:
+            name = f"tts_placeholder_{uuid.uuid4().hex[:16]}{os.path.splitext(path)[1]}"
+        final_path = os.path.join(os.path.dirname(path), name)
+        if final_path != path:
+            os.replace(path, final_path)
+            result["output_path"] = final_path
+        return self.register(final_path) if speech else name
+
+    def find_tts(self, backends: List[str], language_code: str, audio_format: str,
+                 text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (filename, path) of existing audio of text from the first backend that has it."""
+        for backend in backends:
+            filename = tts_filename(backend, language_code, audio_format, text)
+            path = self.lookup(filename)
+            if path:
+                return filename, path
+        return None, None
+
+    def lookup(self, filename: str) -> Optional[str]:
+        """
+        Return the path for a filename and record the access.
+
+        Files written by other processes are found by probing the artifact
+        directories once and then indexed.
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry and os.path.isfile(entry["path"]):
+                entry["hits"] += 1
+                entry["last_access"] = time.time()
+                return entry["path"]
+            if entry:
+                del self._entries[filename]
+
+        for directory in self.directories:
+            # Only audio is served from the working directory, never config or code
+            if directory == '.' and not format_for_path(filename):
+                continue
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                self.register(path)
+                return self.lookup(filename)
+        return None
+
+    def contains(self, filename: str) -> bool:
+        """True if the filename is indexed and still on disk (not counted as an access)."""
+        with self._lock:
+            entry = self._entries.get(filename)
+        return bool(entry and os.path.isfile(entry["path"]))
+
+    def remove(self, filename: str):
+        """Forget a file (after it has been deleted)."""
+        with self._lock:
+            self._entries.pop(filename, None)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of all entries."""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._entries.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "artifacts": len(self._entries),
+                "bytes": sum(entry["size"] for entry in self._entries.values()),
+                "hits": sum(entry["hits"] for entry in self._entries.values())
+            }
+
+
+# Global artifact index instance
+artifact_index = None
+
+def get_artifact_index() -> ArtifactIndex:
+    """Get or create the global artifact index instance."""
+    global artifact_index
+    if artifact_index is None:
+        artifact_index = ArtifactIndex()
+    return artifact_index
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Audio Utilities
+numpy-backed helpers for decoding, analysing and re-encoding PCM audio
+"""
+
+import io
+import os
+import struct
+import subprocess
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Optional: PyAV decodes/encodes in-process instead of spawning ffmpeg
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+# Sample rate used for speech analysis (transcription segmenting, scoring)
+SPEECH_SAMPLE_RATE = 16000
+
+
+def decode_to_pcm(audio_bytes: bytes, sample_rate: int = SPEECH_SAMPLE_RATE) -> Optional[np.ndarray]:
+    """
+    Decode an audio buffer to mono 16-bit PCM.
+
+    Decoding runs in-process with PyAV when it is installed; otherwise the
+    buffer is piped through a single ffmpeg process (no temporary files).
+
+    Args:
+        audio_bytes: Encoded audio (webm, ogg, mp3, wav, aiff, ...)
+        sample_rate: Target sample rate of the returned samples
+
+    Returns:
+        int16 numpy array of samples, or None if decoding failed
+    """
+    if PYAV_AVAILABLE:
+        try:
+            return _decode_with_pyav(audio_bytes, sample_rate)
+        except Exception as e:
+            print(f"⚠️ PyAV decode failed, trying ffmpeg: {e}")
+
+    return _decode_with_ffmpeg(audio_bytes, sample_rate)
+
+
+def _decode_with_pyav(audio_bytes: bytes, sample_rate: int) -> np.ndarray:
+    with av.open(io.BytesIO(audio_bytes)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+        chunks = []
+        for frame in container.decode(stream):
+            chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        # Flush samples buffered inside the resampler
+        chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+    return np.concatenate(chunks).astype(np.int16) if chunks else np.zeros(0, dtype=np.int16)
+
+
+def _decode_with_ffmpeg(audio_bytes: bytes, sample_rate: int) -> Optional[np.ndarray]:
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-i', 'pipe:0',
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+    try:
+        result = subprocess.run(cmd, input=audio_bytes, capture_output=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        print(f"⚠️ ffmpeg decode not available or failed: {e}")
+        return None
+
+    if result.returncode != 0:
+        print(f"⚠️ ffmpeg decode failed: {result.stderr.decode('utf-8', 'ignore')[:200]}")
+        return None
+
+    return np.frombuffer(result.stdout, dtype='<i2').copy()
+
+
+def pcm_to_wav_bytes(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Serialize mono int16 samples to an in-memory WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+    return buffer.getvalue()
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    WAV header for PCM whose length is not known yet.
+
+    The RIFF and data sizes are set to the maximum value, which browsers and
+    ffmpeg treat as "read until end of stream", so the header can be sent
+    before the first sample is synthesized.
+    """
+    unknown = 0xFFFFFFFF
+    byte_rate = sample_rate * channels * sample_width
+    return (
+        b'RIFF' + struct.pack('<I', unknown) + b'WAVE'
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, channels, sample_rate, byte_rate,
+                                channels * sample_width, sample_width * 8)
+        + b'data' + struct.pack('<I', unknown)
+    )
+
+
+def frame_energy_db(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    """Return the RMS level (dBFS) of each non-overlapping frame."""
+    num_frames = len(samples) // frame_length
+    if num_frames == 0:
+        return np.zeros(0)
+    frames = samples[:num_frames * frame_length].astype(np.float32).reshape(num_frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames / 32768.0), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+
+def split_on_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    max_segment_seconds: float = 30.0,
+    min_segment_seconds: float = 10.0,
+    overlap_seconds: float = 1.0,
+    frame_ms: int = 20
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into overlapping segments, cutting at the quietest point available.
+
+    Each cut is placed inside [start + min_segment, start + max_segment] at the
+    centre of the longest low-energy run, so words are not split in half. Segments
+    are then widened by ``overlap_seconds`` on both sides of every cut.
+
+    Returns:
+        List of (start_sample, end_sample) pairs in order
+    """
+    total = len(samples)
+    max_len = int(max_segment_seconds * sample_rate)
+    if total <= max_len:
+        return [(0, total)]
+
+    frame_length = int(sample_rate * frame_ms / 1000)
+    energy = frame_energy_db(samples, frame_length)
+    if len(energy) == 0:
+        return [(0, total)]
+
+    # Anything within 6 dB of the noise floor counts as silence
+    noise_floor = np.percentile(energy, 10)
+    threshold = min(noise_floor + 6.0, -30.0)
+    silent = energy <= threshold
+
+    min_frames = int(min_segment_seconds * 1000 / frame_ms)
+    max_frames = int(max_segment_seconds * 1000 / frame_ms)
+
+    cuts = []
+    start_frame = 0
+    while len(energy) - start_frame > max_frames:
+        lo = start_frame + min_frames
+        hi = min(start_frame + max_frames, len(energy))
+        window = silent[lo:hi]
+
+        if window.any():
+            # Length of the silent run ending at each frame, then pick the longest
+            padded = np.concatenate(([False], window, [False])).astype(np.int8)
+            edges = np.diff(padded)
+            run_starts = np.flatnonzero(edges == 1)
+            run_ends = np.flatnonzero(edges == -1)
+            longest = np.argmax(run_ends - run_starts)
+            cut_frame = lo + (run_starts[longest] + run_ends[longest]) // 2
+        else:
+            cut_frame = lo + int(np.argmin(energy[lo:hi]))
+
+        cuts.append(cut_frame * frame_length)
+        start_frame = cut_frame
+
+    overlap = int(overlap_seconds * sample_rate)
+    boundaries = [0] + cuts + [total]
+    segments = []
+    for i in range(len(boundaries) - 1):
+        seg_start = max(0, boundaries[i] - (overlap if i > 0 else 0))
+        seg_end = min(total, boundaries[i + 1] + (overlap if i + 1 < len(boundaries) - 1 else 0))
+        segments.append((seg_start, seg_end))
+    return segments
+
+
+def read_audio_file(path: str, sample_rate: int) -> Optional[np.ndarray]:
+    """
+    Load an audio file as mono int16 samples at sample_rate.
+
+    16-bit PCM WAV files are read directly; everything else goes through ffmpeg.
+    """
+    try:
+        with wave.open(path, 'rb') as wf:
+            if wf.getsampwidth() == 2:
+                channels = wf.getnchannels()
+                file_rate = wf.getframerate()
+                samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+                if channels > 1:
+                    samples = samples.reshape(-1, channels).mean(axis=1)
+                return resample(samples, file_rate, sample_rate)
+    except (wave.Error, EOFError):
+        pass  # Not a PCM WAV file
+
+    with open(path, 'rb') as f:
+        return decode_to_pcm(f.read(), sample_rate)
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Resample mono audio with linear interpolation (adequate for speech)."""
+    samples = np.asarray(samples)
+    if from_rate == to_rate or len(samples) == 0:
+        return samples.astype(np.int16)
+    target_length = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(target_length) * (from_rate / to_rate)
+    resampled = np.interp(positions, np.arange(len(samples)), samples.astype(np.float32))
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -45.0, frame_ms: int = 10) -> np.ndarray:
+    """Remove leading and trailing frames quieter than threshold_db."""
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    energy = frame_energy_db(samples, frame_length)
+    voiced = np.flatnonzero(energy > threshold_db)
+    if len(voiced) == 0:
+        return samples
+    start = voiced[0] * frame_length
+    end = min(len(samples), (voiced[-1] + 1) * frame_length)
+    return samples[start:end]
+
+
+def normalize_loudness(samples: np.ndarray, target_dbfs: float = -20.0, peak_dbfs: float = -1.0) -> np.ndarray:
+    """Scale audio to a target RMS level without letting peaks exceed peak_dbfs."""
+    if len(samples) == 0:
+        return samples
+    audio = samples.astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(np.square(audio)))
+    peak = np.max(np.abs(audio))
+    if rms < 1e-6 or peak < 1e-6:
+        return samples
+    gain = min(10 ** (target_dbfs / 20.0) / rms, 10 ** (peak_dbfs / 20.0) / peak)
+    return np.clip(np.round(audio * gain * 32768.0), -32768, 32767).astype(np.int16)
+
+
+def concatenate_segments(
+    segments: List[np.ndarray],
+    sample_rate: int,
+    pause_ms: int = 150,
+    fade_ms: int = 5
+) -> np.ndarray:
+    """
+    Join speech segments with a fixed pause between them.
+
+    Each segment gets a short linear fade in/out so joins never click, and
+    the pause replaces whatever leading/trailing silence the engine produced.
+    """
+    fade = int(sample_rate * fade_ms / 1000)
+    pause = np.zeros(int(sample_rate * pause_ms / 1000), dtype=np.int16)
+
+    pieces = []
+    for index, segment in enumerate(segments):
+        segment = segment.astype(np.float32)
+        if fade and len(segment) > 2 * fade:
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+            segment[:fade] *= ramp
+            segment[-fade:] *= ramp[::-1]
+        if index:
+            pieces.append(pause)
+        pieces.append(np.round(segment).astype(np.int16))
+
+    return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int16)
+
+
+def segment_offsets_ms(segments: List[np.ndarray], sample_rate: int, pause_ms: int = 150) -> List[Tuple[int, int]]:
+    """Return the (start, end) position in ms of each segment joined by concatenate_segments."""
+    pause = int(sample_rate * pause_ms / 1000)
+    offsets = []
+    position = 0
+    for index, segment in enumerate(segments):
+        if index:
+            position += pause
+        offsets.append((round(position * 1000 / sample_rate), round((position + len(segment)) * 1000 / sample_rate)))
+        position += len(segment)
+    return offsets
+
+
+def silence(duration_seconds: float, sample_rate: int) -> np.ndarray:
+    """Return int16 silence of the given duration."""
+    return np.zeros(int(sample_rate * duration_seconds), dtype=np.int16)
+
+
+def speech_like_tone(duration_seconds: float, sample_rate: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Generate a decaying, harmonically rich hum that stands in for speech.
+
+    The fundamental wanders between 100 and 140 Hz with two harmonics, a slow
+    decay envelope and a little noise, computed for all samples at once.
+    """
+    t = np.arange(int(sample_rate * duration_seconds)) / sample_rate
+    base_freq = 120 + 20 * np.sin(t * 2)
+    phase = 2 * np.pi * base_freq * t
+    sample = 0.4 * np.sin(phase) + 0.2 * np.sin(2 * phase) + 0.1 * np.sin(3 * phase)
+
+    envelope = np.exp(-t * 0.5)
+    variation = 1 + 0.1 * np.sin(t * 10)
+    noise = 0.05 * (np.random.default_rng(seed).random(len(t)) - 0.5)
+
+    tone = 32767 * 0.2 * envelope * variation * (sample + noise)
+    return np.clip(tone, -32767, 32767).astype(np.int16)
+
+
+# Output formats: (mime type, file extension, container, encoder, default bitrate)
+AUDIO_FORMATS = {
+    'wav': ('audio/wav', '.wav', None, None, None),
+    'mp3': ('audio/mpeg', '.mp3', 'mp3', 'libmp3lame', 48000),
+    'opus': ('audio/ogg', '.opus', 'ogg', 'libopus', 32000),
+}
+
+def format_for_path(path: str) -> Optional[str]:
+    """Return the AUDIO_FORMATS key matching a file's extension, if any."""
+    extension = os.path.splitext(path)[1].lower()
+    return next((name for name, spec in AUDIO_FORMATS.items() if spec[1] == extension), None)
+
+
+def mime_type_for_path(path: str) -> Optional[str]:
+    """Return the mime type for an audio file produced by encode_pcm."""
+    audio_format = format_for_path(path)
+    return AUDIO_FORMATS[audio_format][0] if audio_format else None
+
+
+# libopus only accepts these input rates
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def encode_pcm(samples: np.ndarray, sample_rate: int, audio_format: str = 'wav', bitrate: Optional[int] = None) -> Optional[bytes]:
+    """
+    Serialize mono int16 samples to an in-memory WAV, MP3 or Ogg Opus file.
+
+    Compressed formats are encoded in-process with PyAV when available,
+    otherwise through a single piped ffmpeg process.
+
+    Returns:
+        Encoded bytes, or None if no encoder is available
+    """
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}")
+    if audio_format == 'wav':
+        return pcm_to_wav_bytes(samples, sample_rate)
+
+    _, _, container, codec, default_bitrate = AUDIO_FORMATS[audio_format]
+    bitrate = bitrate or default_bitrate
+    samples = np.asarray(samples, dtype=np.int16)
+    if codec == 'libopus' and sample_rate not in OPUS_SAMPLE_RATES:
+        samples = resample(samples, sample_rate, 48000)
+        sample_rate = 48000
+
+    if PYAV_AVAILABLE:
+        try:
+            return _encode_with_pyav(samples, sample_rate, container, codec, bitrate)
+        except Exception as e:
+            print(f"⚠️ PyAV encode failed, trying ffmpeg: {e}")
+
+    return _encode_with_ffmpeg(samples, sample_rate, container, codec, bitrate)
+
+
+def _encode_with_pyav(samples: np.ndarray, sample_rate: int, container: str, codec: str, bitrate: int) -> bytes:
+    buffer = io.BytesIO()
+    with av.open(buffer, 'w', format=container) as output:
+        stream = output.add_stream(codec, rate=sample_rate, layout='mono')
+        stream.bit_rate = bitrate
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format='s16', layout='mono')
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            output.mux(packet)
+        # Flush the encoder
+        for packet in stream.encode(None):
+            output.mux(packet)
+    return buffer.getvalue()
+
+
+def _encode_with_ffmpeg(samples: np.ndarray, sample_rate: int, container: str, codec: str, bitrate: int) -> Optional[bytes]:
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+        '-c:a', codec, '-b:a', str(bitrate), '-f', container, 'pipe:1'
+    ]
+    try:
+        result = subprocess.run(cmd, input=samples.tobytes(), capture_output=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        print(f"⚠️ ffmpeg encode not available or failed: {e}")
+        return None
+
+    if result.returncode != 0:
+        print(f"⚠️ ffmpeg encode failed: {result.stderr.decode('utf-8', 'ignore')[:200]}")
+        return None
+    return result.stdout
+
+
+def write_audio_file(path: str, samples: np.ndarray, sample_rate: int, audio_format: str = 'wav') -> Optional[str]:
+    """Encode samples and write them to path; returns the path, or None if encoding failed."""
+    data = encode_pcm(samples, sample_rate, audio_format)
+    if data is None:
+        return None
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Local espeak-ng TTS
+Offline, zero-cost speech for Linux from one long-lived espeak-ng engine
+"""
+
+import io
+import os
+import wave
+import shutil
+import threading
+import subprocess
+import ctypes
+import ctypes.util
+from typing import Optional, Tuple
+
+import numpy as np
+
+from audio_utils import write_audio_file
+
+# espeak_AUDIO_OUTPUT / flags from speak_lib.h
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+INITIALIZE_DONT_EXIT = 0x8000
+CHARS_UTF8 = 1
+POS_CHARACTER = 1
+EE_OK = 0
+
+_SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+
+class EspeakTTSSynthesizer:
+    """
+    espeak-ng synthesizer that keeps one engine loaded for the life of the process.
+
+    libespeak-ng is loaded once and called in synchronous mode, so samples
+    arrive in a callback with no process start-up or file I/O per request.
+    Without the library, text is piped to `espeak-ng --stdout` instead.
+    """
+
+    # Legacy espeak voice names used in voice_map['linux'] to espeak-ng voices
+    ESPEAK_NG_VOICES = {
+        'english_rp': 'en-gb-x-rp',
+        'en': 'en-us',
+        'spanish': 'es',
+        'french': 'fr-fr',
+        'german': 'de',
+        'japanese': 'ja',
+        'korean': 'ko',
+        'chinese': 'cmn',
+        'hindi': 'hi',
+        'tamil': 'ta',
+        'malayalam': 'ml',
+        'arabic': 'ar',
+    }
+
+    def __init__(self, words_per_minute: Optional[int] = None):
+        """
+        Initialize the synthesizer.
+
+        Args:
+            words_per_minute: Speaking rate (ESPEAK_WPM, default 150; learners benefit from slower speech)
+        """
+        self.words_per_minute = words_per_minute or int(os.getenv('ESPEAK_WPM', '150'))
+        self.binary = shutil.which('espeak-ng')
+        self.sample_rate = None
+
+        self._lock = threading.Lock()  # The engine is global state in libespeak-ng
+        self._lib = None
+        self._samples = []
+        self._callback = _SYNTH_CALLBACK(self._collect)  # Referenced so it is not garbage collected
+        self._load_library()
+
+        if self._lib:
+            print(f"✅ espeak-ng engine loaded ({self.sample_rate} Hz)")
+        elif self.binary:
+            print(f"✅ espeak-ng available via {self.binary}")
+
+    def _load_library(self):
+        library = ctypes.util.find_library('espeak-ng')
+        if not library:
+            return
+        try:
+            lib = ctypes.CDLL(library)
+            lib.espeak_Initialize.restype = ctypes.c_int
+            lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+            lib.espeak_SetVoiceByName.restype = ctypes.c_int
+            lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+            lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            lib.espeak_Synth.restype = ctypes.c_int
+            lib.espeak_Synth.argtypes = [
+                ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p
+            ]
+
+            sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, INITIALIZE_DONT_EXIT)
+            if sample_rate <= 0:
+                print("⚠️ espeak-ng engine failed to initialize")
+                return
+            lib.espeak_SetSynthCallback(self._callback)
+            lib.espeak_SetParameter(1, self.words_per_minute, 0)  # espeakRATE
+            self._lib = lib
+            self.sample_rate = sample_rate
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ Could not load libespeak-ng: {e}")
+
+    def _collect(self, wav, num_samples, events) -> int:
+        if wav and num_samples > 0:
+            self._samples.append(np.ctypeslib.as_array(wav, shape=(num_samples,)).copy())
+        return 0  # Continue synthesis
+
+    @property
+    def available(self) -> bool:
+        return bool(self._lib or self.binary)
+
+    def voice_for(self, voice: str) -> str:
+        """Translate a voice_map['linux'] name to an espeak-ng voice."""
+        return self.ESPEAK_NG_VOICES.get(voice, voice)
+
+    def synthesize_pcm(self, text: str, voice: str = 'en') -> Optional[Tuple[np.ndarray, int]]:
+        """
+        Synthesize text to mono int16 samples.
+
+        Returns:
+            (samples, sample rate), or None if espeak-ng is unavailable or failed
+        """
+        voice = self.voice_for(voice)
+        if self._lib:
+            result = self._synthesize_with_library(text, voice)
+            if result is not None:
+                return result
+        if self.binary:
+            return self._synthesize_with_binary(text, voice)
+        return None
+
+    def _synthesize_with_library(self, text: str, voice: str) -> Optional[Tuple[np.ndarray, int]]:
+        data = text.encode('utf-8') + b'\0'
+        with self._lock:
+            self._samples = []
+            if self._lib.espeak_SetVoiceByName(voice.encode('utf-8')) != EE_OK:
+                print(f"⚠️ espeak-ng has no voice '{voice}'")
+                return None
+            status = self._lib.espeak_Synth(data, len(data), 0, POS_CHARACTER, 0, CHARS_UTF8, None, None)
+            samples, self._samples = self._samples, []
+
+        if status != EE_OK or not samples:
+            print(f"⚠️ espeak-ng synthesis failed (status {status})")
+            return None
+        return np.concatenate(samples).astype(np.int16), self.sample_rate
+
+    def _synthesize_with_binary(self, text: str, voice: str) -> Optional[Tuple[np.ndarray, int]]:
+        try:
+            # Text goes in through stdin and WAV comes back on stdout; nothing touches disk
+            result = subprocess.run(
+                [self.binary, '-v', voice, '-s', str(self.words_per_minute), '--stdout'],
+                input=text.encode('utf-8'), capture_output=True, timeout=15
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"⚠️ espeak-ng failed: {e}")
+            return None
+        if result.returncode != 0 or not result.stdout:
+            print(f"⚠️ espeak-ng failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+            return None
+
+        try:
+            # The streamed header has placeholder sizes; frames are read to the end of the data
+            with wave.open(io.BytesIO(result.stdout)) as wav_file:
+                sample_rate = wav_file.getframerate()
+                samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2')
+        except (wave.Error, EOFError) as e:
+            print(f"⚠️ Could not read espeak-ng output: {e}")
+            return None
+        if len(samples) == 0:
+            return None
+        return samples, sample_rate
+
+    def synthesize_speech(self, text: str, voice: str = 'en', output_path: str = "tts_output/espeak_response.wav") -> Optional[str]:
+        """Synthesize text to a WAV file; returns the path, or None on error."""
+        result = self.synthesize_pcm(text, voice)
+        if result is None:
+            return None
+        samples, sample_rate = result
+        return write_audio_file(output_path, samples, sample_rate)
+
+
+# Global espeak-ng instance (one engine per process)
+espeak_synthesizer = None
+_espeak_lock = threading.Lock()
+
+def get_espeak_synthesizer() -> EspeakTTSSynthesizer:
+    """Get or create the global espeak-ng synthesizer."""
+    global espeak_synthesizer
+    if espeak_synthesizer is None:
+        with _espeak_lock:
+            if espeak_synthesizer is None:
+                espeak_synthesizer = EspeakTTSSynthesizer()
+    return espeak_synthesizer
+
+
+def is_available() -> bool:
+    """True if espeak-ng can be used (library or binary)."""
+    return get_espeak_synthesizer().available
+
+
+def synthesize_speech(text: str, voice: str = 'en', output_path: str = "tts_output/espeak_response.wav") -> Optional[str]:
+    """Convenience function using the global synthesizer."""
+    return get_espeak_synthesizer().synthesize_speech(text, voice, output_path)
@@ -151,6 +151,66 @@ class LanguageTutor:
             elif self.model is None:
                 print("   - Reason: Model creation failed during initialization")
             return "Let's keep practicing together!"
+
+        prompt = self._build_conversational_prompt(context, description, f"""User just said: "{user_input}"
+
+Reply naturally in {self.language_name}.""")
+        
+        try:
+            print(f"[GET RESPONSE] Prompt sent to AI:\n{prompt}")
+            print(f"[GET RESPONSE] Prompt length: {len(prompt)} characters")
+            response = self.model.generate_content(prompt)
+            if response and response.text:
+                return response.text.strip()
+            else:
+                return "I'm here to help you practice!"
+        except Exception as e:
+            print(f"Error generating conversational response: {e}")
+            return "Let's keep practicing together!"
+
+    def get_conversational_response_from_audio(self, audio_part, context: str = "", description: str = None) -> Optional[Dict[str, str]]:
+        """
+        Transcribe the user's recorded turn and reply to it in a single multimodal call.
+
+        Args:
+            audio_part: Audio blob or file reference accepted by generate_content
+            context: Recent conversation context
+            description: Optional persona description
+
+        Returns:
+            {"transcript": ..., "reply": ...} or None if the call or parsing failed
+        """
+        if not self.model or not GOOGLE_AI_AVAILABLE:
+            print("⚠️ Gemini model not available for fused audio response")
+            return None
+
+        prompt = self._build_conversational_prompt(context, description, f"""The user's message is the attached audio recording.
+First transcribe exactly what the user said, in the language and script they used, without correcting mistakes.
+Then reply to it naturally in {self.language_name}, following all of the rules above.
+
+Return ONLY a JSON object: {{"transcript": "<what the user said>", "reply": "<your reply>"}}""")
+
+        try:
+            print(f"[GET RESPONSE] Fused audio prompt length: {len(prompt)} characters")
+            response = self.model.generate_content(
+                [prompt, audio_part],
+                generation_config={"response_mime_type": "application/json"}
+            )
+            if not response or not response.text:
+                return None
+            result = json.loads(response.text)
+            transcript = (result.get("transcript") or "").strip()
+            reply = (result.get("reply") or "").strip()
+            if not transcript or not reply:
+                print(f"⚠️ Fused audio response missing fields: {result}")
+                return None
+            return {"transcript": transcript, "reply": reply}
+        except Exception as e:
+            print(f"Error generating fused audio response: {e}")
+            return None
+
+    def _build_conversational_prompt(self, context: str, description: str, user_turn: str) -> str:
+        """Build the conversational tutor prompt; user_turn describes the user's latest message."""
         topics_guidance = ""
         topic_integration_rules = ""
         
@@ -212,21 +272,8 @@ IMPORTANT: Do not refer to yourself as a tutor, teacher, AI, or bot. Respond as
 Current conversation context:  
 {context}
 
-User just said: "{user_input}"
-
-Reply naturally in {self.language_name}."""
-        
-        try:
-            print(f"[GET RESPONSE] Prompt sent to AI:\n{prompt}")
-            print(f"[GET RESPONSE] Prompt length: {len(prompt)} characters")
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                return response.text.strip()
-            else:
-                return "I'm here to help you practice!"
-        except Exception as e:
-            print(f"Error generating conversational response: {e}")
-            return "Let's keep practicing together!"
+{user_turn}"""
+        return prompt
 
     def get_detailed_feedback(self, user_input: str, context: str = "", description: str = None, romanization_display: str = None) -> str:
         """Generate detailed feedback about grammar, pronunciation, etc."""
@@ -992,6 +1039,10 @@ If the response is already natural and grammatically accurate, return it unchang
             i += 1
         return suggestions if suggestions else self._get_fallback_suggestions()
 
+    def get_fallback_suggestions(self) -> list:
+        """Suggestions offered when AI generation fails (e.g. for pre-rendering their audio)."""
+        return self._get_fallback_suggestions()
+
     def _get_fallback_suggestions(self) -> list:
         """Get fallback suggestions when AI generation fails."""
         return [
@@ -1792,6 +1843,61 @@ def get_conversational_response(transcription: str, chat_history: List[Dict], la
         
         raise e
 
+def get_conversational_response_from_audio(audio_path: str, chat_history: List[Dict], language: str = 'en', user_level: str = 'beginner', user_topics: List[str] = None, formality: str = 'friendly', feedback_language: str = 'en', user_goals: List[str] = None, description: str = None) -> Optional[Dict[str, str]]:
+    """Transcribe and reply to a recorded turn in one multimodal Gemini call.
+
+    Returns {"transcript": ..., "reply": ...}, or None so callers can fall back
+    to the two-step transcribe-then-respond path.
+    """
+    if not is_google_api_enabled():
+        return None
+    
+    if user_topics is None:
+        user_topics = []
+    if user_goals is None:
+        user_goals = []
+    
+    # Get or create tutor instance
+    tutor_key = f"{language}_{user_level}_{','.join(sorted(user_topics))}"
+    if tutor_key not in _tutor_instances:
+        _tutor_instances[tutor_key] = create_tutor(language, user_level, user_topics)
+    
+    tutor = _tutor_instances[tutor_key]
+    
+    # Update tutor with current context
+    tutor.user_level = user_level
+    tutor.user_topics = user_topics
+    tutor.user_goals = user_goals
+    tutor.user_closeness = formality
+    tutor.feedback_language = feedback_language
+    
+    # Build context from chat history
+    context = "\n".join([f"{msg['sender']}: {msg['text']}" for msg in chat_history[-4:]]) if chat_history else ""
+    
+    try:
+        audio_part = _load_audio_part(audio_path)
+    except Exception as e:
+        print(f"❌ Could not read audio for fused response: {e}")
+        return None
+    
+    print(f"🔍 Making fused Gemini API call (audio -> transcript + reply)...")
+    return tutor.get_conversational_response_from_audio(audio_part, context, description)
+
+def _load_audio_part(audio_path: str):
+    """Load audio as a generate_content part, reusing Files API uploads for large clips."""
+    from gemini_transcription import get_gemini_transcriber
+    
+    transcriber = get_gemini_transcriber()
+    with open(audio_path, "rb") as audio_file:
+        audio_content = audio_file.read()
+    mime_type = transcriber.get_mime_type(audio_path)
+    
+    part = transcriber.audio_part(audio_content, mime_type)
+    if "file_data" in part:
+        return part
+    # The SDK expects raw bytes for inline data
+    return {"mime_type": mime_type, "data": audio_content}
+
 def get_detailed_feedback(phoneme_analysis: str, reference_text: str, recognized_text: str, chat_history: List[Dict], language: str = 'en', user_level: str = 'beginner', user_topics: List[str] = None, feedback_language: str = 'en', description: str = None, romanization_display: str = None) -> str:
     """Get detailed feedback using separate Gemini call."""
     # Check if Google API services are enabled
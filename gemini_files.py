@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Gemini Files API Cache
+Uploads large audio clips once and reuses the file handle across requests
+"""
+
+import os
+import time
+import base64
+import hashlib
+import threading
+import requests
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+# Load environment variables from .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass  # dotenv is optional, will use system env vars if not available
+
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest used to key cached uploads."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class GeminiFileCache:
+    """Upload audio through the Gemini Files API, caching file handles by content hash"""
+
+    UPLOAD_URL = "https://generativelanguage.googleapis.com/upload/v1beta/files"
+    API_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+    # Uploaded files expire after 48 hours; stop reusing them a little earlier
+    DEFAULT_TTL_SECONDS = 46 * 3600
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the file cache.
+
+        Args:
+            api_key: Google AI API key. If None, uses environment variables.
+        """
+        self.api_key = (
+            api_key
+            or os.getenv('GOOGLE_AI_API_KEY')
+            or os.getenv('GEMINI_API_KEY')
+            or os.getenv('GOOGLE_API_KEY')
+        )
+
+        if not self.api_key:
+            raise ValueError(
+                "No API key found. Set GOOGLE_AI_API_KEY, GEMINI_API_KEY, or GOOGLE_API_KEY."
+            )
+
+        self.session = requests.Session()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._upload_locks: Dict[str, threading.Lock] = {}
+        self.uploads = 0
+        self.hits = 0
+
+    def get_part(self, audio_bytes: bytes, mime_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a REST ``file_data`` part for the audio, uploading it if needed.
+
+        Concurrent callers with the same content wait for a single upload.
+
+        Returns:
+            {"file_data": {"mime_type": ..., "file_uri": ...}} or None on error
+        """
+        digest = content_hash(audio_bytes)
+
+        cached = self._lookup(digest)
+        if cached:
+            return self._to_part(cached)
+
+        with self._lock:
+            upload_lock = self._upload_locks.setdefault(digest, threading.Lock())
+
+        with upload_lock:
+            # Another thread may have finished the upload while we waited
+            cached = self._lookup(digest)
+            if cached:
+                return self._to_part(cached)
+
+            uploaded = self._upload(audio_bytes, mime_type, digest)
+            with self._lock:
+                self._upload_locks.pop(digest, None)
+                if uploaded:
+                    self._store(digest, uploaded)
+                    self.uploads += 1
+
+        return self._to_part(uploaded) if uploaded else None
+
+    def get_cached_part(self, audio_bytes: bytes) -> Optional[Dict[str, Any]]:
+        """Return the part for previously uploaded audio without uploading."""
+        cached = self._lookup(content_hash(audio_bytes))
+        return self._to_part(cached) if cached else None
+
+    def _lookup(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._files.get(digest)
+            if not entry:
+                return None
+            if entry['expires_at'] <= time.time():
+                del self._files[digest]
+                return None
+            self.hits += 1
+            return entry
+
+    def _store(self, digest: str, entry: Dict[str, Any]):
+        """Remember an uploaded file (called with the lock held)."""
+        self._files[digest] = entry
+
+    def _to_part(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "file_data": {
+                "mime_type": entry['mime_type'],
+                "file_uri": entry['uri']
+            }
+        }
+
+    def _upload(self, audio_bytes: bytes, mime_type: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Upload bytes with the resumable protocol and wait for the file to become ACTIVE."""
+        try:
+            print(f"📤 [GEMINI_FILES] Uploading {len(audio_bytes)} bytes ({mime_type})")
+            start = self.session.post(
+                self.UPLOAD_URL,
+                params={'key': self.api_key},
+                headers={
+                    'X-Goog-Upload-Protocol': 'resumable',
+                    'X-Goog-Upload-Command': 'start',
+                    'X-Goog-Upload-Header-Content-Length': str(len(audio_bytes)),
+                    'X-Goog-Upload-Header-Content-Type': mime_type,
+                },
+                json={'file': {'display_name': f"audio-{digest[:16]}"}},
+                timeout=30
+            )
+            upload_url = start.headers.get('X-Goog-Upload-URL')
+            if start.status_code != 200 or not upload_url:
+                print(f"❌ [GEMINI_FILES] Upload start failed: {start.status_code} - {start.text}")
+                return None
+
+            response = self.session.post(
+                upload_url,
+                headers={
+                    'X-Goog-Upload-Offset': '0',
+                    'X-Goog-Upload-Command': 'upload, finalize',
+                },
+                data=audio_bytes,
+                timeout=120
+            )
+            if response.status_code != 200:
+                print(f"❌ [GEMINI_FILES] Upload failed: {response.status_code} - {response.text}")
+                return None
+
+            file_info = response.json().get('file', {})
+            file_info = self._wait_until_active(file_info)
+            if not file_info:
+                return None
+
+            print(f"✅ [GEMINI_FILES] Uploaded as {file_info.get('name')}")
+            return {
+                'name': file_info.get('name'),
+                'uri': file_info.get('uri'),
+                'mime_type': file_info.get('mimeType', mime_type),
+                'expires_at': self._expiry(file_info.get('expirationTime'))
+            }
+
+        except Exception as e:
+            print(f"❌ [GEMINI_FILES] Error uploading file: {e}")
+            return None
+
+    def _wait_until_active(self, file_info: Dict[str, Any], timeout: float = 15.0) -> Optional[Dict[str, Any]]:
+        deadline = time.time() + timeout
+        while file_info.get('state') == 'PROCESSING' and time.time() < deadline:
+            time.sleep(0.5)
+            response = self.session.get(
+                f"{self.API_URL}/{file_info['name']}",
+                params={'key': self.api_key},
+                timeout=10
+            )
+            if response.status_code != 200:
+                break
+            file_info = response.json()
+
+        if file_info.get('state', 'ACTIVE') != 'ACTIVE' or not file_info.get('uri'):
+            print(f"❌ [GEMINI_FILES] File not usable: {file_info}")
+            return None
+        return file_info
+
+    def _expiry(self, expiration_time: Optional[str]) -> float:
+        fallback = time.time() + self.DEFAULT_TTL_SECONDS
+        if not expiration_time:
+            return fallback
+        try:
+            expires = datetime.fromisoformat(expiration_time.replace('Z', '+00:00')).timestamp()
+            # Leave a margin so a handle is never used right as it expires
+            return min(expires - 3600, fallback)
+        except ValueError:
+            return fallback
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return upload/hit counters."""
+        with self._lock:
+            return {"cached_files": len(self._files), "uploads": self.uploads, "hits": self.hits}
+
+
+class LocalFileCache(GeminiFileCache):
+    """
+    In-process stand-in for GeminiFileCache that never touches the network.
+
+    Handles are cached by content hash exactly like the real cache, but each
+    part is returned as inline data. Select it with GEMINI_FILES_BACKEND=local.
+    Since the audio itself is held in memory, the cache is bounded by
+    LOCAL_FILES_MAX_ENTRIES and LOCAL_FILES_MAX_BYTES, evicting least
+    recently used clips first.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.api_key = api_key
+        self.max_entries = max_entries or int(os.getenv('LOCAL_FILES_MAX_ENTRIES', '64'))
+        self.max_bytes = max_bytes or int(os.getenv('LOCAL_FILES_MAX_BYTES', str(64 * 1024 * 1024)))
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self._upload_locks = {}
+        self.total_bytes = 0
+        self.uploads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def _lookup(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._files.get(digest)
+            if not entry:
+                return None
+            if entry['expires_at'] <= time.time():
+                self._evict(digest)
+                return None
+            self._files.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+    def _store(self, digest: str, entry: Dict[str, Any]):
+        if digest in self._files:
+            self._evict(digest)
+        self._files[digest] = entry
+        self.total_bytes += len(entry['data'])
+        while self._files and (len(self._files) > self.max_entries or self.total_bytes > self.max_bytes):
+            self._evict(next(iter(self._files)))
+            self.evictions += 1
+
+    def _evict(self, digest: str):
+        entry = self._files.pop(digest)
+        self.total_bytes -= len(entry['data'])
+
+    def _upload(self, audio_bytes: bytes, mime_type: str, digest: str) -> Optional[Dict[str, Any]]:
+        return {
+            'name': f"files/local-{digest[:16]}",
+            'uri': f"local://{digest}",
+            'mime_type': mime_type,
+            'data': base64.b64encode(audio_bytes).decode('utf-8'),
+            'expires_at': time.time() + self.DEFAULT_TTL_SECONDS
+        }
+
+    def _to_part(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "inline_data": {
+                "mime_type": entry['mime_type'],
+                "data": entry['data']
+            }
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        with self._lock:
+            stats.update({"bytes": self.total_bytes, "evictions": self.evictions})
+        return stats
+
+
+# Global file cache instance
+gemini_file_cache = None
+
+def get_gemini_file_cache() -> GeminiFileCache:
+    """Get or create the global Gemini file cache instance."""
+    global gemini_file_cache
+    if gemini_file_cache is None:
+        if os.getenv('GEMINI_FILES_BACKEND', 'gemini').lower() == 'local':
+            gemini_file_cache = LocalFileCache()
+        else:
+            gemini_file_cache = GeminiFileCache()
+    return gemini_file_cache
@@ -5,10 +5,18 @@ Replaces Whisper with Gemini 2.5 Flash for audio transcription
 """
 
 import os
+import re
 import base64
 import json
 import requests
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+
+from audio_utils import SPEECH_SAMPLE_RATE, decode_to_pcm, pcm_to_wav_bytes, split_on_silence
+from gemini_files import get_gemini_file_cache
+
+# Languages written without spaces between words; transcripts are merged per character
+UNSPACED_LANGUAGES = ('zh', 'ja')
 
 # Load environment variables from .env file
 try:
@@ -17,8 +25,41 @@ try:
 except ImportError:
     pass  # dotenv is optional, will use system env vars if not available
 
+# Bounded pool shared by all segmented transcriptions
+_segment_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('GEMINI_TRANSCRIBE_WORKERS', '4')),
+    thread_name_prefix='gemini-segment'
+)
+
 class GeminiTranscriber:
     """Audio transcription using Gemini 2.5 Flash"""
+
+    LANGUAGE_NAMES = {
+        'en': 'English',
+        'es': 'Spanish', 
+        'fr': 'French',
+        'zh': 'Chinese',
+        'ja': 'Japanese',
+        'ko': 'Korean',
+        'hi': 'Hindi',
+        'ml': 'Malayalam',
+        'ta': 'Tamil',
+        'or': 'Odia',
+        'tl': 'Tagalog'
+    }
+    
+    # Response schema for single-request transcription + analysis
+    ANALYSIS_SCHEMA = {
+        "type": "OBJECT",
+        "properties": {
+            "transcript": {"type": "STRING"},
+            "topics": {"type": "ARRAY", "items": {"type": "STRING"}},
+            "sentiment": {"type": "STRING"},
+            "errors": {"type": "ARRAY", "items": {"type": "STRING"}},
+            "suggestions": {"type": "ARRAY", "items": {"type": "STRING"}}
+        },
+        "required": ["transcript", "topics", "sentiment", "errors", "suggestions"]
+    }
     
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -41,6 +82,15 @@ class GeminiTranscriber:
         
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
         self.model = "gemini-2.0-flash-exp"
+
+        # Recordings longer than segment_seconds are transcribed in parallel segments.
+        # Files smaller than chunking_min_bytes are never decoded to check their length.
+        self.segment_seconds = float(os.getenv('GEMINI_SEGMENT_SECONDS', '30'))
+        self.overlap_seconds = float(os.getenv('GEMINI_SEGMENT_OVERLAP_SECONDS', '1.0'))
+        self.chunking_min_bytes = int(os.getenv('GEMINI_CHUNKING_MIN_BYTES', '200000'))
+
+        # Clips at least this large go through the Files API instead of inline base64
+        self.files_min_bytes = int(os.getenv('GEMINI_FILES_MIN_BYTES', '1000000'))
         
         print(f"✅ Gemini Transcriber initialized with API key prefix {self.api_key[:8]}...")
 
@@ -53,6 +103,9 @@ class GeminiTranscriber:
         """
         Transcribe audio using Gemini 2.5 Flash.
         
+        Long recordings are split at silence boundaries and transcribed in
+        parallel (see transcribe_long_audio); short clips go out in one request.
+        
         Args:
             audio_path: Path to the audio file
             language_code: Language code (e.g., 'en', 'es', 'hi', 'ja', etc.)
@@ -62,30 +115,62 @@ class GeminiTranscriber:
             Transcribed text or None on error
         """
         try:
-            # Read and encode the audio file
+            # Read the audio file
             with open(audio_path, "rb") as audio_file:
                 audio_content = audio_file.read()
-                audio_encoded = base64.b64encode(audio_content).decode('utf-8')
                 
             print(f"🔍 [GEMINI] Audio file info: {len(audio_content)} bytes, {audio_path}")
 
+            return self.transcribe_content(
+                audio_content,
+                self.get_mime_type(audio_path),
+                language_code,
+                prompt
+            )
+                
+        except Exception as e:
+            print(f"❌ Error in Gemini audio transcription: {e}")
+            return None
+
+    def transcribe_content(
+        self,
+        audio_content: bytes,
+        mime_type: str,
+        language_code: str,
+        prompt: str = None
+    ) -> Optional[str]:
+        """Route audio to segmented or single-request transcription."""
+        # Custom prompts are passed through untouched on a single request
+        if not prompt and len(audio_content) >= self.chunking_min_bytes:
+            transcript = self.transcribe_long_audio(audio_content, language_code)
+            if transcript is not None:
+                return transcript
+
+        return self.transcribe_audio_bytes(audio_content, mime_type, language_code, prompt)
+
+    def transcribe_audio_bytes(
+        self,
+        audio_content: bytes,
+        mime_type: str,
+        language_code: str = 'en',
+        prompt: str = None
+    ) -> Optional[str]:
+        """
+        Transcribe an in-memory audio buffer in a single Gemini request.
+        
+        Args:
+            audio_content: Raw encoded audio bytes
+            mime_type: MIME type of the audio (e.g., 'audio/webm')
+            language_code: Language code
+            prompt: Optional custom prompt for transcription
+            
+        Returns:
+            Transcribed text or None on error
+        """
+        try:
             # Default prompt for transcription
             if not prompt:
-                language_names = {
-                    'en': 'English',
-                    'es': 'Spanish', 
-                    'fr': 'French',
-                    'zh': 'Chinese',
-                    'ja': 'Japanese',
-                    'ko': 'Korean',
-                    'hi': 'Hindi',
-                    'ml': 'Malayalam',
-                    'ta': 'Tamil',
-                    'or': 'Odia',
-                    'tl': 'Tagalog'
-                }
-                language_name = language_names.get(language_code, 'English')
-                prompt = f"Please transcribe this {language_name} audio accurately. Return only the transcribed text without any additional formatting or explanations."
+                prompt = self._default_prompt(language_code)
 
             # Prepare the request payload
             payload = {
@@ -94,12 +179,7 @@ class GeminiTranscriber:
                         {
                             "text": prompt
                         },
-                        {
-                            "inline_data": {
-                                "mime_type": self._get_mime_type(audio_path),
-                                "data": audio_encoded
-                            }
-                        }
+                        self.audio_part(audio_content, mime_type)
                     ]
                 }],
                 "generation_config": {
@@ -136,7 +216,92 @@ class GeminiTranscriber:
             print(f"❌ Error in Gemini audio transcription: {e}")
             return None
 
-    def _get_mime_type(self, audio_path: str) -> str:
+    def transcribe_long_audio(self, audio_content: bytes, language_code: str = 'en') -> Optional[str]:
+        """
+        Transcribe a long recording as overlapping segments in parallel.
+        
+        The audio is decoded to 16 kHz PCM, cut at silence boundaries into
+        segments of at most ``segment_seconds``, each segment is transcribed
+        on the shared worker pool and the results are stitched back together
+        with the overlapping words removed.
+        
+        Returns:
+            Stitched transcript, or None when the audio is short enough (or
+            cannot be decoded) and should be sent as a single request instead
+        """
+        samples = decode_to_pcm(audio_content, SPEECH_SAMPLE_RATE)
+        if samples is None:
+            return None
+
+        duration = len(samples) / SPEECH_SAMPLE_RATE
+        if duration <= self.segment_seconds:
+            return None
+
+        segments = split_on_silence(
+            samples,
+            SPEECH_SAMPLE_RATE,
+            max_segment_seconds=self.segment_seconds,
+            min_segment_seconds=self.segment_seconds / 3,
+            overlap_seconds=self.overlap_seconds
+        )
+        print(f"✂️ [GEMINI] Splitting {duration:.1f}s recording into {len(segments)} segments")
+
+        base_prompt = self._default_prompt(language_code)
+        futures = []
+        for index, (start, end) in enumerate(segments):
+            segment_prompt = (
+                f"{base_prompt} This is part {index + 1} of {len(segments)} of a longer recording, "
+                f"so it may start or end in the middle of a sentence."
+            )
+            futures.append(_segment_executor.submit(
+                self.transcribe_audio_bytes,
+                pcm_to_wav_bytes(samples[start:end], SPEECH_SAMPLE_RATE),
+                'audio/wav',
+                language_code,
+                segment_prompt
+            ))
+
+        parts = [future.result() for future in futures]
+        failed = sum(1 for part in parts if not part)
+        if failed:
+            print(f"⚠️ [GEMINI] {failed}/{len(parts)} segments failed to transcribe")
+        if failed == len(parts):
+            return None
+
+        transcript = merge_overlapping_transcripts([part for part in parts if part], language_code=language_code)
+        print(f"✅ Gemini segmented transcription: '{transcript}'")
+        return transcript
+
+    def audio_part(self, audio_content: bytes, mime_type: str) -> Dict[str, Any]:
+        """
+        Build the request part carrying the audio.
+        
+        Large clips are uploaded once through the Files API and referenced by
+        URI; the handle is cached by content hash, so follow-up requests for
+        the same audio (analysis, feedback, retries) skip the upload entirely.
+        Small clips, or uploads that fail, are sent inline as base64.
+        """
+        if len(audio_content) >= self.files_min_bytes:
+            try:
+                part = get_gemini_file_cache().get_part(audio_content, mime_type)
+                if part:
+                    return part
+            except Exception as e:
+                print(f"⚠️ [GEMINI] Files API unavailable, sending audio inline: {e}")
+
+        return {
+            "inline_data": {
+                "mime_type": mime_type,
+                "data": base64.b64encode(audio_content).decode('utf-8')
+            }
+        }
+
+    def _default_prompt(self, language_code: str) -> str:
+        """Build the default transcription prompt for a language."""
+        language_name = self.LANGUAGE_NAMES.get(language_code, 'English')
+        return f"Please transcribe this {language_name} audio accurately. Return only the transcribed text without any additional formatting or explanations."
+
+    def get_mime_type(self, audio_path: str) -> str:
         """Determine MIME type based on file extension."""
         ext = audio_path.lower().split('.')[-1]
         mime_types = {
@@ -160,6 +325,11 @@ class GeminiTranscriber:
         """
         Transcribe audio and provide additional analysis.
         
+        A single structured-output request returns the transcript together
+        with topics, sentiment, error notes and suggestions. The older
+        transcribe-then-analyze pair of requests is only used for custom
+        analysis prompts or when the structured request fails.
+        
         Args:
             audio_path: Path to the audio file
             language_code: Language code
@@ -168,8 +338,110 @@ class GeminiTranscriber:
         Returns:
             Dictionary with transcription and analysis
         """
+        # Read once; large clips are uploaded once and reused by every request
+        with open(audio_path, "rb") as audio_file:
+            audio_content = audio_file.read()
+        mime_type = self.get_mime_type(audio_path)
+
+        if not analysis_prompt:
+            result = self._transcribe_with_analysis_structured(audio_content, mime_type, language_code)
+            if result:
+                return result
+            print("⚠️ [GEMINI] Structured analysis failed, falling back to two requests")
+
+        return self._transcribe_with_analysis_two_step(audio_content, mime_type, language_code, analysis_prompt)
+
+    def _transcribe_with_analysis_structured(
+        self,
+        audio_content: bytes,
+        mime_type: str,
+        language_code: str
+    ) -> Optional[Dict[str, Any]]:
+        """Transcribe and analyze in one request using a JSON response schema."""
+        language_name = self.LANGUAGE_NAMES.get(language_code, 'English')
+        prompt = f"""
+        Transcribe this {language_name} audio accurately, exactly as spoken, then analyze the transcription:
+        1. Key topics discussed
+        2. Sentiment/tone
+        3. Any notable language patterns or errors
+        4. Suggestions for improvement (if applicable)
+        """
+
+        payload = {
+            "contents": [{
+                "parts": [
+                    {"text": prompt},
+                    self.audio_part(audio_content, mime_type)
+                ]
+            }],
+            "generation_config": {
+                "temperature": 0.2,
+                "top_p": 0.8,
+                "top_k": 40,
+                "max_output_tokens": 4096,
+                "response_mime_type": "application/json",
+                "response_schema": self.ANALYSIS_SCHEMA
+            }
+        }
+
+        try:
+            url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
+            response = requests.post(url, json=payload)
+
+            if response.status_code != 200:
+                print(f"❌ Gemini API error: {response.status_code} - {response.text}")
+                return None
+
+            result = response.json()
+            if 'candidates' not in result or len(result['candidates']) == 0:
+                print(f"❌ No structured analysis returned: {result}")
+                return None
+
+            structured = json.loads(result['candidates'][0]['content']['parts'][0]['text'])
+            transcript = (structured.get('transcript') or '').strip()
+            if not transcript:
+                return None
+
+            analysis = {
+                "topics": structured.get('topics', []),
+                "sentiment": structured.get('sentiment', ''),
+                "errors": structured.get('errors', []),
+                "suggestions": structured.get('suggestions', [])
+            }
+            print(f"✅ Gemini structured transcription + analysis: '{transcript}'")
+            return {
+                "transcript": transcript,
+                "analysis": self._format_analysis(analysis),
+                **analysis,
+                "mode": "structured"
+            }
+
+        except Exception as e:
+            print(f"❌ Error in structured analysis: {e}")
+            return None
+
+    def _format_analysis(self, analysis: Dict[str, Any]) -> str:
+        """Render structured analysis as the plain-text summary older callers expect."""
+        def bullets(items):
+            return "\n".join(f"- {item}" for item in items) if items else "- None"
+
+        return (
+            f"1. Key topics discussed:\n{bullets(analysis['topics'])}\n"
+            f"2. Sentiment/tone: {analysis['sentiment'] or 'Unknown'}\n"
+            f"3. Notable language patterns or errors:\n{bullets(analysis['errors'])}\n"
+            f"4. Suggestions for improvement:\n{bullets(analysis['suggestions'])}"
+        )
+
+    def _transcribe_with_analysis_two_step(
+        self,
+        audio_content: bytes,
+        mime_type: str,
+        language_code: str,
+        analysis_prompt: str = None
+    ) -> Dict[str, Any]:
+        """Fallback: transcribe first, then analyze the transcript in a second request."""
         # First get the transcription
-        transcript = self.transcribe_audio(audio_path, language_code)
+        transcript = self.transcribe_content(audio_content, mime_type, language_code)
         
         if not transcript:
             return {"transcript": None, "analysis": None}
@@ -187,10 +459,16 @@ class GeminiTranscriber:
             """
         
         try:
-            # Make analysis request
+            # Make analysis request, attaching the audio when it is already uploaded
+            parts = [{"text": analysis_prompt}]
+            if len(audio_content) >= self.files_min_bytes:
+                file_part = get_gemini_file_cache().get_cached_part(audio_content)
+                if file_part:
+                    parts.append(file_part)
+
             payload = {
                 "contents": [{
-                    "parts": [{"text": analysis_prompt}]
+                    "parts": parts
                 }],
                 "generation_config": {
                     "temperature": 0.3,
@@ -209,14 +487,57 @@ class GeminiTranscriber:
                     analysis = result['candidates'][0]['content']['parts'][0]['text']
                     return {
                         "transcript": transcript,
-                        "analysis": analysis.strip()
+                        "analysis": analysis.strip(),
+                        "mode": "two_step"
                     }
             
-            return {"transcript": transcript, "analysis": None}
+            return {"transcript": transcript, "analysis": None, "mode": "two_step"}
             
         except Exception as e:
             print(f"❌ Error in analysis: {e}")
-            return {"transcript": transcript, "analysis": None}
+            return {"transcript": transcript, "analysis": None, "mode": "two_step"}
+
+
+def merge_overlapping_transcripts(parts: List[str], max_overlap_tokens: int = 12,
+                                  language_code: Optional[str] = None) -> str:
+    """
+    Join segment transcripts, dropping text repeated across segment overlaps.
+    
+    For each adjacent pair the longest run of tokens that ends the previous
+    transcript and starts the next one (compared case- and punctuation-
+    insensitively) is kept only once. Tokens are words, or characters for
+    scripts written without spaces (Chinese, Japanese). The choice is made
+    once, from language_code or else the whole transcript, so a short
+    one-word segment is not split into characters.
+    """
+    if not parts:
+        return ""
+
+    if language_code:
+        by_word = language_code not in UNSPACED_LANGUAGES
+    else:
+        by_word = any(' ' in p.strip() for p in parts)
+
+    def tokenize(text: str) -> List[str]:
+        return text.split() if by_word else list(text.strip())
+
+    def normalize(token: str) -> str:
+        return re.sub(r'[^\w]', '', token.casefold())
+
+    merged = tokenize(parts[0])
+    for part in parts[1:]:
+        tokens = tokenize(part)
+        tail = [normalize(t) for t in merged[-max_overlap_tokens:]]
+        head = [normalize(t) for t in tokens[:max_overlap_tokens]]
+
+        overlap = 0
+        for size in range(min(len(tail), len(head)), 0, -1):
+            if tail[-size:] == head[:size] and any(tail[-size:]):
+                overlap = size
+                break
+        merged.extend(tokens[overlap:])
+
+    return (' ' if by_word else '').join(merged)
 
 
 # Global transcriber instance
@@ -18,8 +18,13 @@ Cloud Setup:
 
 import os
 import base64
-import wave
-from typing import Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Iterator, List, Tuple
+
+import numpy as np
+
+from audio_utils import write_audio_file
 
 # Require the Google GenAI SDK
 try:
@@ -34,6 +39,11 @@ except ImportError:
 class GeminiTTSSynthesizer:
     """Text-to-Speech synthesizer using Gemini TTS via the GenAI SDK"""
 
+    MODEL = "gemini-2.5-flash-preview-tts"  # Current available TTS model
+
+    # Gemini TTS returns raw 16-bit mono PCM at 24 kHz
+    SAMPLE_RATE = 24000
+
     # Map ISO language codes to prebuilt voice names supported by the API
     # Note: Gemini TTS may not support all languages natively
     # Matches frontend LANGUAGES: ['en', 'es', 'fr', 'zh', 'ja', 'ko', 'tl', 'hi', 'ml', 'ta', 'or']
@@ -101,18 +111,9 @@ class GeminiTTSSynthesizer:
 
         try:
             response = self.client.models.generate_content(
-                model="gemini-2.5-flash-preview-tts",  # Current available TTS model
+                model=self.MODEL,
                 contents=text,  # Just the text, no "Say cheerfully:" prefix
-                config=types.GenerateContentConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        voice_config=types.VoiceConfig(
-                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                voice_name=voice
-                            )
-                        )
-                    )
-                )
+                config=self._speech_config(voice)
             )
 
             # Extract and decode audio bytes
@@ -124,11 +125,7 @@ class GeminiTTSSynthesizer:
             audio_bytes = base64.b64decode(part) if isinstance(part, str) else part
 
             # Write a WAV file
-            with wave.open(output_path, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(24000)
-                wf.writeframes(audio_bytes)
+            write_audio_file(output_path, np.frombuffer(audio_bytes, dtype='<i2'), self.SAMPLE_RATE)
 
             print(f"✅ Gemini TTS output saved to: {output_path}")
             return output_path
@@ -137,16 +134,95 @@ class GeminiTTSSynthesizer:
             print(f"❌ Error in Gemini TTS synthesis: {e}")
             return None
 
+    def stream_speech(self, text: str, language_code: str = 'en') -> Iterator[bytes]:
+        """
+        Generate speech and yield raw PCM chunks as the model produces them.
+
+        Chunks are mono 16-bit little-endian at SAMPLE_RATE. Errors raised
+        before the first chunk propagate so callers can fall back.
+        """
+        voice = self.get_voice_for_language(language_code)
+        print(f"🎤 Gemini TTS stream: Using voice '{voice}' for language '{language_code}'")
+
+        stream = self.client.models.generate_content_stream(
+            model=self.MODEL,
+            contents=text,
+            config=self._speech_config(voice)
+        )
+        for chunk in stream:
+            if not chunk.candidates or not chunk.candidates[0].content or not chunk.candidates[0].content.parts:
+                continue
+            for part in chunk.candidates[0].content.parts:
+                if part.inline_data and part.inline_data.data:
+                    data = part.inline_data.data
+                    yield base64.b64decode(data) if isinstance(data, str) else data
+
+    def _speech_config(self, voice: str):
+        """Build the audio generation config for a prebuilt voice."""
+        return types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name=voice
+                    )
+                )
+            )
+        )
+
+
+# Global Gemini TTS synthesizer instance (one genai.Client with warm connections)
+gemini_tts_synthesizer = None
+_synthesizer_lock = threading.Lock()
+
+# Bounded pool behind synthesize_async / synthesize_many
+_tts_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('GEMINI_TTS_WORKERS', '4')),
+    thread_name_prefix='gemini-tts'
+)
+
+def get_gemini_tts_synthesizer() -> GeminiTTSSynthesizer:
+    """Get or create the global Gemini TTS synthesizer instance."""
+    global gemini_tts_synthesizer
+    if gemini_tts_synthesizer is None:
+        with _synthesizer_lock:
+            if gemini_tts_synthesizer is None:
+                gemini_tts_synthesizer = GeminiTTSSynthesizer()
+    return gemini_tts_synthesizer
+
+
+def stream_speech(text: str, language_code: str = 'en') -> Iterator[bytes]:
+    """Convenience wrapper around GeminiTTSSynthesizer.stream_speech"""
+    return get_gemini_tts_synthesizer().stream_speech(text, language_code)
+
+
+def synthesize_async(
+    text: str,
+    language_code: str = 'en',
+    output_path: str = "tts_output/gemini_response.wav"
+) -> Future:
+    """Start synthesis on the shared pool; the future resolves to the output path or None."""
+    return _tts_executor.submit(synthesize_speech, text, language_code, output_path)
+
+
+def synthesize_many(items: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+    """
+    Synthesize several (text, language_code, output_path) items concurrently.
+
+    Returns output paths (or None for failures) in the order of items.
+    """
+    futures = [synthesize_async(text, language_code, output_path) for text, language_code, output_path in items]
+    return [future.result() for future in futures]
+
 
 def synthesize_speech(
     text: str,
     language_code: str = 'en',
     output_path: str = "tts_output/gemini_response.wav"
 ) -> Optional[str]:
-    """Convenience wrapper around GeminiTTSSynthesizer"""
+    """Convenience wrapper around the shared GeminiTTSSynthesizer"""
     try:
-        synth = GeminiTTSSynthesizer()
-        result = synth.synthesize_speech(text, language_code, output_path)
+        result = get_gemini_tts_synthesizer().synthesize_speech(text, language_code, output_path)
         if result:
             return result
         else:
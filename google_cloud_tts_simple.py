@@ -4,10 +4,18 @@ Simplified Google Cloud TTS using existing Google AI API key
 No service account required!
 """
 
+import io
 import os
+import wave
 import requests
 import base64
-from typing import Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
 
 class SimpleGoogleCloudTTS:
     """Simple Google Cloud TTS using REST API with existing API key"""
@@ -27,6 +35,16 @@ class SimpleGoogleCloudTTS:
         'or': 'en-US',          # Odia (using English) ⚠️
     }
 
+    # Output formats (see audio_utils.AUDIO_FORMATS) to Cloud TTS audio encodings
+    AUDIO_ENCODINGS = {
+        'mp3': 'MP3',
+        'opus': 'OGG_OPUS',
+        'wav': 'LINEAR16',  # Returned with a WAV header
+    }
+
+    # PCM rate requested for SSML batches that are split at mark timepoints
+    MARKED_SAMPLE_RATE = 24000
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the TTS synthesizer.
@@ -47,6 +65,8 @@ class SimpleGoogleCloudTTS:
                 "No API key found. Set GOOGLE_AI_API_KEY, GEMINI_API_KEY, or GOOGLE_API_KEY."
             )
         
+        # Keep-alive session so repeated requests skip the TLS handshake
+        self.session = requests.Session()
         print(f"✅ Simple Google Cloud TTS initialized with API key prefix {self.api_key[:8]}...")
 
     def get_language_code(self, language_code: str) -> str:
@@ -57,11 +77,15 @@ class SimpleGoogleCloudTTS:
         self,
         text: str,
         language_code: str = 'en',
-        output_path: str = "tts_output/google_cloud_response.mp3"
+        output_path: str = "tts_output/google_cloud_response.mp3",
+        audio_format: str = 'mp3'
     ) -> Optional[str]:
         """
         Generate speech audio from text using Google Cloud TTS REST API.
 
+        Args:
+            audio_format: 'mp3', 'opus' (Ogg Opus) or 'wav'; encoded by the API
+
         Returns the path to the saved file, or None on error.
         """
         # Ensure output directory exists
@@ -86,22 +110,16 @@ class SimpleGoogleCloudTTS:
                     "ssmlGender": "NEUTRAL"
                 },
                 "audioConfig": {
-                    "audioEncoding": "MP3"
+                    "audioEncoding": self.AUDIO_ENCODINGS.get(audio_format, "MP3")
                 }
             }
             
             # Make the request
-            print(f"🔗 Making request to Google Cloud TTS API...")
-            print(f"📝 Request payload: {payload}")
-            response = requests.post(url, json=payload)
-            
-            print(f"📊 Response status: {response.status_code}")
-            print(f"📊 Response headers: {dict(response.headers)}")
+            response = self.session.post(url, json=payload, timeout=30)
             
             if response.status_code == 200:
                 # Decode the audio content
                 response_data = response.json()
-                print(f"📊 Response data keys: {list(response_data.keys())}")
                 
                 if 'audioContent' in response_data:
                     audio_content = base64.b64decode(response_data['audioContent'])
@@ -124,16 +142,123 @@ class SimpleGoogleCloudTTS:
             print(f"❌ Error in Simple Google Cloud TTS synthesis: {e}")
             return None
 
+    def synthesize_with_marks(self, texts: List[str], language_code: str = 'en') -> Optional[List[np.ndarray]]:
+        """
+        Synthesize several texts in one SSML request and split the audio at mark timepoints.
+
+        Each text is preceded by <mark name="itemN"/>; the v1beta1 API reports
+        when every mark is reached, and the LINEAR16 audio is cut there.
+
+        Returns:
+            One int16 clip per text at MARKED_SAMPLE_RATE, or None on error
+        """
+        google_language = self.get_language_code(language_code)
+        ssml = '<speak>' + ''.join(
+            f'<mark name="item{index}"/>{escape(text)}<break time="300ms"/>' for index, text in enumerate(texts)
+        ) + '</speak>'
+        characters = sum(len(text) for text in texts)
+        print(f"🎤 Simple Google Cloud TTS: {len(texts)} marked items in one request ({characters} chars)")
+
+        try:
+            url = f"https://texttospeech.googleapis.com/v1beta1/text:synthesize?key={self.api_key}"
+            payload = {
+                "input": {"ssml": ssml},
+                "voice": {
+                    "languageCode": google_language,
+                    "ssmlGender": "NEUTRAL"
+                },
+                "audioConfig": {
+                    "audioEncoding": "LINEAR16",
+                    "sampleRateHertz": self.MARKED_SAMPLE_RATE
+                },
+                "enableTimePointing": ["SSML_MARK"]
+            }
+            response = self.session.post(url, json=payload, timeout=30)
+            if response.status_code != 200:
+                print(f"❌ Google Cloud TTS API error: {response.status_code}")
+                print(f"❌ Error response: {response.text}")
+                return None
+
+            response_data = response.json()
+            marks = {point["markName"]: point.get("timeSeconds", 0.0) for point in response_data.get("timepoints", [])}
+            if 'audioContent' not in response_data or len(marks) != len(texts):
+                print(f"❌ Marked synthesis returned {len(marks)} timepoints for {len(texts)} items")
+                return None
+
+            with wave.open(io.BytesIO(base64.b64decode(response_data['audioContent']))) as wav_file:
+                samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2')
+                rate = wav_file.getframerate()
+
+            bounds = [min(int(marks[f"item{index}"] * rate), len(samples)) for index in range(len(texts))]
+            bounds.append(len(samples))
+            return [samples[bounds[index]:bounds[index + 1]] for index in range(len(texts))]
+
+        except Exception as e:
+            print(f"❌ Error in marked Google Cloud TTS synthesis: {e}")
+            return None
+
+
+# Global Cloud TTS instance (one keep-alive session shared by all requests)
+google_cloud_tts = None
+_tts_lock = threading.Lock()
+
+# Bounded pool behind synthesize_async / synthesize_many
+_tts_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('GOOGLE_CLOUD_TTS_WORKERS', '4')),
+    thread_name_prefix='cloud-tts'
+)
+
+def get_google_cloud_tts() -> SimpleGoogleCloudTTS:
+    """Get or create the global Cloud TTS instance."""
+    global google_cloud_tts
+    if google_cloud_tts is None:
+        with _tts_lock:
+            if google_cloud_tts is None:
+                google_cloud_tts = SimpleGoogleCloudTTS()
+    return google_cloud_tts
+
 
 def synthesize_speech(
     text: str,
     language_code: str = 'en',
-    output_path: str = "tts_output/google_cloud_response.mp3"
+    output_path: str = "tts_output/google_cloud_response.mp3",
+    audio_format: str = 'mp3'
 ) -> Optional[str]:
-    """Convenience wrapper around SimpleGoogleCloudTTS"""
+    """Convenience wrapper around the shared SimpleGoogleCloudTTS"""
+    try:
+        return get_google_cloud_tts().synthesize_speech(text, language_code, output_path, audio_format)
+    except Exception as e:
+        print(f"❌ Error initializing or running Simple Google Cloud TTS: {e}")
+        return None
+
+
+def synthesize_async(
+    text: str,
+    language_code: str = 'en',
+    output_path: str = "tts_output/google_cloud_response.mp3",
+    audio_format: str = 'mp3'
+) -> Future:
+    """Start synthesis on the shared pool; the future resolves to the output path or None."""
+    return _tts_executor.submit(synthesize_speech, text, language_code, output_path, audio_format)
+
+
+def synthesize_many(items: List[Tuple[str, str, str]], audio_format: str = 'mp3') -> List[Optional[str]]:
+    """
+    Synthesize several (text, language_code, output_path) items concurrently.
+
+    Returns output paths (or None for failures) in the order of items.
+    """
+    futures = [
+        synthesize_async(text, language_code, output_path, audio_format)
+        for text, language_code, output_path in items
+    ]
+    return [future.result() for future in futures]
+
+
+def synthesize_with_marks(texts: List[str], language_code: str = 'en') -> Optional[List[np.ndarray]]:
+    """Synthesize texts in one SSML request; returns one PCM clip per text or None."""
     try:
-        synth = SimpleGoogleCloudTTS()
-        return synth.synthesize_speech(text, language_code, output_path)
+        return get_google_cloud_tts().synthesize_with_marks(texts, language_code)
     except Exception as e:
         print(f"❌ Error initializing or running Simple Google Cloud TTS: {e}")
         return None
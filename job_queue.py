@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Job Queue
+SQLite-backed background jobs for slow endpoints, run on a bounded worker pool
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Tuple
+
+# Job states; queued and running jobs are picked up again after a restart
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+# A handler takes the job payload and returns (result body, HTTP status code)
+JobHandler = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], int]]
+
+
+class JobQueue:
+    """
+    Persistent queue of jobs executed by a small thread pool.
+
+    Every state change is written to SQLite before it is visible, so a job
+    accepted with 202 is either finished or re-run after a restart. Waiters
+    (SSE streams) are woken through a condition variable instead of polling.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None,
+                 retention_hours: Optional[float] = None):
+        self.db_path = db_path or os.getenv('JOBS_DB_PATH', 'jobs.sqlite')
+        self.workers = workers or int(os.getenv('JOB_WORKERS', '2'))
+        self.retention_hours = retention_hours or float(os.getenv('JOB_RETENTION_HOURS', '24'))
+        # Finished jobs are purged at most this often, from start() and submit()
+        self.purge_interval = float(os.getenv('JOB_PURGE_INTERVAL_MINUTES', '30')) * 60
+        self._last_purge = 0.0
+
+        self.handlers: Dict[str, JobHandler] = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+
+        with self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    status_code INTEGER,
+                    result TEXT,
+                    error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.db_path, timeout=10)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the function that executes jobs of a kind."""
+        self.handlers[kind] = handler
+
+    def start(self):
+        """Start the worker pool and re-queue jobs left unfinished by a previous process (idempotent)."""
+        with self._lock:
+            if self._executor:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job-worker')
+
+        self._purge()
+        with self._connect() as db:
+            pending = [row["id"] for row in db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created", (QUEUED, RUNNING)
+            )]
+            db.execute("UPDATE jobs SET status = ?, updated = ? WHERE status = ?", (QUEUED, time.time(), RUNNING))
+        for job_id in pending:
+            self._executor.submit(self._execute, job_id)
+        print(f"🧵 [JOBS] Started {self.workers} workers, re-queued {len(pending)} unfinished jobs")
+
+    def _purge(self):
+        """Delete finished jobs older than the retention period, at most once per purge interval."""
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge < self.purge_interval:
+                return
+            self._last_purge = now
+        cutoff = now - self.retention_hours * 3600
+        with self._connect() as db:
+            db.execute("DELETE FROM jobs WHERE status IN (?, ?) AND updated < ?", (DONE, FAILED, cutoff))
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Persist a job and schedule it; returns the job id."""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        self.start()
+        self._purge()
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), QUEUED, now, now)
+            )
+        self._executor.submit(self._execute, job_id)
+        return job_id
+
+    def _update(self, job_id: str, **fields):
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        with self._changed:
+            self._changed.notify_all()
+
+    def _execute(self, job_id: str):
+        with self._connect() as db:
+            row = db.execute("SELECT kind, payload, status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row or row["status"] != QUEUED:
+            return
+
+        self._update(job_id, status=RUNNING)
+        started = time.time()
+        try:
+            result, status_code = self.handlers[row["kind"]](json.loads(row["payload"]))
+            status = DONE if status_code < 400 else FAILED
+            error = None if status == DONE else (result or {}).get("error")
+            self._update(job_id, status=status, status_code=status_code, result=json.dumps(result), error=error)
+        except Exception as e:
+            print(f"❌ [JOBS] {row['kind']} job {job_id} failed: {e}")
+            self._update(job_id, status=FAILED, status_code=500, error=str(e))
+        print(f"🧵 [JOBS] {row['kind']} job {job_id} finished in {time.time() - started:.1f}s")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's public state, or None if it does not exist."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "status_code": row["status_code"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created": row["created"],
+            "updated": row["updated"]
+        }
+
+    def wait_for_change(self, job_id: str, last_updated: float, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until the job changes after last_updated (or timeout); returns its current state."""
+        deadline = time.time() + timeout
+        job = self.get(job_id)
+        while job and job["updated"] <= last_updated and job["status"] not in FINISHED_STATES:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            with self._changed:
+                self._changed.wait(min(remaining, 1.0))
+            job = self.get(job_id)
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return job counts by status."""
+        with self._connect() as db:
+            counts = {row["status"]: row["count"] for row in db.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+            )}
+        return {"workers": self.workers, **{status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)}}
+
+
+# Global job queue instance
+job_queue = None
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue instance."""
+    global job_queue
+    if job_queue is None:
+        job_queue = JobQueue()
+    return job_queue
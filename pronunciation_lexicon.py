@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Pronunciation Lexicon
+Per-language record of breakdown words whose audio is rendered once in the background
+"""
+
+import os
+import re
+import json
+import time
+import queue
+import tempfile
+import threading
+import unicodedata
+from typing import Optional, Dict, Any, List, Tuple
+
+from artifact_index import get_artifact_index, tts_filename
+from tts_synthesizer_admin_controlled import synthesize_many, planned_backends, DEFAULT_AUDIO_FORMAT
+from tts_text_normalizer import normalize_for_tts
+
+# Longer entries are phrases or explanations, not words to pronounce
+MAX_WORD_CHARS = 40
+
+# Words rendered per synthesize_many call
+RENDER_BATCH_SIZE = 8
+
+# How long an inline render waits for words another thread is already rendering
+RENDER_WAIT_SECONDS = float(os.getenv('PRONUNCIATION_RENDER_WAIT_SECONDS', '30'))
+
+# Quick translation: "word -- translation" or "script / romanized -- translation"
+_QUICK_TRANSLATION_LINE = re.compile(r'^\s*(?:[-•*]\s*)?(?P<word>[^\n]+?)\s+--\s+\S')
+
+# Detailed breakdown: "• word (pronunciation) – translation"
+_BREAKDOWN_BULLET = re.compile(r'^\s*•\s*(?P<word>[^\n(–—]+?)\s*(?:\([^)\n]*\))?\s*[–—-]\s+\S')
+
+
+def extract_breakdown_words(text: str) -> List[str]:
+    """Return the words listed in a quick translation or detailed breakdown, in order."""
+    words = []
+    for line in (text or '').splitlines():
+        match = _BREAKDOWN_BULLET.match(line) or _QUICK_TRANSLATION_LINE.match(line)
+        if not match:
+            continue
+        # Script languages list "native / romanized"; only the native form is spoken
+        word = match.group('word').split(' / ')[0].strip()
+        if word and len(word) <= MAX_WORD_CHARS:
+            words.append(word)
+    return words
+
+
+def normalize_word(word: str, language_code: str) -> str:
+    """Speakable, case-folded form of a word without surrounding punctuation."""
+    word = normalize_for_tts(word, language_code)
+    start, end = 0, len(word)
+    while start < end and unicodedata.category(word[start]).startswith(('P', 'S')):
+        start += 1
+    while end > start and unicodedata.category(word[end - 1]).startswith(('P', 'S')):
+        end -= 1
+    return word[start:end].casefold()
+
+
+class PronunciationLexicon:
+    """
+    Words seen in breakdowns, per language, with audio rendered once.
+
+    Word audio is ordinary TTS output with a content-addressed name, so it is
+    served from /uploads with immutable caching and shares eviction with the
+    rest of tts_output; evicted words are rendered again on their next use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            'PRONUNCIATION_LEXICON_PATH', os.path.join('tts_output', 'lexicon', 'words.json')
+        )
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        # (language_code, word) -> Event set once its render finishes
+        self._pending: Dict[tuple, threading.Event] = {}
+        self._thread = None
+        self.rendered = 0
+        self.failed = 0
+
+        # {language_code: {normalized word: {"count": n, "first_seen": timestamp}}}
+        self.words: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.words = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ [LEXICON] Could not read {self.path}: {e}")
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                data = json.dumps(self.words, ensure_ascii=False)
+            # A unique temp file per save, so concurrent saves never write into each other
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+        except OSError as e:
+            print(f"⚠️ [LEXICON] Could not save lexicon: {e}")
+
+    def find_audio(self, language_code: str, word: str, backends: List[str]) -> Optional[str]:
+        """Artifact name of existing audio for a normalized word in the default format, if any."""
+        index = get_artifact_index()
+        for backend in backends:
+            filename = tts_filename(backend, language_code, DEFAULT_AUDIO_FORMAT, word)
+            if index.contains(filename):
+                return filename
+        return None
+
+    def add_words(self, language_code: str, words: List[str], queue_missing: bool = True) -> List[str]:
+        """
+        Record words from a breakdown and queue the ones without audio for rendering.
+
+        Pass queue_missing=False when the caller renders the words itself.
+        Returns the normalized words in order (empty ones dropped).
+        """
+        normalized = [normalize_word(word, language_code) for word in words]
+        normalized = [word for word in normalized if word]
+        now = time.time()
+        with self._lock:
+            entries = self.words.setdefault(language_code, {})
+            for word in normalized:
+                entry = entries.setdefault(word, {"count": 0, "first_seen": now})
+                entry["count"] += 1
+
+        if queue_missing:
+            backends = planned_backends()
+            for word in dict.fromkeys(normalized):
+                if not self.find_audio(language_code, word, backends):
+                    self._enqueue(language_code, word)
+        self._save()
+        return normalized
+
+    def _claim(self, words: List[tuple]) -> Tuple[List[tuple], Dict[tuple, threading.Event]]:
+        """
+        Mark (language_code, word) pairs as being rendered by the caller.
+
+        Returns the pairs the caller now owns, and the completion events of
+        pairs another thread is already rendering.
+        """
+        owned, waiting = [], {}
+        with self._lock:
+            for pair in dict.fromkeys(words):
+                if pair in self._pending:
+                    waiting[pair] = self._pending[pair]
+                else:
+                    self._pending[pair] = threading.Event()
+                    owned.append(pair)
+        return owned, waiting
+
+    def _release(self, words: List[tuple]):
+        with self._lock:
+            done = [self._pending.pop(pair, None) for pair in words]
+        for event in done:
+            if event:
+                event.set()
+
+    def _enqueue(self, language_code: str, word: str):
+        owned, _ = self._claim([(language_code, word)])
+        if not owned:
+            return
+        with self._lock:
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pronunciation-lexicon", daemon=True)
+                self._thread.start()
+        self._queue.put((language_code, word))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < RENDER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.render(batch, claimed=True)
+            except Exception as e:
+                print(f"❌ [LEXICON] Rendering failed: {e}")
+
+    def render(self, words: List[tuple], claimed: bool = False) -> Dict[tuple, Optional[str]]:
+        """
+        Synthesize (language_code, normalized word) pairs that have no audio yet.
+
+        Pairs already being rendered elsewhere (background queue or another
+        request) are not synthesized again: their render is awaited, for up to
+        RENDER_WAIT_SECONDS, and its audio returned. claimed is set by the
+        background worker, which owns its batch already.
+
+        Returns {(language_code, word): artifact filename or None}.
+        """
+        if claimed:
+            owned, waiting = list(dict.fromkeys(words)), {}
+        else:
+            owned, waiting = self._claim(words)
+        try:
+            results = self._render(owned)
+        finally:
+            self._release(owned)
+
+        if waiting:
+            backends = planned_backends()
+            deadline = time.time() + RENDER_WAIT_SECONDS
+            for (language_code, word), done in waiting.items():
+                done.wait(max(0.0, deadline - time.time()))
+                results[(language_code, word)] = self.find_audio(language_code, word, backends)
+        return results
+
+    def _render(self, words: List[tuple]) -> Dict[tuple, Optional[str]]:
+        index = get_artifact_index()
+        backends = planned_backends()
+        results = {}
+        todo = []
+        for language_code, word in words:
+            filename = self.find_audio(language_code, word, backends)
+            if filename:
+                results[(language_code, word)] = filename
+            else:
+                filename = tts_filename(backends[0], language_code, DEFAULT_AUDIO_FORMAT, word)
+                todo.append((word, language_code, os.path.join('tts_output', filename)))
+
+        os.makedirs('tts_output', exist_ok=True)
+        for (word, language_code, _), result in zip(todo, synthesize_many(todo, DEFAULT_AUDIO_FORMAT) if todo else []):
+            # Placeholder tones must never become a word's pronunciation
+            success = result.get("success") and not result.get("placeholder")
+            if success:
+                results[(language_code, word)] = index.publish(result, word, language_code)
+            else:
+                results[(language_code, word)] = None
+                if result.get("output_path"):
+                    try:
+                        os.remove(result["output_path"])
+                    except OSError:
+                        pass
+            with self._lock:
+                if success:
+                    self.rendered += 1
+                else:
+                    self.failed += 1
+        if todo:
+            print(f"🔤 [LEXICON] Rendered {len(todo)} words")
+        return results
+
+    def lookup(self, language_code: str, words: List[str], render_missing: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return {"word", "normalized", "audio"} for each word, in order.
+
+        audio is the artifact filename, or None while it is still being
+        rendered; with render_missing, missing audio is synthesized first.
+        """
+        normalized = [normalize_word(word, language_code) for word in words]
+        backends = planned_backends()
+        audio = {}
+        for word in dict.fromkeys(word for word in normalized if word):
+            audio[word] = self.find_audio(language_code, word, backends)
+
+        missing = [(language_code, word) for word, filename in audio.items() if filename is None]
+        if missing and render_missing:
+            for (_, word), filename in self.render(missing).items():
+                audio[word] = filename
+
+        return [
+            {"word": word, "normalized": normal, "audio": audio.get(normal)}
+            for word, normal in zip(words, normalized)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "languages": {language: len(entries) for language, entries in self.words.items()},
+                "pending": len(self._pending),
+                "rendered": self.rendered,
+                "failed": self.failed
+            }
+
+
+# Global lexicon instance
+pronunciation_lexicon = None
+
+def get_pronunciation_lexicon() -> PronunciationLexicon:
+    """Get or create the global pronunciation lexicon."""
+    global pronunciation_lexicon
+    if pronunciation_lexicon is None:
+        pronunciation_lexicon = PronunciationLexicon()
+    return pronunciation_lexicon
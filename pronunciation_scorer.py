@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Pronunciation Scorer
+Local word/character alignment of a transcript against the reference text
+"""
+
+import unicodedata
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+# Languages written without spaces between words are aligned per character
+UNSEGMENTED_LANGUAGES = {'zh', 'ja'}
+
+ZWJ = '\u200d'
+ZWNJ = '\u200c'
+
+
+def grapheme_clusters(text: str) -> List[str]:
+    """
+    Split text into user-perceived characters.
+
+    Combining marks, vowel signs, joiners and virama conjuncts (Devanagari,
+    Tamil, Malayalam, Odia, ...) stay attached to their base character, so
+    "क्ष" or "கு" count as one unit rather than two or three code points.
+    """
+    clusters: List[str] = []
+    for char in text:
+        if clusters:
+            previous = clusters[-1][-1]
+            joins_previous = (
+                unicodedata.category(char) in ('Mn', 'Mc', 'Me')
+                or char in (ZWJ, ZWNJ)
+                or previous == ZWJ
+                or '\ufe00' <= char <= '\ufe0f'
+                # Virama followed by a consonant forms a conjunct
+                or (unicodedata.combining(previous) == 9 and unicodedata.category(char) == 'Lo')
+            )
+            if joins_previous:
+                clusters[-1] += char
+                continue
+        clusters.append(char)
+    return clusters
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize, casefold and replace punctuation/symbols with spaces."""
+    text = unicodedata.normalize('NFC', text or '').casefold()
+    return ''.join(' ' if unicodedata.category(c)[0] in ('P', 'S') else c for c in text)
+
+
+def tokenize(text: str, language_code: str = 'en') -> List[str]:
+    """Split normalized text into alignment units (words, or characters for zh/ja)."""
+    normalized = normalize_text(text)
+    if language_code in UNSEGMENTED_LANGUAGES:
+        return [g for g in grapheme_clusters(normalized) if not g.isspace()]
+    return normalized.split()
+
+
+def edit_distance_matrix(reference: np.ndarray, hypothesis: np.ndarray, substitution_costs: np.ndarray = None) -> np.ndarray:
+    """
+    Full Levenshtein matrix for two integer sequences.
+
+    Each row is computed with numpy: substitutions and deletions come straight
+    from the previous row, and the left-to-right insertion chain is resolved
+    with a running minimum (min over k of row[k] + (j - k)).
+
+    Args:
+        reference: Integer ids of the reference sequence
+        hypothesis: Integer ids of the hypothesis sequence
+        substitution_costs: Optional (len(reference), len(hypothesis)) matrix
+            of substitution costs in [0, 1]; defaults to 0 for equal ids, else 1
+    """
+    n, m = len(reference), len(hypothesis)
+    offsets = np.arange(m + 1)
+    dtype = np.int32 if substitution_costs is None else np.float64
+    matrix = np.empty((n + 1, m + 1), dtype=dtype)
+    matrix[0] = offsets
+
+    for i in range(1, n + 1):
+        previous = matrix[i - 1]
+        if substitution_costs is None:
+            costs = hypothesis != reference[i - 1]
+        else:
+            costs = substitution_costs[i - 1]
+        substitution = previous[:-1] + costs
+        deletion = previous[1:] + 1
+        row = np.empty(m + 1, dtype=dtype)
+        row[0] = i
+        row[1:] = np.minimum(substitution, deletion)
+        matrix[i] = np.minimum.accumulate(row - offsets) + offsets
+
+    return matrix
+
+
+def _to_ids(*sequences: List[str]) -> List[np.ndarray]:
+    """Map tokens to shared integer ids so comparisons vectorize."""
+    vocabulary: Dict[str, int] = {}
+    return [
+        np.array([vocabulary.setdefault(token, len(vocabulary)) for token in sequence], dtype=np.int32)
+        for sequence in sequences
+    ]
+
+
+def align(reference: List[str], hypothesis: List[str]) -> List[Tuple[str, int, int]]:
+    """
+    Align two token lists.
+
+    Substituting one word for another costs their character dissimilarity,
+    so near misses ("ola" for "hola") pair up instead of being split into an
+    omission plus an insertion.
+
+    Returns:
+        List of (tag, ref_index, hyp_index) with tag in match/substitution/
+        omission/insertion; the missing side's index is -1
+    """
+    ref_ids, hyp_ids = _to_ids(reference, hypothesis)
+
+    # Character dissimilarity for each distinct (reference, hypothesis) pair
+    costs = (ref_ids[:, None] != hyp_ids[None, :]).astype(np.float64)
+    pair_costs: Dict[Tuple[int, int], float] = {}
+    for i, j in zip(*np.nonzero(costs)):
+        key = (ref_ids[i], hyp_ids[j])
+        if key not in pair_costs:
+            pair_costs[key] = 1.0 - character_similarity(reference[i], hypothesis[j])
+        costs[i, j] = pair_costs[key]
+
+    matrix = edit_distance_matrix(ref_ids, hyp_ids, costs)
+
+    operations = []
+    i, j = len(reference), len(hypothesis)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and np.isclose(matrix[i, j], matrix[i - 1, j - 1] + costs[i - 1, j - 1]):
+            exact = ref_ids[i - 1] == hyp_ids[j - 1]
+            operations.append(('match' if exact else 'substitution', i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif i > 0 and np.isclose(matrix[i, j], matrix[i - 1, j] + 1):
+            operations.append(('omission', i - 1, -1))
+            i -= 1
+        else:
+            operations.append(('insertion', -1, j - 1))
+            j -= 1
+
+    operations.reverse()
+    return operations
+
+
+def character_similarity(reference: str, spoken: str) -> float:
+    """Similarity in [0, 1] between two strings, measured over grapheme clusters."""
+    ref_clusters, spoken_clusters = grapheme_clusters(reference), grapheme_clusters(spoken)
+    longest = max(len(ref_clusters), len(spoken_clusters))
+    if longest == 0:
+        return 1.0
+    ref_ids, spoken_ids = _to_ids(ref_clusters, spoken_clusters)
+    distance = edit_distance_matrix(ref_ids, spoken_ids)[-1, -1]
+    return 1.0 - distance / longest
+
+
+def score_pronunciation(reference_text: str, transcript: str, language_code: str = 'en') -> Dict[str, Any]:
+    """
+    Score a transcript against the text the learner was asked to read.
+
+    Every reference unit gets a tag (match, substitution or omission, plus
+    insertion for extra spoken units). Substitutions earn partial credit
+    equal to their character similarity, so a near miss scores higher than
+    a different word.
+
+    Returns:
+        Dictionary with accuracy (0-100), word_accuracy, char_accuracy,
+        per-unit tags and tag counts
+    """
+    reference = tokenize(reference_text, language_code)
+    hypothesis = tokenize(transcript, language_code)
+
+    words = []
+    counts = {'match': 0, 'substitution': 0, 'omission': 0, 'insertion': 0}
+    credit = 0.0
+    for tag, ref_index, hyp_index in align(reference, hypothesis):
+        ref_token = reference[ref_index] if ref_index >= 0 else ''
+        hyp_token = hypothesis[hyp_index] if hyp_index >= 0 else ''
+        similarity = {'match': 1.0, 'omission': 0.0, 'insertion': 0.0}.get(tag)
+        if similarity is None:
+            similarity = character_similarity(ref_token, hyp_token)
+        credit += similarity if tag != 'insertion' else 0.0
+        counts[tag] += 1
+        words.append({
+            "reference": ref_token,
+            "spoken": hyp_token,
+            "tag": tag,
+            "similarity": round(similarity, 3)
+        })
+
+    total = len(reference) + counts['insertion']
+    ref_chars = grapheme_clusters(''.join(reference))
+    char_accuracy = character_similarity(''.join(reference), ''.join(hypothesis)) if ref_chars else 0.0
+
+    return {
+        "accuracy": round(100.0 * credit / total, 1) if total else 0.0,
+        "word_accuracy": round(100.0 * counts['match'] / len(reference), 1) if reference else 0.0,
+        "char_accuracy": round(100.0 * max(char_accuracy, 0.0), 1),
+        "unit": "character" if language_code in UNSEGMENTED_LANGUAGES else "word",
+        "words": words,
+        "counts": counts
+    }
+
+
+def format_phoneme_analysis(score: Dict[str, Any]) -> str:
+    """Render a score as the plain-text phoneme_analysis passed to detailed feedback."""
+    lines = [
+        f"Accuracy: {score['accuracy']}% "
+        f"({score['unit']} accuracy {score['word_accuracy']}%, character accuracy {score['char_accuracy']}%)"
+    ]
+    for word in score['words']:
+        if word['tag'] == 'substitution':
+            lines.append(f"- Substituted '{word['reference']}' with '{word['spoken']}' (similarity {word['similarity']})")
+        elif word['tag'] == 'omission':
+            lines.append(f"- Omitted '{word['reference']}'")
+        elif word['tag'] == 'insertion':
+            lines.append(f"- Added '{word['spoken']}'")
+    if len(lines) == 1:
+        lines.append("- Every word matched the reference")
+    return "\n".join(lines)
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, render_template, redirect, url_for, session, send_from_directory
+from flask import Flask, request, jsonify, render_template, redirect, url_for, session, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
 import json
@@ -8,8 +8,27 @@ import shutil
 from werkzeug.utils import secure_filename
 import numpy as np
 import datetime
-from gemini_client import get_conversational_response, get_detailed_feedback, get_text_suggestions, get_translation, is_gemini_ready, get_short_feedback, get_detailed_breakdown, create_tutor, get_quick_translation
-from tts_synthesizer_admin_controlled import synthesize_speech
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gemini_client import get_conversational_response, get_conversational_response_from_audio, get_detailed_feedback, get_text_suggestions, get_translation, is_gemini_ready, get_short_feedback, get_detailed_breakdown, create_tutor, get_quick_translation
+from tts_synthesizer_admin_controlled import (
+    synthesize_speech, synthesize_many, stream_speech, relay_file, get_web_tts_stats,
+    planned_backends, planned_stream_backends, DEFAULT_AUDIO_FORMAT
+)
+from audio_utils import (
+    wav_stream_header, mime_type_for_path, read_audio_file, concatenate_segments, segment_offsets_ms,
+    write_audio_file, AUDIO_FORMATS
+)
+from tts_cache import get_sentence_cache
+from artifact_index import get_artifact_index, tts_filename, is_content_addressed
+from tts_janitor import get_tts_janitor
+from tts_text_normalizer import normalize_for_tts, get_text_normalizer
+from tts_warmup import get_tts_warmup
+from pronunciation_lexicon import get_pronunciation_lexicon, extract_breakdown_words
+from tts_backend_health import get_backend_selector
+from job_queue import get_job_queue, FINISHED_STATES
+from admin_dashboard import AdminDashboard
+from pronunciation_scorer import score_pronunciation, format_phoneme_analysis
 
 # Import for Google ID token verification
 try:
@@ -21,9 +40,17 @@ except ImportError:
     print("⚠️ Google auth libraries not available - token validation disabled")
 
 # Use Gemini for transcription
-from gemini_transcription import transcribe_audio_gemini, transcribe_audio_with_analysis_gemini
+from gemini_transcription import transcribe_audio_gemini, transcribe_audio_with_analysis_gemini, get_gemini_transcriber
 print("🤖 Using Gemini for transcription")
 
+# Optional: WebSocket support for streaming transcription
+try:
+    from flask_sock import Sock
+    FLASK_SOCK_AVAILABLE = True
+except ImportError:
+    FLASK_SOCK_AVAILABLE = False
+    print("⚠️ flask-sock not available - /transcribe/stream WebSocket disabled")
+
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
@@ -34,7 +61,10 @@ load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # For session management
+# Let a front server that honours X-Sendfile stream files from disk
+app.use_x_sendfile = os.getenv('USE_X_SENDFILE', '0') == '1'
 CORS(app)
+sock = Sock(app) if FLASK_SOCK_AVAILABLE else None
 
 # Optional: Validate Google ID tokens for authenticated calls
 def validate_google_token():
@@ -81,6 +111,21 @@ else:
 
 # Global variables for models
 
+# Bounded pool for /transcribe/batch so one drill set cannot flood Gemini
+batch_transcribe_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('TRANSCRIBE_BATCH_WORKERS', '4')),
+    thread_name_prefix='transcribe-batch'
+)
+MAX_BATCH_CLIPS = int(os.getenv('TRANSCRIBE_BATCH_MAX_CLIPS', '50'))
+
+# Keep tts_output/ and uploads/ within TTS_MAX_BYTES and TTS_MAX_AGE_HOURS
+if os.getenv('TTS_JANITOR_ENABLED', '1') == '1':
+    get_tts_janitor().start()
+
+# Pre-render fallback lines, greetings and suggestion phrases (admin_config "tts_warmup")
+if os.getenv('TTS_WARMUP_ENABLED', '1') == '1':
+    get_tts_warmup().start()
+
 SUPPORTED_LANGUAGES = ['en', 'es', 'hi', 'ja', 'ko', 'zh', 'ar', 'ta', 'or', 'ml', 'fr', 'tl']
 
 def load_models():
@@ -115,16 +160,23 @@ def analyze_speech_with_gemini(audio_path, reference_text, language='en'):
             return {
                 "transcription": "",
                 "reference": reference_text,
-                "analysis": "Error: Could not transcribe audio file."
+                "analysis": "Error: Could not transcribe audio file.",
+                "pronunciation": None
             }
         
-        # Simple analysis using Gemini
-        analysis = f"Transcription: {transcription}\nReference: {reference_text}\nLanguage: {language}"
+        # Score locally against the reference: no extra LLM call
+        pronunciation = None
+        if reference_text:
+            pronunciation = score_pronunciation(reference_text, transcription, language)
+            analysis = format_phoneme_analysis(pronunciation)
+        else:
+            analysis = f"Transcription: {transcription}\nLanguage: {language}"
         
         return {
             "transcription": transcription,
             "reference": reference_text,
-            "analysis": analysis
+            "analysis": analysis,
+            "pronunciation": pronunciation
         }
         
     except Exception as e:
@@ -132,13 +184,19 @@ def analyze_speech_with_gemini(audio_path, reference_text, language='en'):
         return {
             "transcription": "",
             "reference": reference_text,
-            "analysis": f"Error analyzing speech: {str(e)}"
+            "analysis": f"Error analyzing speech: {str(e)}",
+            "pronunciation": None
         }
 
 @app.route('/transcribe', methods=['POST'])
 def transcribe():
-    """FAST: Transcribe audio and get quick Gemini response"""
+    """FAST: Transcribe audio and get quick Gemini response
+    
+    With "mode": "fused" (or TRANSCRIBE_MODE=fused) the audio and tutor prompt
+    go out in one multimodal request; the sequential path is the fallback.
+    """
     try:
+        started = time.perf_counter()
         data = request.get_json()
         audio_file = data.get('audio_file')
         chat_history = data.get('chat_history', [])
@@ -149,8 +207,32 @@ def transcribe():
         feedback_language = data.get('feedback_language', 'en')
         user_goals = data.get('user_goals', [])
         description = data.get('description', None)
-        
-        print(f"🎤 Transcribe request - Language: {language}, Level: {user_level}")
+        mode = data.get('mode') or os.getenv('TRANSCRIBE_MODE', 'sequential')
+        
+        print(f"🎤 Transcribe request - Language: {language}, Level: {user_level}, Mode: {mode}")
+        
+        if mode == 'fused':
+            fused = get_conversational_response_from_audio(
+                audio_file,
+                chat_history,
+                language,
+                user_level,
+                user_topics,
+                formality,
+                feedback_language,
+                user_goals,
+                description
+            )
+            if fused:
+                print(f"📝 Transcription (fused): {fused['transcript']}")
+                return jsonify({
+                    "transcription": fused["transcript"],
+                    "response": fused["reply"],
+                    "mode": "fused",
+                    "timing_ms": round((time.perf_counter() - started) * 1000),
+                    "success": True
+                })
+            print("⚠️ Fused transcription failed, falling back to sequential mode")
         
         # Get transcription
         transcription = transcribe_audio(audio_file, language)
@@ -180,6 +262,8 @@ def transcribe():
         return jsonify({
             "transcription": transcription,
             "response": response,
+            "mode": "sequential",
+            "timing_ms": round((time.perf_counter() - started) * 1000),
             "success": True
         })
         
@@ -270,6 +354,159 @@ def transcribe_only():
             "transcription": ""
         }), 500
 
+@app.route('/transcribe/batch', methods=['POST'])
+def transcribe_batch():
+    """Transcribe many short clips from one multipart request
+    
+    Form fields:
+        audio: one file part per clip (repeat the field), transcribed in parallel
+        language: language code shared by all clips
+    
+    Results come back in upload order with per-clip timing.
+    """
+    try:
+        started = time.perf_counter()
+        clips = request.files.getlist('audio')
+        language = request.form.get('language', 'en')
+        
+        print(f"🎤 Batch transcribe request - Language: {language}, Clips: {len(clips)}")
+        
+        if not clips:
+            return jsonify({"error": "No audio clips provided", "results": []}), 400
+        if len(clips) > MAX_BATCH_CLIPS:
+            return jsonify({
+                "error": f"Too many clips (max {MAX_BATCH_CLIPS})",
+                "results": []
+            }), 400
+        
+        transcriber = get_gemini_transcriber()
+        
+        def transcribe_clip(audio_bytes, filename, mime_type):
+            clip_started = time.perf_counter()
+            try:
+                transcription = transcriber.transcribe_content(audio_bytes, mime_type, language)
+                error = None if transcription else "Could not transcribe audio"
+            except Exception as e:
+                transcription, error = None, str(e)
+            result = {
+                "filename": filename,
+                "transcription": transcription or "",
+                "success": error is None,
+                "elapsed_ms": round((time.perf_counter() - clip_started) * 1000)
+            }
+            if error:
+                result["error"] = error
+            return result
+        
+        # Read every upload before handing off: request files are not thread-safe
+        futures = []
+        for clip in clips:
+            filename = clip.filename or 'recording.webm'
+            mime_type = transcriber.get_mime_type(filename)
+            futures.append(batch_transcribe_executor.submit(transcribe_clip, clip.read(), filename, mime_type))
+        
+        results = []
+        for index, future in enumerate(futures):
+            result = future.result()
+            result["index"] = index
+            results.append(result)
+        
+        succeeded = sum(1 for r in results if r["success"])
+        print(f"📝 Batch transcription: {succeeded}/{len(results)} clips succeeded")
+        
+        return jsonify({
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+            "success": succeeded > 0
+        })
+        
+    except Exception as e:
+        print(f"❌ Batch transcribe error: {e}")
+        return jsonify({
+            "error": str(e),
+            "results": []
+        }), 500
+
+if sock:
+    @sock.route('/transcribe/stream')
+    def transcribe_stream(ws):
+        """
+        Streaming transcription over WebSocket.
+        
+        Protocol:
+            client -> {"type": "start", "language": "es", "mime_type": "audio/webm", "respond": false, ...}
+            client -> binary audio chunks as they are recorded
+            client -> {"type": "stop"}
+            server -> {"type": "partial", "text": ...} while audio arrives
+            server -> {"type": "final", "text": ...} once the recording is complete
+            server -> {"type": "response", "response": ...} when "respond" was requested
+        """
+        import threading
+        from streaming_transcription import create_streaming_recognizer
+        
+        send_lock = threading.Lock()
+        
+        def send(message):
+            with send_lock:
+                ws.send(json.dumps(message))
+        
+        try:
+            start = json.loads(ws.receive())
+            if start.get('type') != 'start':
+                send({"type": "error", "error": "First message must be a start message"})
+                return
+            
+            language = start.get('language', 'en')
+            mime_type = start.get('mime_type', 'audio/webm')
+            print(f"🎙️ [STREAM] Streaming transcription started - Language: {language}")
+            
+            last_partial = {"text": ""}
+            def on_partial(text):
+                if text and text != last_partial["text"]:
+                    last_partial["text"] = text
+                    send({"type": "partial", "text": text})
+            
+            recognizer = create_streaming_recognizer(language, on_partial, mime_type)
+            send({"type": "ready"})
+            
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                if isinstance(message, (bytes, bytearray)):
+                    recognizer.feed(bytes(message))
+                    continue
+                if json.loads(message).get('type') == 'stop':
+                    break
+            
+            transcription = recognizer.finish()
+            print(f"📝 [STREAM] Final transcription: {transcription}")
+            send({"type": "final", "text": transcription})
+            
+            # Start the reply as soon as the final transcript lands
+            if start.get('respond') and transcription:
+                response = get_conversational_response(
+                    transcription,
+                    start.get('chat_history', []),
+                    language,
+                    start.get('user_level', 'beginner'),
+                    start.get('user_topics', []),
+                    start.get('formality', 'friendly'),
+                    start.get('feedback_language', 'en'),
+                    start.get('user_goals', []),
+                    start.get('description', None)
+                )
+                send({"type": "response", "transcription": transcription, "response": response})
+        
+        except Exception as e:
+            print(f"❌ Streaming transcription error: {e}")
+            try:
+                send({"type": "error", "error": str(e)})
+            except Exception:
+                pass
+
 @app.route('/ai_response', methods=['POST'])
 def ai_response():
     """Get AI response for text input"""
@@ -349,6 +586,8 @@ def analyze():
             "transcription": result["transcription"],
             "reference": result["reference"],
             "analysis": result["analysis"],
+            # Per-word tags and accuracy; "analysis" doubles as phoneme_analysis for /feedback
+            "pronunciation": result["pronunciation"],
             "success": True
         })
         
@@ -373,6 +612,8 @@ def conversation_summary():
     """Generate conversation summary"""
     try:
         data = request.get_json()
+        if wants_async_job(data):
+            return enqueue_job('conversation_summary', data)
         chat_history = data.get('chat_history', [])
         subgoal_instructions = data.get('subgoal_instructions', '')
         user_topics = data.get('user_topics', [])
@@ -433,11 +674,18 @@ def root():
             "health": "/health",
             "transcribe": "/transcribe",
             "transcribe_only": "/transcribe_only",
+            "transcribe_batch": "/transcribe/batch",
+            "transcribe_stream": "/transcribe/stream (WebSocket)",
             "ai_response": "/ai_response",
             "suggestions": "/suggestions",
             "translate": "/translate",
             "tts": "/generate_tts",
-            "conversation_summary": "/conversation_summary"
+            "tts_stream": "/generate_tts/stream",
+            "tts_batch": "/generate_tts/batch",
+            "pronunciation_bundle": "/pronunciation/bundle",
+            "conversation_summary": "/conversation_summary",
+            "jobs": "/jobs/<job_id>",
+            "job_events": "/jobs/<job_id>/events (SSE)"
         }
     })
 
@@ -480,6 +728,12 @@ def feedback():
         
         print(f"💬 Feedback request - Language: {language}, Level: {user_level}")
         
+        # Compute the alignment locally when the client did not send one
+        if not phoneme_analysis and reference_text and recognized_text:
+            phoneme_analysis = format_phoneme_analysis(
+                score_pronunciation(reference_text, recognized_text, language)
+            )
+        
         # Get detailed feedback
         feedback = get_detailed_feedback(
             phoneme_analysis,
@@ -668,6 +922,8 @@ def detailed_breakdown():
     """Get detailed breakdown of AI response"""
     try:
         data = request.get_json()
+        if wants_async_job(data):
+            return enqueue_job('detailed_breakdown', data)
         llm_response = data.get('llm_response', '')
         user_input = data.get('user_input', '')
         context = data.get('context', '')
@@ -695,8 +951,12 @@ def detailed_breakdown():
             description
         )
         
+        # Breakdown words get their pronunciation audio rendered in the background
+        words = get_pronunciation_lexicon().add_words(language, extract_breakdown_words(breakdown))
+        
         return jsonify({
             "breakdown": breakdown,
+            "words": words,
             "success": True
         })
         
@@ -779,8 +1039,12 @@ def quick_translation():
             description
         )
         
+        # Breakdown words get their pronunciation audio rendered in the background
+        words = get_pronunciation_lexicon().add_words(language, extract_breakdown_words(translation))
+        
         return jsonify({
             "translation": translation,
+            "words": words,
             "success": True
         })
         
@@ -791,36 +1055,64 @@ def quick_translation():
             "translation": ""
         }), 500
 
+# Accept header mime types for each TTS output format
+TTS_FORMAT_MIME_TYPES = {
+    'audio/mpeg': 'mp3', 'audio/mp3': 'mp3',
+    'audio/ogg': 'opus', 'audio/opus': 'opus',
+    'audio/wav': 'wav', 'audio/wave': 'wav', 'audio/x-wav': 'wav',
+}
+
+def negotiate_tts_format(requested=None):
+    """
+    Pick the TTS output format from the request's format field or Accept header.
+
+    Returns None for an explicitly requested format that is not supported;
+    wildcards and non-audio Accept headers get the server default.
+    """
+    if requested:
+        requested = requested.lower()
+        return requested if requested in AUDIO_FORMATS else None
+
+    default_mime = next(mime for mime, fmt in TTS_FORMAT_MIME_TYPES.items() if fmt == DEFAULT_AUDIO_FORMAT)
+    candidates = [default_mime] + [mime for mime in TTS_FORMAT_MIME_TYPES if mime != default_mime]
+    best = request.accept_mimetypes.best_match(candidates)
+    return TTS_FORMAT_MIME_TYPES[best] if best else DEFAULT_AUDIO_FORMAT
+
 @app.route('/generate_tts', methods=['POST'])
 def generate_tts():
-    """Generate TTS audio with debug information"""
+    """
+    Generate TTS audio with debug information.
+
+    The output format comes from the optional "format" field ('mp3', 'opus'
+    or 'wav') or the Accept header, defaulting to compact MP3.
+    """
     try:
         data = request.get_json()
-        text = data.get('text', '')
+        if wants_async_job(data):
+            return enqueue_job('generate_tts', data)
         language_code = data.get('language_code', 'en')
+        # Only the speakable text is synthesized, hashed and billed
+        original_text = data.get('text', '')
+        text = normalize_for_tts(original_text, language_code)
         cache_key = data.get('cacheKey', '')
+        audio_format = negotiate_tts_format(data.get('format'))
+        if not audio_format:
+            return jsonify({
+                "success": False,
+                "error": f"Unsupported format '{data.get('format')}'. Use one of: {', '.join(AUDIO_FORMATS)}"
+            }), 400
 
-          # Generate unique filename using cacheKey to prevent caching issues
-        import hashlib
-        import os
-        from werkzeug.utils import secure_filename
-        
-        if cache_key:
-            # Use cacheKey to create unique filename (sanitize it first)
-            safe_key = secure_filename(cache_key.replace(' ', '_').replace('/', '_'))
-            # Limit length to avoid filesystem issues
-            if len(safe_key) > 50:
-                safe_key = safe_key[:50]
-            filename = f"{safe_key}.wav"
-        else:
-            # Fallback: use hash of text + timestamp if no cacheKey
-            import time
-            text_hash = hashlib.md5(f"{text}_{time.time()}".encode()).hexdigest()[:8]
-            filename = f"tts_{text_hash}.wav"
+        # Name the file after everything that determines its audio, so identical
+        # requests share one immutable URL (cacheKey values like "message_3" are
+        # reused across conversations and cannot name files safely). The backend
+        # that will produce it is not known yet; publish() renames it afterwards.
+        backends = planned_backends()
+        existing_filename, existing_path = get_artifact_index().find_tts(backends, language_code, audio_format, text)
+        filename = existing_filename or tts_filename(backends[0], language_code, audio_format, text)
         
         output_path = data.get('output_path', f'tts_output/{filename}')
         # Override output_path to use our unique filename
-        if not output_path or output_path == 'tts_output/response.wav':
+        if not output_path or os.path.basename(output_path).startswith('response.'):
             output_path = f'tts_output/{filename}'
         else:
             # If custom path provided, use it but ensure unique filename
@@ -840,20 +1132,40 @@ def generate_tts():
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
         
+        # Identical text, language and format was synthesized before by an allowed backend
+        if existing_path:
+            return jsonify({
+                "success": True,
+                "output_path": filename,
+                "actual_path": existing_path,
+                "message": "TTS served from existing artifact",
+                "format": audio_format,
+                "mime_type": AUDIO_FORMATS[audio_format][0],
+                "placeholder": False,
+                "service_used": "artifact_cache",
+                "fallback_reason": "none",
+                "admin_settings": {},
+                "cost_estimate": "0.00",
+                "request_id": "artifact_cache",
+                "chars_saved": len(original_text) - len(text),
+                "debug": {"cache_key": cache_key}
+            })
+        
         # Generate TTS with debug info
-        result = synthesize_speech(text, language_code, output_path)
+        result = synthesize_speech(text, language_code, output_path, audio_format)
         
         # Handle new dict return format from TTS synthesizer
         if isinstance(result, dict):
             # New format with debug info
             if result.get('success'):
+                # Only real speech is indexed under its content-addressed name
+                filename = get_artifact_index().publish(result, text, language_code)
                 # Get the actual file path from the result
                 actual_output_path = result.get('output_path')
                 
                 # Convert absolute path to relative path for serving
                 if actual_output_path:
-                    import os
-                    filename = os.path.basename(actual_output_path)
+                    filename = filename or os.path.basename(actual_output_path)
                     # Since Python API and Node.js server are on different servers,
                     # we need to return the filename only, and let Node.js server handle the serving
                     relative_path = filename
@@ -867,12 +1179,16 @@ def generate_tts():
                     "output_path": relative_path,  # Return relative path for serving
                     "actual_path": actual_output_path,  # Keep actual path for debugging
                     "message": "TTS generated successfully",
+                    "format": result.get('format'),
+                    "mime_type": result.get('mime_type'),
+                    "placeholder": result.get('placeholder', False),
                     # Include debug information
                     "service_used": result.get('service_used', 'unknown'),
                     "fallback_reason": result.get('fallback_reason', 'none'),
                     "admin_settings": result.get('admin_settings', {}),
                     "cost_estimate": result.get('cost_estimate', 'unknown'),
                     "request_id": result.get('request_id', 'unknown'),
+                    "chars_saved": len(original_text) - len(text),
                     "debug": result
                 })
             else:
@@ -922,6 +1238,378 @@ def generate_tts():
             "debug": {"exception": str(e)}
         }), 500
 
+# Upper bound on items per /generate_tts/batch request
+TTS_BATCH_MAX_ITEMS = int(os.getenv('TTS_BATCH_MAX_ITEMS', '50'))
+
+# Sprites are rendered at this rate with a silent gap between items, so a
+# seek that lands a few ms off (encoder delay) still starts in silence
+SPRITE_SAMPLE_RATE = 24000
+SPRITE_GAP_MS = 300
+
+def build_tts_sprite(filenames, audio_format):
+    """
+    Join TTS artifacts into one sprite file.
+
+    Returns (sprite filename, {filename: {"start_ms", "end_ms"}}), or None if
+    an artifact could not be read or the sprite could not be written.
+    """
+    index = get_artifact_index()
+    sprite_name = tts_filename('sprite', '', audio_format, '|'.join(filenames))
+    segments = []
+    for filename in filenames:
+        path = index.lookup(filename)
+        samples = read_audio_file(path, SPRITE_SAMPLE_RATE) if path else None
+        if samples is None:
+            print(f"⚠️ Sprite item {filename} is not readable")
+            return None
+        segments.append(samples)
+
+    offsets = segment_offsets_ms(segments, SPRITE_SAMPLE_RATE, SPRITE_GAP_MS)
+    if not index.contains(sprite_name):
+        joined = concatenate_segments(segments, SPRITE_SAMPLE_RATE, SPRITE_GAP_MS)
+        path = write_audio_file(os.path.join('tts_output', sprite_name), joined, SPRITE_SAMPLE_RATE, audio_format)
+        if not path:
+            return None
+        index.register(path)
+
+    return sprite_name, {
+        filename: {"start_ms": start, "end_ms": end} for filename, (start, end) in zip(filenames, offsets)
+    }
+
+@app.route('/generate_tts/batch', methods=['POST'])
+def generate_tts_batch():
+    """
+    Generate TTS audio for many items in one request.
+
+    Body: {"items": [{"text": ..., "language_code": ...}, ...], "format": "mp3",
+    "ssml_marks": false, "sprite": false}. Duplicate items are synthesized once, items whose
+    audio already exists are served from the artifact index, and the rest are
+    synthesized concurrently. With ssml_marks, items sharing a language are
+    sent to Google Cloud TTS as one SSML request when it is the active tier.
+    Results are returned in the order of items.
+
+    With sprite, the items are also joined into one file and the response
+    carries its filename plus each item's start_ms/end_ms within it, so a
+    client can fetch once and seek.
+    """
+    try:
+        data = request.get_json() or {}
+        items = data.get('items') or []
+        if not isinstance(items, list) or not items:
+            return jsonify({"success": False, "error": "items must be a non-empty list"}), 400
+        if len(items) > TTS_BATCH_MAX_ITEMS:
+            return jsonify({"success": False, "error": f"At most {TTS_BATCH_MAX_ITEMS} items per batch"}), 400
+        audio_format = negotiate_tts_format(data.get('format'))
+        if not audio_format:
+            return jsonify({
+                "success": False,
+                "error": f"Unsupported format '{data.get('format')}'. Use one of: {', '.join(AUDIO_FORMATS)}"
+            }), 400
+
+        backends = planned_backends()
+        index = get_artifact_index()
+        os.makedirs('tts_output', exist_ok=True)
+
+        # (text, language) -> result; identical items share one entry
+        results = {}
+        item_keys = []
+        misses = []
+        for item in items:
+            language_code = (item or {}).get('language_code', 'en')
+            text = normalize_for_tts((item or {}).get('text', ''), language_code)
+            key = (text, language_code)
+            item_keys.append(key)
+            if key in results or not text.strip():
+                continue
+            filename, _ = index.find_tts(backends, language_code, audio_format, text)
+            if filename:
+                results[key] = {"success": True, "output_path": filename, "service_used": "artifact_cache", "placeholder": False}
+            else:
+                results[key] = None
+                misses.append((text, language_code, f'tts_output/{tts_filename(backends[0], language_code, audio_format, text)}'))
+
+        print(f"🎤 [PYTHON_API] TTS batch: {len(items)} items, {len(results)} unique, {len(misses)} to synthesize")
+
+        synthesized = synthesize_many(misses, audio_format, bool(data.get('ssml_marks'))) if misses else []
+        for (text, language_code, _), result in zip(misses, synthesized):
+            # Only real speech is indexed under its content-addressed name
+            filename = index.publish(result, text, language_code)
+            if filename:
+                results[(text, language_code)] = {
+                    "success": True,
+                    "output_path": filename,
+                    "service_used": result.get('service_used', 'unknown'),
+                    "placeholder": result.get('placeholder', False)
+                }
+            else:
+                results[(text, language_code)] = {"success": False, "error": result.get('error', 'TTS generation failed')}
+
+        empty = {"success": False, "error": "Empty text"}
+        response = {
+            "success": True,
+            "format": audio_format,
+            "mime_type": AUDIO_FORMATS[audio_format][0],
+            "items": [results.get(key) or empty for key in item_keys],
+            "unique_items": len(results),
+            "synthesized": len(misses),
+            "cached": sum(1 for result in results.values() if result and result.get('service_used') == 'artifact_cache')
+        }
+
+        if data.get('sprite'):
+            # One clip per unique item, in order of first appearance
+            artifacts = list(dict.fromkeys(
+                result['output_path'] for result in response['items'] if result.get('success')
+            ))
+            sprite = build_tts_sprite(artifacts, audio_format) if artifacts else None
+            if sprite:
+                sprite_name, offsets = sprite
+                response["sprite"] = {
+                    "output_path": sprite_name,
+                    "items": [offsets.get(result.get('output_path')) for result in response['items']]
+                }
+            else:
+                response["sprite"] = None
+
+        return jsonify(response)
+
+    except Exception as e:
+        print(f"Error in /generate_tts/batch: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/pronunciation/bundle', methods=['POST'])
+def pronunciation_bundle():
+    """
+    Word pronunciation audio for one message.
+
+    Body: {"language_code": ..., "words": [...]} or {"language_code": ...,
+    "text": <breakdown or quick translation>}, plus optional "sprite": true.
+    Returns each word's audio filename (served from /uploads); words not yet
+    in the lexicon are rendered first. With sprite, the words are also joined
+    into one file with start_ms/end_ms offsets per word.
+    """
+    try:
+        data = request.get_json() or {}
+        language_code = data.get('language_code', 'en')
+        words = data.get('words') or extract_breakdown_words(data.get('text', ''))
+        if not isinstance(words, list) or not words:
+            return jsonify({"success": False, "error": "Provide words or a breakdown text"}), 400
+        if not all(isinstance(word, str) and word.strip() for word in words):
+            return jsonify({"success": False, "error": "Every word must be a non-empty string"}), 400
+        if len(words) > TTS_BATCH_MAX_ITEMS:
+            return jsonify({"success": False, "error": f"At most {TTS_BATCH_MAX_ITEMS} words per bundle"}), 400
+
+        lexicon = get_pronunciation_lexicon()
+        # Missing words are rendered inline below, so they are not also queued
+        lexicon.add_words(language_code, words, queue_missing=False)
+        entries = lexicon.lookup(language_code, words, render_missing=True)
+        response = {
+            "success": True,
+            "format": DEFAULT_AUDIO_FORMAT,
+            "mime_type": AUDIO_FORMATS[DEFAULT_AUDIO_FORMAT][0],
+            "words": entries
+        }
+
+        if data.get('sprite'):
+            artifacts = list(dict.fromkeys(entry['audio'] for entry in entries if entry['audio']))
+            sprite = build_tts_sprite(artifacts, DEFAULT_AUDIO_FORMAT) if artifacts else None
+            response["sprite"] = {
+                "output_path": sprite[0],
+                "words": [sprite[1].get(entry['audio']) for entry in entries]
+            } if sprite else None
+
+        return jsonify(response)
+
+    except Exception as e:
+        print(f"❌ Pronunciation bundle error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/generate_tts/stream', methods=['POST'])
+def generate_tts_stream():
+    """
+    Stream TTS audio while it is being synthesized.
+
+    Request JSON: text, language_code and optional format ('wav' or 'pcm').
+    Gemini output is sent as a WAV stream (header first, then PCM as it
+    arrives) or as raw 16-bit mono PCM with the rate in X-Sample-Rate. Other
+    TTS tiers relay the finished file, and audio already synthesized for the
+    same text is relayed from disk (X-TTS-Service 'cache'); relayed files keep
+    their own Content-Type whatever the requested format. X-TTS-Output-Path
+    names the saved, content-addressed copy for later replay through /uploads.
+    """
+    data = request.get_json() or {}
+    language_code = data.get('language_code', 'en')
+    text = normalize_for_tts(data.get('text', ''), language_code)
+    stream_format = data.get('format', 'wav')
+
+    if not text:
+        return jsonify({"success": False, "error": "No text provided"}), 400
+
+    headers = {
+        "Cache-Control": "no-store",
+        # Stop reverse proxies from buffering the whole response
+        "X-Accel-Buffering": "no",
+    }
+
+    # Audio of this text from any planned backend (as a file or an earlier stream) is relayed as is
+    index = get_artifact_index()
+    backends = planned_stream_backends()
+    for audio_format in dict.fromkeys((DEFAULT_AUDIO_FORMAT, 'wav')):
+        filename, cached_path = index.find_tts(backends, language_code, audio_format, text)
+        if cached_path:
+            print(f"🌊 [PYTHON_API] Streaming cached TTS {filename}")
+            headers.update({"X-TTS-Service": "cache", "X-TTS-Output-Path": filename})
+            return Response(stream_with_context(relay_file(cached_path)), mimetype=mime_type_for_path(cached_path),
+                            headers=headers, direct_passthrough=True)
+
+    # A Gemini stream is saved here as WAV; other tiers name their own file and are published below
+    output_path = os.path.join('tts_output', tts_filename('gemini', language_code, 'wav', text))
+
+    try:
+        result = stream_speech(text, language_code, output_path)
+    except Exception as e:
+        print(f"❌ TTS stream error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+    if not result.get('success'):
+        return jsonify({
+            "success": False,
+            "error": result.get('error', 'TTS generation failed'),
+            "service_used": result.get('service_used', 'unknown'),
+            "fallback_reason": result.get('fallback_reason', 'none')
+        }), 500
+
+    mime_type = result['mime_type']
+    if mime_type == 'audio/pcm':
+        relayed_chunks = result['chunks']
+
+        def chunks_then_publish():
+            yield from relayed_chunks
+            # The saved copy exists once the stream has been fully relayed
+            index.publish(result, text, language_code)
+
+        chunks = chunks_then_publish()
+        output_name = os.path.basename(output_path)
+    else:
+        # Finished files get their final name before the relay opens them
+        output_name = index.publish(result, text, language_code)
+        chunks = relay_file(result['output_path'])
+
+    headers.update({
+        "X-TTS-Service": result.get('service_used', 'unknown'),
+        "X-TTS-Output-Path": output_name,
+    })
+
+    if mime_type == 'audio/pcm':
+        sample_rate = result['sample_rate']
+        headers["X-Sample-Rate"] = str(sample_rate)
+        if stream_format == 'pcm':
+            mime_type = f'audio/L16;rate={sample_rate};channels=1'
+        else:
+            mime_type = 'audio/wav'
+            pcm_chunks = chunks
+
+            def wav_chunks():
+                yield wav_stream_header(sample_rate)
+                yield from pcm_chunks
+
+            chunks = wav_chunks()
+
+    print(f"🌊 [PYTHON_API] Streaming TTS via {headers['X-TTS-Service']} as {mime_type}")
+    return Response(stream_with_context(chunks), mimetype=mime_type, headers=headers, direct_passthrough=True)
+
+# Slow generation endpoints run as background jobs when the client asks for it,
+# so they do not hold one of the few gunicorn request threads
+JOB_ENDPOINTS = ('conversation_summary', 'detailed_breakdown', 'generate_tts')
+# An event stream holds one of the few request threads, so it stays short;
+# clients reconnect (EventSource does so on its own) or poll /jobs/<id>
+JOB_EVENTS_TIMEOUT_SECONDS = float(os.getenv('JOB_EVENTS_TIMEOUT_SECONDS', '25'))
+JOB_EVENTS_HEARTBEAT_SECONDS = 10
+
+def wants_async_job(data):
+    """True if the request asked to run in the background ("async": true, ?async=1 or Prefer: respond-async)."""
+    return (
+        bool((data or {}).get('async'))
+        or request.args.get('async') in ('1', 'true')
+        or 'respond-async' in request.headers.get('Prefer', '')
+    )
+
+def enqueue_job(endpoint, data):
+    """Queue the current request as a job and answer 202 with where to follow it."""
+    payload = {
+        "path": request.path,
+        "json": {key: value for key, value in (data or {}).items() if key != 'async'},
+        # Format negotiation for /generate_tts reads the Accept header
+        "headers": {"Accept": request.headers.get('Accept', '*/*')}
+    }
+    job_id = get_job_queue().submit(endpoint, payload)
+    status_url = f"/jobs/{job_id}"
+    print(f"🧵 [PYTHON_API] Queued {endpoint} job {job_id}")
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": status_url,
+        "events_url": f"{status_url}/events"
+    }), 202, {"Location": status_url}
+
+def run_endpoint_job(endpoint):
+    """Job handler that replays a queued request through its endpoint."""
+    def handler(payload):
+        with app.test_request_context(payload["path"], method='POST', json=payload["json"], headers=payload.get("headers")):
+            response = app.make_response(app.view_functions[endpoint]())
+            return response.get_json(), response.status_code
+    return handler
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Poll a background job; result holds the endpoint's JSON once status is done or failed."""
+    job = get_job_queue().get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Follow a background job as Server-Sent Events.
+
+    Each status change is sent as an event named after the status with the
+    job as JSON data; the stream ends after "done" or "failed", or with a
+    "timeout" event after JOB_EVENTS_TIMEOUT_SECONDS. The stream occupies a
+    request thread, so it is kept short: clients that see "timeout" reconnect
+    or poll GET /jobs/<id> instead.
+    """
+    jobs = get_job_queue()
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    def events(job):
+        deadline = time.time() + JOB_EVENTS_TIMEOUT_SECONDS
+        last_updated = None
+        while job:
+            if job["updated"] != last_updated:
+                last_updated = job["updated"]
+                yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+                if job["status"] in FINISHED_STATES:
+                    return
+            else:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                yield f"event: timeout\ndata: {json.dumps({'job_id': job_id})}\n\n"
+                return
+            job = jobs.wait_for_change(job_id, last_updated, min(remaining, JOB_EVENTS_HEARTBEAT_SECONDS))
+
+    headers = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(events(job)), mimetype='text/event-stream', headers=headers)
+
+for job_endpoint in JOB_ENDPOINTS:
+    get_job_queue().register(job_endpoint, run_endpoint_job(job_endpoint))
+# Re-queue jobs accepted before a restart
+get_job_queue().start()
+
 @app.route('/admin')
 def admin_index():
     """Main admin dashboard page"""
@@ -971,7 +1659,16 @@ def admin_api_status():
     return jsonify({
         "status": dashboard.get_system_status(),
         "stats": dashboard.get_usage_stats(),
-        "settings": dashboard.get_tts_settings()
+        "settings": dashboard.get_tts_settings(),
+        "sentence_cache": get_sentence_cache().get_stats(),
+        "artifacts": get_artifact_index().get_stats(),
+        "janitor": get_tts_janitor().get_stats(),
+        "tts_backends": get_backend_selector().get_stats(),
+        "web_tts": get_web_tts_stats(),
+        "text_normalizer": get_text_normalizer().get_stats(),
+        "tts_warmup": get_tts_warmup().get_stats(),
+        "pronunciation_lexicon": get_pronunciation_lexicon().get_stats(),
+        "jobs": get_job_queue().get_stats()
     })
 
 @app.route('/admin/api/enable_gemini', methods=['POST'])
@@ -1100,30 +1797,37 @@ def admin_api_toggle_google_api():
 # Serve TTS files
 @app.route('/uploads/<filename>')
 def serve_tts_file(filename):
-    """Serve TTS files created by the Python API"""
+    """
+    Serve TTS files created by the Python API.
+
+    Files are found through the artifact index. Responses support ETag/
+    If-None-Match and Range requests, and content-addressed names are cached
+    as immutable. With TTS_ACCEL_REDIRECT_PREFIX set (e.g. "/internal-tts/"),
+    the transfer is handed to nginx via X-Accel-Redirect; USE_X_SENDFILE=1
+    does the same for servers that honour X-Sendfile.
+    """
     try:
-        print(f"🔍 [PYTHON_API] Request to serve TTS file: {filename}")
-        
-        # Try to find the file in common locations
-        possible_paths = [
-            os.path.join('server', 'dist', 'uploads', filename),
-            os.path.join('uploads', filename),
-            os.path.join('tts_output', filename),
-            filename  # Direct filename
-        ]
-        
-        print(f"🔍 [PYTHON_API] Checking possible paths:")
-        for file_path in possible_paths:
-            print(f"🔍 [PYTHON_API]   - {file_path}: {'EXISTS' if os.path.exists(file_path) else 'NOT FOUND'}")
-            if os.path.exists(file_path):
-                print(f"🔍 [PYTHON_API] Serving TTS file: {file_path}")
-                return send_from_directory(os.path.dirname(file_path), os.path.basename(file_path))
-        
-        print(f"🔍 [PYTHON_API] TTS file not found in any location: {filename}")
-        return jsonify({"error": "File not found"}), 404
+        file_path = get_artifact_index().lookup(filename)
+        if not file_path:
+            return jsonify({"error": "File not found"}), 404
+
+        mimetype = mime_type_for_path(file_path)
+        immutable = is_content_addressed(filename)
+        cache_control = "public, max-age=31536000, immutable" if immutable else "no-cache"
+
+        accel_prefix = os.getenv('TTS_ACCEL_REDIRECT_PREFIX')
+        if accel_prefix:
+            response = Response(mimetype=mimetype or 'application/octet-stream')
+            response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + os.path.relpath(file_path).replace(os.sep, '/')
+            response.headers['Cache-Control'] = cache_control
+            return response
+
+        response = send_file(file_path, mimetype=mimetype, conditional=True, etag=True)
+        response.headers['Cache-Control'] = cache_control
+        return response
         
     except Exception as e:
-        print(f"🔍 [PYTHON_API] Error serving TTS file: {e}")
+        print(f"🔍 [PYTHON_API] Error serving TTS file {filename}: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({"error": "Failed to serve file"}), 500
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Latency benchmarks for the Python API pipelines
+Usage: python scripts/benchmark.py <benchmark> [options]
+
+    transcribe   Sequential (transcribe, then respond) vs fused /transcribe modes
+    transcode    ffmpeg subprocess vs in-process conversion of a TTS clip to WAV
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Run from anywhere: the API modules live in the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def report(name, timings):
+    """Print summary statistics for a list of timings in seconds."""
+    if not timings:
+        print(f"  {name:<12} no successful runs")
+        return
+    ms = sorted(t * 1000 for t in timings)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    print(f"  {name:<12} runs={len(ms):<3} mean={statistics.mean(ms):8.1f} ms  "
+          f"median={statistics.median(ms):8.1f} ms  p95={p95:8.1f} ms")
+
+
+def bench_transcribe(args):
+    """Compare the two /transcribe modes on the same clip."""
+    from gemini_client import get_conversational_response, get_conversational_response_from_audio
+    from gemini_transcription import transcribe_audio_gemini
+
+    def sequential():
+        transcript = transcribe_audio_gemini(args.audio, args.language)
+        if not transcript:
+            return False
+        return bool(get_conversational_response(transcript, [], args.language))
+
+    def fused():
+        return bool(get_conversational_response_from_audio(args.audio, [], args.language))
+
+    results = {"sequential": [], "fused": []}
+    for run in range(args.runs):
+        # Alternate the order so neither mode benefits from warm connections
+        modes = [("sequential", sequential), ("fused", fused)]
+        if run % 2:
+            modes.reverse()
+        for name, fn in modes:
+            started = time.perf_counter()
+            ok = fn()
+            elapsed = time.perf_counter() - started
+            if ok:
+                results[name].append(elapsed)
+            print(f"  run {run + 1} {name:<12} {elapsed * 1000:8.1f} ms {'' if ok else '(failed)'}")
+
+    print(f"\n📊 /transcribe modes on {args.audio} ({args.language}):")
+    for name, timings in results.items():
+        report(name, timings)
+
+
+def bench_transcode(args):
+    """Compare the old file-to-file ffmpeg conversion with the in-process pipeline."""
+    import audio_utils
+
+    with open(args.audio, 'rb') as f:
+        audio_bytes = f.read()
+
+    def subprocess_ffmpeg():
+        with tempfile.TemporaryDirectory() as tmp:
+            # What _convert_to_wav used to do: write the download, spawn ffmpeg, read back
+            src = os.path.join(tmp, 'input' + os.path.splitext(args.audio)[1])
+            dst = os.path.join(tmp, 'output.wav')
+            with open(src, 'wb') as f:
+                f.write(audio_bytes)
+            cmd = ['ffmpeg', '-i', src, '-acodec', 'pcm_s16le', '-ar', str(args.rate), '-ac', '1', dst, '-y']
+            result = subprocess.run(cmd, capture_output=True, timeout=15)
+            return result.returncode == 0
+
+    def in_process():
+        samples = audio_utils.decode_to_pcm(audio_bytes, args.rate)
+        return samples is not None and len(audio_utils.pcm_to_wav_bytes(samples, args.rate)) > 0
+
+    results = {"subprocess": [], "in_process": []}
+    for run in range(args.runs):
+        for name, fn in (("subprocess", subprocess_ffmpeg), ("in_process", in_process)):
+            started = time.perf_counter()
+            try:
+                ok = fn()
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                ok = False
+            if ok:
+                results[name].append(time.perf_counter() - started)
+
+    backend = "PyAV" if audio_utils.PYAV_AVAILABLE else "ffmpeg pipe"
+    print(f"\n📊 Conversion to WAV of {args.audio} ({len(audio_bytes)} bytes, in-process backend: {backend}):")
+    for name, timings in results.items():
+        report(name, timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    transcribe = subparsers.add_parser("transcribe", help="sequential vs fused /transcribe")
+    transcribe.add_argument("audio", help="path to a recorded clip (webm, wav, mp3, ...)")
+    transcribe.add_argument("--language", default="en")
+    transcribe.add_argument("--runs", type=int, default=5)
+    transcribe.set_defaults(func=bench_transcribe)
+
+    transcode = subparsers.add_parser("transcode", help="subprocess vs in-process audio conversion")
+    transcode.add_argument("audio", help="path to a clip to convert (mp3, aiff, ...)")
+    transcode.add_argument("--rate", type=int, default=22050)
+    transcode.add_argument("--runs", type=int, default=20)
+    transcode.set_defaults(func=bench_transcode)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
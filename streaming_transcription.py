@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Streaming Transcription Module
+Incremental speech recognition for audio that is still being recorded
+"""
+
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from audio_utils import SPEECH_SAMPLE_RATE, decode_to_pcm, pcm_to_wav_bytes
+from gemini_transcription import get_gemini_transcriber
+
+# Optional: Google Cloud Speech streaming recognizer
+try:
+    from google.cloud import speech
+    GOOGLE_SPEECH_AVAILABLE = True
+except ImportError:
+    GOOGLE_SPEECH_AVAILABLE = False
+
+# BCP-47 codes for Google Cloud Speech-to-Text
+STT_LANGUAGE_CODES = {
+    'en': 'en-US',
+    'es': 'es-ES',
+    'fr': 'fr-FR',
+    'zh': 'cmn-Hans-CN',
+    'ja': 'ja-JP',
+    'ko': 'ko-KR',
+    'tl': 'fil-PH',
+    'hi': 'hi-IN',
+    'ml': 'ml-IN',
+    'ta': 'ta-IN',
+    'or': 'or-IN',
+    'ar': 'ar-SA',
+}
+
+TranscriptCallback = Callable[[str], None]
+
+
+class StreamingRecognizer(ABC):
+    """
+    Base class for incremental recognizers.
+
+    Audio chunks are pushed with feed() as they arrive; on_partial is called
+    with the best transcript so far and finish() blocks until the final
+    transcript is available.
+    """
+
+    def __init__(self, language_code: str, on_partial: TranscriptCallback):
+        self.language_code = language_code
+        self.on_partial = on_partial
+
+    @abstractmethod
+    def feed(self, chunk: bytes):
+        """Push the next chunk of recorded audio."""
+
+    @abstractmethod
+    def finish(self) -> str:
+        """Block until the final transcript is available and return it."""
+
+
+class GoogleCloudStreamingRecognizer(StreamingRecognizer):
+    """Streaming recognition through Google Cloud Speech-to-Text with interim results"""
+
+    def __init__(self, language_code: str, on_partial: TranscriptCallback, sample_rate: int = 48000):
+        super().__init__(language_code, on_partial)
+        self.client = speech.SpeechClient()
+        self.audio_queue = queue.Queue()
+        self.audio = bytearray()
+        self.final_segments: List[str] = []
+        self.error = None
+
+        self.streaming_config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                # Browser MediaRecorder default (audio/webm;codecs=opus)
+                encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
+                sample_rate_hertz=sample_rate,
+                language_code=STT_LANGUAGE_CODES.get(language_code, 'en-US'),
+                enable_automatic_punctuation=True,
+            ),
+            interim_results=True,
+        )
+
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def _requests(self):
+        while True:
+            chunk = self.audio_queue.get()
+            if chunk is None:
+                return
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    def _run(self):
+        try:
+            responses = self.client.streaming_recognize(
+                config=self.streaming_config,
+                requests=self._requests()
+            )
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    text = result.alternatives[0].transcript.strip()
+                    if result.is_final:
+                        self.final_segments.append(text)
+                        self.on_partial(self._joined())
+                    else:
+                        self.on_partial(self._joined(text))
+        except Exception as e:
+            print(f"❌ [STREAMING] Google Cloud streaming error: {e}")
+            self.error = e
+
+    def _joined(self, interim: str = "") -> str:
+        return " ".join(segment for segment in self.final_segments + [interim] if segment)
+
+    def feed(self, chunk: bytes):
+        self.audio.extend(chunk)
+        self.audio_queue.put(chunk)
+
+    def finish(self) -> str:
+        self.audio_queue.put(None)
+        self.worker.join(timeout=30)
+        if self.error and not self.final_segments:
+            # Stream broke before any final result; transcribe the whole recording instead
+            print("⚠️ [STREAMING] Falling back to Gemini for the full recording")
+            return get_gemini_transcriber().transcribe_content(
+                bytes(self.audio), 'audio/webm', self.language_code
+            ) or ""
+        return self._joined()
+
+
+class GeminiIncrementalRecognizer(StreamingRecognizer):
+    """
+    Incremental recognition on top of the Gemini transcriber.
+
+    Gemini has no streaming speech input, so partials come from re-transcribing
+    the recording at most every ``partial_interval`` seconds on a background
+    thread. Only the last ``partial_window`` seconds are sent (decoded locally
+    and re-encoded as WAV), so billed audio grows linearly with recording
+    length; the whole recording is transcribed once in finish().
+    """
+
+    def __init__(
+        self,
+        language_code: str,
+        on_partial: TranscriptCallback,
+        mime_type: str = 'audio/webm',
+        partial_interval: float = None,
+        partial_window: float = None
+    ):
+        super().__init__(language_code, on_partial)
+        self.mime_type = mime_type
+        self.partial_interval = partial_interval or float(os.getenv('STREAMING_PARTIAL_INTERVAL', '2.0'))
+        self.partial_window = partial_window or float(os.getenv('STREAMING_PARTIAL_WINDOW', '8.0'))
+        # Without a decoder the raw buffer is sent, but only while it is this small
+        self.max_raw_partial_bytes = int(os.getenv('STREAMING_PARTIAL_MAX_BYTES', str(512 * 1024)))
+        self.transcriber = get_gemini_transcriber()
+        self.buffer = bytearray()
+        self.lock = threading.Lock()
+        self.callback_lock = threading.Lock()  # Orders partial callbacks before finish() returns
+        self.partial_running = False
+        self.last_partial_at = 0.0
+        self.finished = False
+
+    def feed(self, chunk: bytes):
+        with self.lock:
+            self.buffer.extend(chunk)
+            due = time.time() - self.last_partial_at >= self.partial_interval
+            if self.finished or self.partial_running or not due:
+                return
+            self.partial_running = True
+            self.last_partial_at = time.time()
+            snapshot = bytes(self.buffer)
+
+        threading.Thread(target=self._partial, args=(snapshot,), daemon=True).start()
+
+    def _partial_audio(self, snapshot: bytes) -> Optional[Tuple[bytes, str, bool]]:
+        """Return (audio, mime type, truncated) for the trailing window, or None to skip this partial."""
+        samples = decode_to_pcm(snapshot)
+        if samples is None:
+            if len(snapshot) > self.max_raw_partial_bytes:
+                return None
+            return snapshot, self.mime_type, False
+        window = int(self.partial_window * SPEECH_SAMPLE_RATE)
+        return pcm_to_wav_bytes(samples[-window:], SPEECH_SAMPLE_RATE), 'audio/wav', len(samples) > window
+
+    def _partial(self, snapshot: bytes):
+        try:
+            if self.finished:
+                return
+            partial = self._partial_audio(snapshot)
+            if not partial:
+                return
+            audio, mime_type, truncated = partial
+            text = self.transcriber.transcribe_audio_bytes(audio, mime_type, self.language_code)
+            with self.callback_lock:
+                # A partial must never follow the final transcript
+                if text and not self.finished:
+                    self.on_partial(f"… {text}" if truncated else text)
+        finally:
+            with self.lock:
+                self.partial_running = False
+
+    def finish(self) -> str:
+        with self.callback_lock:
+            self.finished = True
+        with self.lock:
+            audio = bytes(self.buffer)
+        if not audio:
+            return ""
+        return self.transcriber.transcribe_content(audio, self.mime_type, self.language_code) or ""
+
+
+def create_streaming_recognizer(
+    language_code: str,
+    on_partial: TranscriptCallback,
+    mime_type: str = 'audio/webm'
+) -> StreamingRecognizer:
+    """
+    Create the best available streaming recognizer.
+
+    STREAMING_RECOGNIZER selects 'google_cloud' or 'gemini'; by default Google
+    Cloud Speech is used when its client library and credentials are available.
+    """
+    preference = os.getenv('STREAMING_RECOGNIZER', 'auto').lower()
+
+    if preference in ('auto', 'google_cloud') and GOOGLE_SPEECH_AVAILABLE and 'webm' in mime_type:
+        try:
+            recognizer = GoogleCloudStreamingRecognizer(language_code, on_partial)
+            print(f"🎙️ [STREAMING] Using Google Cloud streaming recognizer for '{language_code}'")
+            return recognizer
+        except Exception as e:
+            print(f"⚠️ [STREAMING] Google Cloud Speech unavailable, using Gemini: {e}")
+
+    print(f"🎙️ [STREAMING] Using Gemini incremental recognizer for '{language_code}'")
+    return GeminiIncrementalRecognizer(language_code, on_partial, mime_type)
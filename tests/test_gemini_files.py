@@ -0,0 +1,54 @@
+import base64
+
+from gemini_files import LocalFileCache
+
+
+def test_upload_once_then_reuse():
+    cache = LocalFileCache()
+    audio = b"RIFF" + b"\x01" * 100
+
+    first = cache.get_part(audio, "audio/wav")
+    second = cache.get_part(audio, "audio/wav")
+
+    assert first == second == {
+        "inline_data": {"mime_type": "audio/wav", "data": base64.b64encode(audio).decode("utf-8")}
+    }
+    assert cache.get_cached_part(audio) == first
+    assert cache.get_stats()["uploads"] == 1
+
+
+def test_expired_handle_is_uploaded_again():
+    cache = LocalFileCache()
+    cache.DEFAULT_TTL_SECONDS = 0
+    audio = b"expiring clip"
+
+    cache.get_part(audio, "audio/wav")
+    assert cache.get_cached_part(audio) is None
+
+    cache.get_part(audio, "audio/wav")
+    assert cache.get_stats()["uploads"] == 2
+
+
+def test_least_recently_used_clip_is_evicted():
+    cache = LocalFileCache(max_entries=2)
+    a, b, c = b"clip a", b"clip b", b"clip c"
+
+    cache.get_part(a, "audio/wav")
+    cache.get_part(b, "audio/wav")
+    cache.get_part(a, "audio/wav")  # a is now more recent than b
+    cache.get_part(c, "audio/wav")
+
+    assert cache.get_cached_part(b) is None
+    assert cache.get_cached_part(a) is not None
+    assert cache.get_cached_part(c) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_cap_bounds_memory():
+    cache = LocalFileCache(max_bytes=100)
+    for i in range(10):
+        cache.get_part(bytes([i]) * 30, "audio/wav")
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 100
+    assert stats["cached_files"] == 2
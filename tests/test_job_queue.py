@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(db_path=str(tmp_path / "jobs.sqlite"), workers=1, **kwargs)
+
+
+def insert_job(queue, job_id, status, updated, kind="echo"):
+    with queue._connect() as db:
+        db.execute(
+            "INSERT INTO jobs (id, kind, payload, status, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, '{"value": 1}', status, updated, updated)
+        )
+
+
+def wait_until_finished(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    job = queue.get(job_id)
+    while job["status"] not in (DONE, FAILED) and time.time() < deadline:
+        job = queue.wait_for_change(job_id, job["updated"], deadline - time.time())
+    return job
+
+
+def test_submitted_job_runs_and_stores_result(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.register("echo", lambda payload: ({"echo": payload["value"]}, 200))
+
+    job = wait_until_finished(queue, queue.submit("echo", {"value": 7}))
+
+    assert job["status"] == DONE
+    assert job["status_code"] == 200
+    assert job["result"] == {"echo": 7}
+    assert job["error"] is None
+
+
+def test_unknown_kind_is_rejected(tmp_path):
+    queue = make_queue(tmp_path)
+    with pytest.raises(ValueError):
+        queue.submit("missing", {})
+
+
+def test_error_status_and_exception_mark_job_failed(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.register("bad_request", lambda payload: ({"error": "no text"}, 400))
+    queue.register("server_error", lambda payload: ({"error": "backend down"}, 503))
+
+    def crash(payload):
+        raise RuntimeError("boom")
+    queue.register("crash", crash)
+
+    bad_request = wait_until_finished(queue, queue.submit("bad_request", {}))
+    server_error = wait_until_finished(queue, queue.submit("server_error", {}))
+    crashed = wait_until_finished(queue, queue.submit("crash", {}))
+
+    assert (bad_request["status"], bad_request["status_code"], bad_request["error"]) == (FAILED, 400, "no text")
+    assert (server_error["status"], server_error["status_code"], server_error["error"]) == (FAILED, 503, "backend down")
+    assert (crashed["status"], crashed["status_code"], crashed["error"]) == (FAILED, 500, "boom")
+
+
+def test_unfinished_jobs_are_requeued_after_restart(tmp_path):
+    # Jobs left queued or running by a previous process
+    previous = make_queue(tmp_path)
+    insert_job(previous, "was_queued", QUEUED, time.time())
+    insert_job(previous, "was_running", RUNNING, time.time())
+
+    queue = make_queue(tmp_path)
+    queue.register("echo", lambda payload: ({"echo": payload["value"]}, 200))
+    queue.start()
+
+    for job_id in ("was_queued", "was_running"):
+        job = wait_until_finished(queue, job_id)
+        assert job["status"] == DONE
+        assert job["result"] == {"echo": 1}
+
+
+def test_purge_removes_only_old_finished_jobs(tmp_path):
+    queue = make_queue(tmp_path, retention_hours=1)
+    old = time.time() - 2 * 3600
+    insert_job(queue, "old_done", DONE, old)
+    insert_job(queue, "old_failed", FAILED, old)
+    insert_job(queue, "recent_done", DONE, time.time())
+    insert_job(queue, "old_queued", QUEUED, old, kind="unregistered")
+
+    queue._purge()
+
+    assert queue.get("old_done") is None
+    assert queue.get("old_failed") is None
+    assert queue.get("recent_done") is not None
+    assert queue.get("old_queued") is not None
+
+
+def test_purge_runs_at_most_once_per_interval(tmp_path):
+    queue = make_queue(tmp_path, retention_hours=1)
+    queue._purge()
+    insert_job(queue, "old_done", DONE, time.time() - 2 * 3600)
+
+    queue._purge()
+    assert queue.get("old_done") is not None
+
+    queue._last_purge -= queue.purge_interval
+    queue._purge()
+    assert queue.get("old_done") is None
+
+
+def test_wait_for_change_returns_unchanged_job_after_timeout(tmp_path):
+    queue = make_queue(tmp_path)
+    insert_job(queue, "idle", QUEUED, time.time())
+    job = queue.get("idle")
+
+    started = time.time()
+    waited = queue.wait_for_change("idle", job["updated"], 0.2)
+
+    assert 0.2 <= time.time() - started < 2
+    assert waited == job
+    assert queue.wait_for_change("missing", 0, 0.1) is None
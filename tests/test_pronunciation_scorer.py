@@ -0,0 +1,83 @@
+import numpy as np
+
+from pronunciation_scorer import (
+    align, character_similarity, edit_distance_matrix, grapheme_clusters, score_pronunciation, tokenize
+)
+
+
+def test_edit_distance_matches_levenshtein():
+    matrix = edit_distance_matrix(np.array([1, 2, 3, 4]), np.array([1, 3, 4, 5]))
+    assert matrix[-1, -1] == 2
+    assert edit_distance_matrix(np.array([], dtype=np.int32), np.array([1, 2]))[-1, -1] == 2
+
+
+def test_align_tags_every_token():
+    assert align(["hola", "como", "estas"], ["ola", "estas"]) == [
+        ("substitution", 0, 0),
+        ("omission", 1, -1),
+        ("match", 2, 1),
+    ]
+    assert align(["hola", "amigo"], ["hola", "mi", "amigo"]) == [
+        ("match", 0, 0),
+        ("insertion", -1, 1),
+        ("match", 1, 2),
+    ]
+
+
+def test_near_miss_pairs_up_instead_of_omission_plus_insertion():
+    assert align(["gracias"], ["grasias"]) == [("substitution", 0, 0)]
+
+
+def test_grapheme_clusters_keep_conjuncts_and_marks_together():
+    assert grapheme_clusters("क्ष") == ["क्ष"]
+    assert grapheme_clusters("கு") == ["கு"]
+    assert grapheme_clusters("éa") == ["é", "a"]
+
+
+def test_tokenize_splits_unsegmented_languages_per_character():
+    assert tokenize("Hola, ¿cómo estás?", "es") == ["hola", "cómo", "estás"]
+    assert tokenize("你好。世界", "zh") == ["你", "好", "世", "界"]
+
+
+def test_perfect_reading_scores_100():
+    score = score_pronunciation("Buenos días.", "buenos días", "es")
+
+    assert score["accuracy"] == score["word_accuracy"] == score["char_accuracy"] == 100.0
+    assert score["counts"] == {"match": 2, "substitution": 0, "omission": 0, "insertion": 0}
+
+
+def test_missing_accent_is_a_substitution():
+    score = score_pronunciation("Hola, ¿cómo estás?", "hola como estás", "es")
+
+    assert score["counts"] == {"match": 2, "substitution": 1, "omission": 0, "insertion": 0}
+    assert score["word_accuracy"] == round(100 * 2 / 3, 1)
+
+
+def test_substitution_earns_partial_credit():
+    score = score_pronunciation("gracias amigo", "grasias amigo", "es")
+
+    similarity = character_similarity("gracias", "grasias")
+    assert score["words"][0] == {
+        "reference": "gracias", "spoken": "grasias", "tag": "substitution", "similarity": round(similarity, 3)
+    }
+    assert score["accuracy"] == round(100 * (1 + similarity) / 2, 1)
+    assert 50 < score["accuracy"] < 100
+
+
+def test_insertions_lower_accuracy_and_empty_transcript_scores_zero():
+    extra = score_pronunciation("buenos días", "buenos buenos días", "es")
+    assert extra["counts"]["insertion"] == 1
+    assert extra["accuracy"] == round(100 * 2 / 3, 1)
+
+    silent = score_pronunciation("buenos días", "", "es")
+    assert silent["counts"]["omission"] == 2
+    assert silent["accuracy"] == 0.0
+    assert silent["char_accuracy"] == 0.0
+
+
+def test_unsegmented_language_is_scored_per_character():
+    score = score_pronunciation("你好世界", "你好世", "zh")
+
+    assert score["unit"] == "character"
+    assert score["counts"] == {"match": 3, "substitution": 0, "omission": 1, "insertion": 0}
+    assert score["accuracy"] == 75.0
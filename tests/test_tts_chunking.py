@@ -0,0 +1,50 @@
+from tts_chunking import split_sentences, split_text_for_tts
+
+
+def test_each_sentence_is_its_own_chunk():
+    assert split_text_for_tts("Hola. ¿Cómo estás? ¡Muy bien!") == ["Hola.", "¿Cómo estás?", "¡Muy bien!"]
+
+
+def test_decimals_and_abbreviations_do_not_end_a_sentence():
+    assert split_sentences("It costs 3.5 euros, e.g., today. Done") == ["It costs 3.5 euros, e.g., today.", "Done"]
+
+
+def test_closing_quotes_and_terminator_runs_stay_with_their_sentence():
+    assert split_sentences('He said "stop!" Then?! He left.') == ['He said "stop!"', "Then?!", "He left."]
+
+
+def test_fullwidth_and_indic_terminators():
+    assert split_sentences("你好。今天好吗？好") == ["你好。", "今天好吗？", "好"]
+    assert split_sentences("नमस्ते। आप कैसे हैं?") == ["नमस्ते।", "आप कैसे हैं?"]
+
+
+def test_newlines_end_a_sentence():
+    assert split_sentences("First line\nsecond line\n\n") == ["First line", "second line"]
+
+
+def test_long_sentence_splits_at_clauses_then_words():
+    sentence = "one two three, four five six, seven eight nine."
+    assert split_text_for_tts(sentence, max_chars=16) == ["one two three,", "four five six,", "seven eight", "nine."]
+
+
+def test_unspaced_text_splits_between_grapheme_clusters():
+    chunks = split_text_for_tts("क्षक्षक्षक्षक्ष", max_chars=6)
+
+    assert "".join(chunks) == "क्षक्षक्षक्षक्ष"
+    assert all(len(chunk) <= 6 for chunk in chunks)
+    # Conjuncts (three code points each) are never cut apart
+    assert all(len(chunk) % 3 == 0 for chunk in chunks)
+
+
+def test_every_chunk_respects_the_limit_and_keeps_the_text():
+    text = " ".join(["palabra"] * 80) + ". Fin."
+    chunks = split_text_for_tts(text, max_chars=50)
+
+    assert all(0 < len(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_empty_text_has_no_chunks():
+    assert split_text_for_tts("") == []
+    assert split_text_for_tts(None) == []
+    assert split_text_for_tts("   \n ") == []
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+TTS Backend Health
+EWMA latency/error tracking, circuit breaking and cost-aware backend ranking
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, List
+
+# Backends from cheapest to most expensive, with estimated cost per 1K characters
+BACKEND_COSTS_PER_1K = {
+    'system': 0.0,
+    'google_cloud': 0.004,
+    'gemini': 0.015,
+}
+
+# The admin's active_tts is the most expensive backend a request may use;
+# the system tier keeps its Google Cloud fallback, as in fixed selection
+TTS_CEILINGS = {
+    'system': ['system', 'google_cloud'],
+    'cloud': ['system', 'google_cloud'],
+    'google_cloud': ['system', 'google_cloud'],
+    'gemini': ['system', 'google_cloud', 'gemini'],
+}
+
+
+def estimate_cost(backend: str, text: str) -> float:
+    """Estimated cost of synthesizing text with a backend."""
+    return len(text) * BACKEND_COSTS_PER_1K.get(backend, 0.0) / 1000
+
+
+class BackendHealth:
+    """Rolling health of one backend; a circuit breaker opens after repeated failures"""
+
+    def __init__(self, name: str, alpha: float, failure_threshold: int, cooldown_seconds: float):
+        self.name = name
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self.latency_ms = None  # EWMA over successful and failed calls
+        self.error_rate = 0.0   # EWMA of failures (1) vs successes (0)
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.total_cost = 0.0
+        self.open_until = 0.0
+
+    def record(self, success: bool, latency_ms: float, cost: float = 0.0):
+        self.requests += 1
+        self.total_cost += cost
+        self.latency_ms = latency_ms if self.latency_ms is None else (
+            self.alpha * latency_ms + (1 - self.alpha) * self.latency_ms
+        )
+        self.error_rate = self.alpha * (0.0 if success else 1.0) + (1 - self.alpha) * self.error_rate
+
+        if success:
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+            return
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            already_demoted = self.state == "demoted"
+            # Demote; after the cooldown one request probes the backend again
+            self.open_until = time.time() + self.cooldown_seconds
+            if not already_demoted:
+                print(f"⚠️ [TTS_HEALTH] {self.name} demoted for {self.cooldown_seconds:g}s "
+                      f"after {self.consecutive_failures} consecutive failures")
+
+    @property
+    def state(self) -> str:
+        if not self.open_until:
+            return "healthy"
+        return "demoted" if time.time() < self.open_until else "probing"
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "total_cost": round(self.total_cost, 4),
+        }
+
+
+class TTSBackendSelector:
+    """
+    Orders TTS backends for a request.
+
+    Healthy backends whose EWMA latency is within the SLO (or not yet measured)
+    come first, cheapest first; slower or error-prone backends follow, best
+    first; demoted backends go last until their cooldown ends, at which point
+    they are ranked normally again so one request probes them.
+    """
+
+    def __init__(self):
+        self.latency_slo_ms = float(os.getenv('TTS_LATENCY_SLO_MS', '3000'))
+        self.max_error_rate = float(os.getenv('TTS_MAX_ERROR_RATE', '0.5'))
+        alpha = float(os.getenv('TTS_HEALTH_EWMA_ALPHA', '0.3'))
+        failure_threshold = int(os.getenv('TTS_BREAKER_FAILURES', '3'))
+        cooldown_seconds = float(os.getenv('TTS_BREAKER_COOLDOWN_SECONDS', '60'))
+
+        self._lock = threading.Lock()
+        self.backends = {
+            name: BackendHealth(name, alpha, failure_threshold, cooldown_seconds)
+            for name in BACKEND_COSTS_PER_1K
+        }
+
+    def rank(self, allowed: List[str]) -> List[str]:
+        """Return the allowed backends in the order they should be tried."""
+        within_slo, degraded, demoted = [], [], []
+        with self._lock:
+            for name in allowed:
+                health = self.backends[name]
+                if health.state == "demoted":
+                    demoted.append(name)
+                elif health.error_rate <= self.max_error_rate and (
+                    health.latency_ms is None or health.latency_ms <= self.latency_slo_ms
+                ):
+                    within_slo.append(name)
+                else:
+                    degraded.append((health.error_rate, health.latency_ms or 0.0, name))
+
+        within_slo.sort(key=lambda name: BACKEND_COSTS_PER_1K[name])
+        return within_slo + [name for _, _, name in sorted(degraded)] + demoted
+
+    def record(self, backend: str, success: bool, latency_ms: float, cost: float = 0.0):
+        with self._lock:
+            self.backends[backend].record(success, latency_ms, cost)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "latency_slo_ms": self.latency_slo_ms,
+                "backends": {name: health.snapshot() for name, health in self.backends.items()}
+            }
+
+
+# Global selector instance
+backend_selector = None
+
+def get_backend_selector() -> TTSBackendSelector:
+    """Get or create the global backend selector instance."""
+    global backend_selector
+    if backend_selector is None:
+        backend_selector = TTSBackendSelector()
+    return backend_selector
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Sentence-Level TTS Cache
+Stores normalized PCM clips per (TTS tier, language, sentence) for reuse across utterances
+"""
+
+import os
+import time
+import hashlib
+import threading
+import unicodedata
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+from audio_utils import read_audio_file, pcm_to_wav_bytes
+
+
+def normalize_sentence(sentence: str) -> str:
+    """NFC-normalize and collapse whitespace; punctuation is kept since it changes prosody."""
+    return ' '.join(unicodedata.normalize('NFC', sentence).split())
+
+
+class SentenceAudioCache:
+    """On-disk cache of synthesized sentence clips, keyed by tier, language and text"""
+
+    def __init__(self, cache_dir: Optional[str] = None, sample_rate: int = 24000):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cached clips (TTS_SENTENCE_CACHE_DIR, default tts_output/sentences)
+            sample_rate: Sample rate every clip is stored at
+        """
+        self.cache_dir = cache_dir or os.getenv('TTS_SENTENCE_CACHE_DIR', os.path.join('tts_output', 'sentences'))
+        self.sample_rate = sample_rate
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Clips written by earlier processes are picked up from the directory
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.wav'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                self._entries[name[:-len('.wav')]] = {"size": stat.st_size, "last_access": stat.st_mtime, "hits": 0}
+        self.hits = 0
+        self.misses = 0
+        self.chars_saved = 0
+
+    def key(self, tier: str, language_code: str, sentence: str) -> str:
+        """Return the cache key for a sentence."""
+        raw = f"{tier}|{language_code}|{normalize_sentence(sentence)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def get(self, tier: str, language_code: str, sentence: str) -> Optional[np.ndarray]:
+        """Return the cached clip as int16 samples, or None on a miss."""
+        key = self.key(tier, language_code, sentence)
+        with self._lock:
+            known = key in self._entries
+
+        samples = None
+        if known and os.path.exists(self.path_for(key)):
+            samples = read_audio_file(self.path_for(key), self.sample_rate)
+        with self._lock:
+            if samples is None:
+                # A clip deleted from disk is a miss, not an error
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry:
+                entry["hits"] += 1
+                entry["last_access"] = time.time()
+            self.hits += 1
+            self.chars_saved += len(sentence)
+        return samples
+
+    def put(self, tier: str, language_code: str, sentence: str, samples: np.ndarray):
+        """Store a clip (already trimmed and normalized) for a sentence."""
+        key = self.key(tier, language_code, sentence)
+        path = self.path_for(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(pcm_to_wav_bytes(samples, self.sample_rate))
+            # Atomic rename so concurrent readers never see a partial clip
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ [TTS_CACHE] Could not store sentence clip: {e}")
+            return
+        with self._lock:
+            self._entries[key] = {"size": os.path.getsize(path), "last_access": time.time(), "hits": 0}
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of clip metadata (size, last_access, hits) by key."""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._entries.items()}
+
+    def remove(self, key: str) -> int:
+        """Delete a clip; returns the number of bytes freed."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        try:
+            size = os.path.getsize(self.path_for(key))
+            os.remove(self.path_for(key))
+            return size
+        except OSError:
+            return entry["size"] if entry else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached clips."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cached_sentences": len(self._entries),
+                "bytes": sum(entry["size"] for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "chars_saved": self.chars_saved
+            }
+
+
+# Global sentence cache instance
+sentence_cache = None
+
+def get_sentence_cache() -> SentenceAudioCache:
+    """Get or create the global sentence cache instance."""
+    global sentence_cache
+    if sentence_cache is None:
+        sentence_cache = SentenceAudioCache()
+    return sentence_cache
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+TTS Text Chunking
+Splits long text at sentence and clause boundaries for per-chunk synthesis
+"""
+
+import os
+import re
+from typing import List
+
+from pronunciation_scorer import grapheme_clusters
+
+# Sentence-final punctuation that needs trailing whitespace to end a sentence
+# (Latin/Cyrillic, Devanagari/Odia danda, Arabic question mark)
+SENTENCE_TERMINATORS = '.!?…।॥؟'
+
+# Full-width CJK terminators end a sentence even without a following space
+FULLWIDTH_TERMINATORS = '。！？｡'
+
+# Closing quotes/brackets that belong to the sentence they close
+CLOSING_PUNCTUATION = '"\'”’»)]」』）'
+
+# Clause separators used when a single sentence is still too long
+CLAUSE_SEPARATORS = ',;:、，；：،'
+
+# Web TTS services reject requests over ~200 characters
+DEFAULT_MAX_CHARS = int(os.getenv('TTS_CHUNK_MAX_CHARS', '200'))
+
+_CLAUSE_SPLIT = re.compile(f'(?<=[{re.escape(CLAUSE_SEPARATORS)}])')
+_WORD_SPLIT = re.compile(r'(?<=\s)')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    A run of terminators plus any closing quotes ends the sentence. ASCII-style
+    terminators only count before whitespace or the end of the text, so
+    "3.5" and "e.g.," stay intact; full-width CJK terminators always count.
+    """
+    sentences = []
+    start, i, n = 0, 0, len(text)
+    terminators = SENTENCE_TERMINATORS + FULLWIDTH_TERMINATORS
+
+    while i < n:
+        char = text[i]
+        if char != '\n' and char not in terminators:
+            i += 1
+            continue
+
+        j = i + 1
+        while j < n and (text[j] in terminators or text[j] in CLOSING_PUNCTUATION):
+            j += 1
+
+        if char == '\n' or char in FULLWIDTH_TERMINATORS or j == n or text[j].isspace():
+            sentence = text[start:j].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = j
+        i = j
+
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    """Greedily join consecutive pieces into chunks of at most max_chars."""
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current.strip())
+            current = ''
+        current += piece
+    if current.strip():
+        chunks.append(current.strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at clauses, then words, then grapheme clusters."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    chunks = []
+    for clause in _pack(_CLAUSE_SPLIT.split(sentence), max_chars):
+        if len(clause) <= max_chars:
+            chunks.append(clause)
+            continue
+        for words in _pack(_WORD_SPLIT.split(clause), max_chars):
+            if len(words) <= max_chars:
+                chunks.append(words)
+            else:
+                # Unspaced scripts (zh, ja) or one enormous token
+                chunks.extend(_pack(grapheme_clusters(words), max_chars))
+    return chunks
+
+
+def split_text_for_tts(text: str, max_chars: int = None) -> List[str]:
+    """
+    Split text into chunks that can be synthesized independently.
+
+    Each sentence becomes its own chunk so identical sentences synthesize
+    identically; sentences longer than max_chars are split at clause
+    separators, then at whitespace, and as a last resort between characters.
+
+    Args:
+        text: Text to synthesize
+        max_chars: Maximum chunk length (TTS_CHUNK_MAX_CHARS, default 200)
+
+    Returns:
+        Non-empty chunks in reading order
+    """
+    max_chars = max_chars or DEFAULT_MAX_CHARS
+    chunks = []
+    for sentence in split_sentences(text or ''):
+        chunks.extend(_split_long(sentence, max_chars))
+    return chunks
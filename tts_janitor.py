@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+TTS Artifact Janitor
+Background retention for generated audio: max age, byte quota and stray temp files
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from artifact_index import get_artifact_index
+from tts_cache import get_sentence_cache
+
+# Directories whose files the janitor may delete (never server/dist/uploads or '.')
+MANAGED_DIRS = ('tts_output', 'uploads')
+
+# Leftovers from interrupted chunk synthesis or cache writes
+STRAY_SUFFIXES = ('.tmp',)
+STRAY_MARKER = '.part'
+STRAY_MAX_AGE_SECONDS = 3600
+
+
+class TTSJanitor:
+    """
+    Periodically removes generated audio so long-running instances keep a bounded disk footprint.
+
+    Each sweep:
+    1. deletes stray partial/temporary files older than an hour,
+    2. deletes artifacts and sentence clips not accessed within max_age_hours,
+    3. if the total still exceeds max_bytes, evicts the least-used files
+       (fewest hits, then oldest access) until usage is below 90% of the quota.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_age_hours: Optional[float] = None,
+        interval_seconds: Optional[float] = None
+    ):
+        self.max_bytes = max_bytes or int(os.getenv('TTS_MAX_BYTES', str(500 * 1024 * 1024)))
+        self.max_age_hours = max_age_hours or float(os.getenv('TTS_MAX_AGE_HOURS', '168'))
+        self.interval_seconds = interval_seconds or float(os.getenv('TTS_JANITOR_INTERVAL_SECONDS', '600'))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {
+            "runs": 0,
+            "files_removed": 0,
+            "bytes_reclaimed": 0,
+            "last_run": None,
+            "last_run_removed": 0,
+            "last_run_reclaimed": 0,
+            "bytes_in_use": 0
+        }
+
+    def start(self):
+        """Start the background sweep thread (idempotent)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tts-janitor", daemon=True)
+            self._thread.start()
+        print(f"🧹 [TTS_JANITOR] Started: quota {self.max_bytes // (1024 * 1024)} MB, "
+              f"max age {self.max_age_hours:g} h, every {self.interval_seconds:g} s")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"❌ [TTS_JANITOR] Sweep failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def _candidates(self) -> List[Tuple[Dict[str, Any], Callable[[], int]]]:
+        """All deletable files as (metadata, delete function) pairs."""
+        index = get_artifact_index()
+        sentence_cache = get_sentence_cache()
+        managed = tuple(os.path.abspath(directory) + os.sep for directory in MANAGED_DIRS)
+
+        candidates = []
+        for name, entry in index.entries().items():
+            if os.path.abspath(entry["path"]).startswith(managed):
+                candidates.append((entry, lambda name=name, path=entry["path"]: self._delete_artifact(name, path)))
+        for key, entry in sentence_cache.entries().items():
+            candidates.append((entry, lambda key=key: sentence_cache.remove(key)))
+        return candidates
+
+    def _delete_artifact(self, name: str, path: str) -> int:
+        get_artifact_index().remove(name)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except OSError:
+            return 0
+
+    def _remove_strays(self, now: float) -> Tuple[int, int]:
+        removed = reclaimed = 0
+        for directory in MANAGED_DIRS + (get_sentence_cache().cache_dir,):
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                is_stray = name.endswith(STRAY_SUFFIXES) or STRAY_MARKER in name
+                try:
+                    if is_stray and os.path.isfile(path) and now - os.path.getmtime(path) > STRAY_MAX_AGE_SECONDS:
+                        size = os.path.getsize(path)
+                        os.remove(path)
+                        removed += 1
+                        reclaimed += size
+                except OSError:
+                    continue
+        return removed, reclaimed
+
+    def sweep(self) -> Dict[str, Any]:
+        """Run one retention pass and return its results."""
+        now = time.time()
+        removed, reclaimed = self._remove_strays(now)
+
+        max_age = self.max_age_hours * 3600
+        remaining = []
+        for entry, delete in self._candidates():
+            if now - entry["last_access"] > max_age:
+                reclaimed += delete()
+                removed += 1
+            else:
+                remaining.append((entry, delete))
+
+        in_use = sum(entry["size"] for entry, _ in remaining)
+        if in_use > self.max_bytes:
+            target = int(self.max_bytes * 0.9)
+            # Least frequently used first, ties broken by least recently used
+            remaining.sort(key=lambda candidate: (candidate[0]["hits"], candidate[0]["last_access"]))
+            while remaining and in_use > target:
+                entry, delete = remaining.pop(0)
+                freed = delete()
+                in_use -= entry["size"]
+                reclaimed += freed
+                removed += 1
+
+        with self._lock:
+            self.stats["runs"] += 1
+            self.stats["files_removed"] += removed
+            self.stats["bytes_reclaimed"] += reclaimed
+            self.stats["last_run"] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))
+            self.stats["last_run_removed"] = removed
+            self.stats["last_run_reclaimed"] = reclaimed
+            self.stats["bytes_in_use"] = in_use
+            result = dict(self.stats)
+
+        if removed:
+            print(f"🧹 [TTS_JANITOR] Removed {removed} files, reclaimed {reclaimed / 1024:.1f} KB")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cumulative and last-sweep statistics."""
+        with self._lock:
+            return {
+                **self.stats,
+                "max_bytes": self.max_bytes,
+                "max_age_hours": self.max_age_hours,
+                "running": bool(self._thread and self._thread.is_alive())
+            }
+
+
+# Global janitor instance
+tts_janitor = None
+
+def get_tts_janitor() -> TTSJanitor:
+    """Get or create the global janitor instance."""
+    global tts_janitor
+    if tts_janitor is None:
+        tts_janitor = TTSJanitor()
+    return tts_janitor
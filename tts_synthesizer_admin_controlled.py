@@ -6,31 +6,80 @@ Priority: System TTS (FREE) → Google Cloud TTS (CHEAP) → Gemini TTS (EXPENSI
 
 import os
 import sys
+import time
 import subprocess
 import platform
-import wave
-import struct
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, List, Tuple
+import numpy as np
 from admin_dashboard import AdminDashboard
+from audio_utils import (
+    decode_to_pcm, read_audio_file, trim_silence, normalize_loudness, concatenate_segments,
+    silence, speech_like_tone, write_audio_file, format_for_path, mime_type_for_path, AUDIO_FORMATS
+)
+from tts_chunking import split_text_for_tts
+from tts_cache import get_sentence_cache
+from tts_backend_health import get_backend_selector, estimate_cost, TTS_CEILINGS
 
 # Import TTS modules
 try:
     from google_cloud_tts_simple import synthesize_speech as google_synthesize
+    from google_cloud_tts_simple import synthesize_with_marks as google_synthesize_marked
 except ImportError:
     print("Warning: Google Cloud TTS not available")
     google_synthesize = None
+    google_synthesize_marked = None
 
 try:
     from gemini_tts_synthesizer import synthesize_speech as gemini_synthesize
+    from gemini_tts_synthesizer import stream_speech as gemini_stream, GeminiTTSSynthesizer
 except ImportError:
     print("Warning: Gemini TTS not available")
     gemini_synthesize = None
+    gemini_stream = None
+
+try:
+    from espeak_tts_synthesizer import synthesize_speech as espeak_synthesize, is_available as espeak_available
+except ImportError:
+    espeak_synthesize = None
+    espeak_available = None
+
+# Output encoding when the client does not ask for one: compact MP3 plays everywhere
+DEFAULT_AUDIO_FORMAT = os.getenv('TTS_DEFAULT_FORMAT', 'mp3')
+
+# Sample rate of WAV files converted from web TTS MP3s and macOS AIFF
+WAV_SAMPLE_RATE = 22050
+
+# Chunks are synthesized concurrently and joined at this sample rate
+CHUNK_SAMPLE_RATE = 24000
+_chunk_executor = ThreadPoolExecutor(max_workers=int(os.getenv('TTS_CHUNK_WORKERS', '4')))
+
+# Chunk size used when relaying an already synthesized file
+STREAM_CHUNK_BYTES = 16 * 1024
+
+# Batch items are synthesized on their own pool (items fan out further onto _chunk_executor)
+_batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('TTS_BATCH_WORKERS', '4')))
+
+# On Linux, try espeak-ng before web TTS (faster, no network, more robotic)
+PREFER_LOCAL_TTS = os.getenv('PREFER_LOCAL_TTS', '0') == '1'
+
+# Web TTS providers are raced concurrently ("race") or tried in order ("sequential")
+WEB_TTS_MODE = os.getenv('WEB_TTS_MODE', 'race')
+_web_tts_executor = ThreadPoolExecutor(max_workers=int(os.getenv('WEB_TTS_WORKERS', '8')))
+_web_tts_lock = threading.Lock()
+_web_tts_stats = {"races": 0, "failures": 0, "wins": {}}
+
+# "adaptive" ranks backends by health and cost under the active_tts ceiling;
+# "fixed" keeps the original per-tier fallback order
+DEFAULT_SELECTION_MODE = os.getenv('TTS_SELECTION_MODE', 'adaptive')
 
 class AdminControlledTTSSynthesizer:
     def __init__(self):
         self.admin_dashboard = AdminDashboard()
         self.system = platform.system().lower()
         self.tts_cache = {}  # Simple cache to prevent duplicate processing
+        self.placeholder_paths = set()  # Tone files created when no speech engine worked
         
         # Voice mappings for different systems
         self.voice_map = {
@@ -117,13 +166,22 @@ class AdminControlledTTSSynthesizer:
             'ar': 'ar-SA'
         }
 
-    def synthesize_speech(self, text: str, language_code: str = 'en', output_path: str = "response.wav") -> dict:
+    def synthesize_speech(self, text: str, language_code: str = 'en', output_path: str = "response.wav",
+                          audio_format: Optional[str] = None) -> dict:
         """
         Synthesize speech with admin-controlled priority and return debug info:
         1. System TTS (FREE)
         2. Google Cloud TTS (CHEAP) 
         3. Gemini TTS (EXPENSIVE) - Admin only
+
+        audio_format ('mp3', 'opus' or 'wav', default TTS_DEFAULT_FORMAT) sets the
+        output encoding; the file extension of output_path is replaced to match.
+
+        The result's "placeholder" flag is True when no engine produced speech
+        and the file holds silence or tones; such audio must not be cached as
+        the text's audio.
         """
+        audio_format = audio_format or DEFAULT_AUDIO_FORMAT
         # Generate unique request ID to track duplicate calls
         import time
         request_id = f"{int(time.time() * 1000)}_{hash(text)}_{hash(language_code)}"
@@ -144,11 +202,15 @@ class AdminControlledTTSSynthesizer:
             "cost_estimate": "unknown",
             "success": False,
             "output_path": None,
+            # True when the audio is silence or tones standing in for failed speech
+            "placeholder": False,
+            # Backend that produced the audio; artifact names and caches are keyed by it
+            "backend": None,
             "debug": {}
         }
         
         # Check cache for duplicate requests
-        cache_key = f"{text}_{language_code}_{output_path}"
+        cache_key = f"{text}_{language_code}_{output_path}_{audio_format}"
         if cache_key in self.tts_cache:
             cached_result = self.tts_cache[cache_key]
             print(f"🎯 TTS Request ID: {request_id} - CACHED (duplicate detected)")
@@ -157,6 +219,7 @@ class AdminControlledTTSSynthesizer:
                 "service_used": "cached",
                 "success": True,
                 "output_path": cached_result,
+                "placeholder": cached_result in self.placeholder_paths,
                 "fallback_reason": "Using cached result"
             })
             return {
@@ -185,6 +248,109 @@ class AdminControlledTTSSynthesizer:
         print(f"🎯 Active TTS system: {active_tts}")
         print(f"🎯 Using TTS system: {active_tts.upper()}")
         
+        # Text is split at sentence boundaries; cached sentences are reused and
+        # the rest are synthesized in parallel
+        chunks = split_text_for_tts(text)
+        synthesized = None
+        if chunks:
+            synthesized = self._synthesize_sentences(chunks, language_code, output_path, settings, debug_info, audio_format)
+        if not synthesized:
+            synthesized = self._synthesize_with_backend(text, language_code, output_path, settings, debug_info, audio_format)
+            if synthesized:
+                debug_info["backend"] = next(iter(synthesized[1]), None)
+                synthesized = (self._encode_output(synthesized[0], audio_format), synthesized[1])
+
+        if synthesized:
+            result, costs = synthesized
+            for service, cost in costs.items():
+                self.admin_dashboard.track_usage(service, cost)
+            total_cost = sum(costs.values())
+            # Cache the result
+            self.tts_cache[cache_key] = result
+            debug_info.update({
+                "service_used": "+".join(costs) or "sentence_cache",
+                "success": True,
+                "output_path": result,
+                "placeholder": result in self.placeholder_paths,
+                "format": format_for_path(result),
+                "mime_type": mime_type_for_path(result),
+                "cost_estimate": f"{total_cost:.4f}" if total_cost else "0.00"
+            })
+            return {
+                "success": True,
+                "output_path": result,
+                **debug_info
+            }
+
+        print("❌ All TTS methods failed")
+        debug_info["fallback_reason"] = "All TTS methods failed"
+        
+        # Create a simple fallback audio file (silence) so the frontend doesn't crash
+        try:
+            print("🔇 Creating fallback audio file...")
+            # Create a 1-second silence file, encoded like the requested output
+            sample_rate = 22050
+            base, _ = os.path.splitext(output_path)
+            samples = silence(1.0, sample_rate)
+            fallback_path = (
+                write_audio_file(f"{base}{AUDIO_FORMATS[audio_format][1]}", samples, sample_rate, audio_format)
+                or write_audio_file(f"{base}.wav", samples, sample_rate)
+            )
+            if not fallback_path:
+                raise RuntimeError("no audio encoder available")
+            
+            print(f"🔇 Fallback audio created: {fallback_path}")
+            
+            # Cache the result
+            self.tts_cache[cache_key] = fallback_path
+            self.placeholder_paths.add(fallback_path)
+            debug_info.update({
+                "service_used": "fallback",
+                "success": True,
+                "output_path": fallback_path,
+                "placeholder": True,
+                "format": format_for_path(fallback_path),
+                "mime_type": mime_type_for_path(fallback_path),
+                "cost_estimate": "0.00",
+                "fallback_reason": "Created silence fallback"
+            })
+            return {
+                "success": True,
+                "output_path": fallback_path,
+                **debug_info
+            }
+        except Exception as e:
+            print(f"❌ Failed to create fallback audio: {e}")
+            debug_info.update({
+                "fallback_reason": f"Failed to create fallback audio: {e}",
+                "error": str(e)
+            })
+            return {
+                "success": False,
+                "error": f"Failed to create fallback audio: {e}",
+                **debug_info
+            }
+        
+    def _synthesize_with_backend(self, text: str, language_code: str, output_path: str, settings: dict,
+                                 debug_info: dict, audio_format: str = 'wav') -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Synthesize one piece of text with the tier selected by the admin settings.
+
+        audio_format is passed to engines that encode natively (Google Cloud
+        TTS); others return whatever they produce.
+
+        Usage is not tracked here so chunks synthesized in parallel can be
+        recorded once by the caller; debug_info["fallback_reason"] is updated
+        as tiers fail.
+
+        Returns:
+            (output file path, {service: estimated cost}) or None if every tier failed
+        """
+        active_tts = settings.get("active_tts", "system")
+
+        if settings.get("selection_mode", DEFAULT_SELECTION_MODE) == "adaptive":
+            return self._synthesize_adaptive(text, language_code, output_path, debug_info, audio_format)
+
         # Check if Google API services are enabled
         if not self.admin_dashboard.is_google_api_enabled():
             print("🔒 Google API services are disabled. Using System TTS only.")
@@ -192,104 +358,51 @@ class AdminControlledTTSSynthesizer:
             # Force system TTS when Google APIs are disabled
             result = self._try_system_tts(text, language_code, output_path)
             if result:
-                self.admin_dashboard.track_usage("system", 0.0)
                 print("✅ System TTS successful (FREE)")
-                self.tts_cache[cache_key] = result
-                debug_info.update({
-                    "service_used": "system",
-                    "success": True,
-                    "output_path": result,
-                    "cost_estimate": "0.00"
-                })
-                return {
-                    "success": True,
-                    "output_path": result,
-                    **debug_info
-                }
-            else:
-                print("❌ System TTS failed")
-                debug_info["fallback_reason"] = "System TTS failed"
-        
+                return result, {"system": 0.0}
+            print("❌ System TTS failed")
+            debug_info["fallback_reason"] = "System TTS failed"
+            return None
+
         # Try System TTS (FREE)
         if active_tts == "system":
             print("🎤 Trying System TTS (FREE)...")
             result = self._try_system_tts(text, language_code, output_path)
             if result:
-                self.admin_dashboard.track_usage("system", 0.0)
                 print("✅ System TTS successful (FREE)")
-                # Cache the result
-                self.tts_cache[cache_key] = result
-                debug_info.update({
-                    "service_used": "system",
-                    "success": True,
-                    "output_path": result,
-                    "cost_estimate": "0.00"
-                })
-                return {
-                    "success": True,
-                    "output_path": result,
-                    **debug_info
-                }
-            else:
-                print("❌ System TTS failed, falling back to Google Cloud TTS...")
-                debug_info["fallback_reason"] = "System TTS failed, trying Google Cloud TTS"
-                # Fall back to Google Cloud TTS when system TTS fails
-                if google_synthesize:
-                    print("☁️ Trying Google Cloud TTS (CHEAP) as fallback...")
-                    result = self._try_google_cloud_tts(text, language_code, output_path)
-                    if result:
-                        # Estimate cost: ~$0.004 per 1K characters
-                        estimated_cost = len(text) * 0.004 / 1000
-                        self.admin_dashboard.track_usage("google_cloud", estimated_cost)
-                        print(f"✅ Google Cloud TTS successful (CHEAP - ~${estimated_cost:.4f})")
-                        # Cache the result
-                        self.tts_cache[cache_key] = result
-                        debug_info.update({
-                            "service_used": "google_cloud",
-                            "success": True,
-                            "output_path": result,
-                            "cost_estimate": f"{estimated_cost:.4f}"
-                        })
-                        return {
-                            "success": True,
-                            "output_path": result,
-                            **debug_info
-                        }
-                    else:
-                        print("❌ Google Cloud TTS fallback also failed")
-                        debug_info["fallback_reason"] = "Both System TTS and Google Cloud TTS failed"
-        
+                return result, {"system": 0.0}
+
+            print("❌ System TTS failed, falling back to Google Cloud TTS...")
+            debug_info["fallback_reason"] = "System TTS failed, trying Google Cloud TTS"
+            # Fall back to Google Cloud TTS when system TTS fails
+            if google_synthesize:
+                print("☁️ Trying Google Cloud TTS (CHEAP) as fallback...")
+                result = self._try_google_cloud_tts(text, language_code, output_path, audio_format)
+                if result:
+                    # Estimate cost: ~$0.004 per 1K characters
+                    estimated_cost = len(text) * 0.004 / 1000
+                    print(f"✅ Google Cloud TTS successful (CHEAP - ~${estimated_cost:.4f})")
+                    return result, {"google_cloud": estimated_cost}
+                print("❌ Google Cloud TTS fallback also failed")
+                debug_info["fallback_reason"] = "Both System TTS and Google Cloud TTS failed"
+
         # Try Google Cloud TTS (CHEAP)
         elif active_tts == "cloud":
             print(f"☁️ Google Cloud TTS available: {google_synthesize is not None}")
             if google_synthesize:
                 print("☁️ Trying Google Cloud TTS (CHEAP)...")
-                result = self._try_google_cloud_tts(text, language_code, output_path)
+                result = self._try_google_cloud_tts(text, language_code, output_path, audio_format)
                 if result:
                     # Estimate cost: ~$0.004 per 1K characters
                     estimated_cost = len(text) * 0.004 / 1000
-                    self.admin_dashboard.track_usage("google_cloud", estimated_cost)
                     print(f"✅ Google Cloud TTS successful (CHEAP - ~${estimated_cost:.4f})")
-                    # Cache the result
-                    self.tts_cache[cache_key] = result
-                    debug_info.update({
-                        "service_used": "google_cloud",
-                        "success": True,
-                        "output_path": result,
-                        "cost_estimate": f"{estimated_cost:.4f}"
-                    })
-                    return {
-                        "success": True,
-                        "output_path": result,
-                        **debug_info
-                    }
-                else:
-                    print("❌ Google Cloud TTS failed")
-                    debug_info["fallback_reason"] = "Google Cloud TTS failed"
+                    return result, {"google_cloud": estimated_cost}
+                print("❌ Google Cloud TTS failed")
+                debug_info["fallback_reason"] = "Google Cloud TTS failed"
             else:
                 print("❌ Google Cloud TTS not available")
                 debug_info["fallback_reason"] = "Google Cloud TTS not available"
-        
+
         # Try Gemini TTS (EXPENSIVE)
         elif active_tts == "gemini":
             print(f"🤖 Gemini TTS available: {gemini_synthesize is not None}")
@@ -299,85 +412,228 @@ class AdminControlledTTSSynthesizer:
                 if result:
                     # Estimate cost: ~$0.015 per 1K characters (much more expensive)
                     estimated_cost = len(text) * 0.015 / 1000
-                    self.admin_dashboard.track_usage("gemini", estimated_cost)
                     print(f"✅ Gemini TTS successful (EXPENSIVE - ~${estimated_cost:.4f})")
-                    # Cache the result
-                    self.tts_cache[cache_key] = result
-                    debug_info.update({
-                        "service_used": "gemini",
-                        "success": True,
-                        "output_path": result,
-                        "cost_estimate": f"{estimated_cost:.4f}"
-                    })
-                    return {
-                        "success": True,
-                        "output_path": result,
-                        **debug_info
-                    }
-                else:
-                    print("❌ Gemini TTS failed")
-                    debug_info["fallback_reason"] = "Gemini TTS failed"
+                    return result, {"gemini": estimated_cost}
+                print("❌ Gemini TTS failed")
+                debug_info["fallback_reason"] = "Gemini TTS failed"
             else:
                 print("❌ Gemini TTS not available")
                 debug_info["fallback_reason"] = "Gemini TTS not available"
-        
-        print("❌ All TTS methods failed")
-        debug_info["fallback_reason"] = "All TTS methods failed"
-        
-        # Create a simple fallback audio file (silence) so the frontend doesn't crash
-        try:
-            print("🔇 Creating fallback audio file...")
-            # Create a minimal WAV file with silence
-            import wave
-            import struct
-            
-            # Create a 1-second silence WAV file
-            sample_rate = 22050
-            duration = 1.0
-            num_samples = int(sample_rate * duration)
-            
-            with wave.open(output_path, 'w') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(sample_rate)
-                
-                # Write silence (zeros)
-                for _ in range(num_samples):
-                    wav_file.writeframes(struct.pack('<h', 0))
-            
-            print(f"🔇 Fallback audio created: {output_path}")
-            
-            # Cache the result
-            self.tts_cache[cache_key] = output_path
-            debug_info.update({
-                "service_used": "fallback",
-                "success": True,
-                "output_path": output_path,
-                "cost_estimate": "0.00",
-                "fallback_reason": "Created silence fallback"
-            })
-            return {
-                "success": True,
-                "output_path": output_path,
-                **debug_info
-            }
-        except Exception as e:
-            print(f"❌ Failed to create fallback audio: {e}")
-            debug_info.update({
-                "fallback_reason": f"Failed to create fallback audio: {e}",
-                "error": str(e)
-            })
-            return {
-                "success": False,
-                "error": f"Failed to create fallback audio: {e}",
-                **debug_info
+
+        return None
+
+    def _allowed_backends(self) -> List[str]:
+        """Backends permitted by the admin settings (active_tts is the cost ceiling)."""
+        if not self.admin_dashboard.is_google_api_enabled():
+            return ["system"]
+        allowed = TTS_CEILINGS.get(self.admin_dashboard.get_effective_tts(), ["system"])
+        available = {"system": True, "google_cloud": google_synthesize is not None,
+                     "gemini": gemini_synthesize is not None}
+        return [backend for backend in allowed if available[backend]]
+
+    def backend_order(self, settings: Optional[dict] = None) -> List[str]:
+        """
+        Backends to try for one utterance, in order.
+
+        Adaptive selection ranks the allowed backends by health; otherwise the
+        order mirrors _synthesize_with_backend (system falls back to Google
+        Cloud, the paid tiers have no fallback).
+        """
+        settings = settings or self.admin_dashboard.get_tts_settings()
+        if settings.get("selection_mode", DEFAULT_SELECTION_MODE) == "adaptive":
+            return get_backend_selector().rank(self._allowed_backends())
+        if not self.admin_dashboard.is_google_api_enabled():
+            return ["system"]
+        order = {
+            "system": ["system", "google_cloud"],
+            "cloud": ["google_cloud"],
+            "gemini": ["gemini"],
+        }.get(settings.get("active_tts", "system"), ["system"])
+        available = {"system": True, "google_cloud": google_synthesize is not None,
+                     "gemini": gemini_synthesize is not None}
+        return [backend for backend in order if available[backend]]
+
+    def _run_backend(self, backend: str, text: str, language_code: str, output_path: str,
+                     audio_format: str = 'wav') -> Optional[str]:
+        if backend == "google_cloud":
+            return self._try_google_cloud_tts(text, language_code, output_path, audio_format)
+        if backend == "gemini":
+            return self._try_gemini_tts(text, language_code, output_path)
+        return self._try_system_tts(text, language_code, output_path)
+
+    def _synthesize_adaptive(self, text: str, language_code: str, output_path: str, debug_info: dict,
+                             audio_format: str = 'wav') -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Try the allowed backends in the order chosen by the health selector.
+
+        Every attempt feeds the selector's latency/error averages, so a slow or
+        failing backend drops behind the others instead of costing its full
+        timeout on every request. A placeholder tone counts as a failure but is
+        returned if no backend produced speech.
+        """
+        selector = get_backend_selector()
+        order = selector.rank(self._allowed_backends())
+        debug_info["backend_order"] = order
+        print(f"🎯 Adaptive TTS order: {' → '.join(order)}")
+
+        # Each backend writes its own file so a placeholder never shares a path with speech
+        base, extension = os.path.splitext(output_path)
+        placeholder = None
+        for backend in order:
+            result, latency_ms = self._timed_backend(
+                backend, text, language_code, f"{base}.{backend}{extension}", audio_format
+            )
+
+            if result and result not in self.placeholder_paths:
+                cost = estimate_cost(backend, text)
+                selector.record(backend, True, latency_ms, cost)
+                print(f"✅ {backend} TTS successful in {latency_ms:.0f} ms (~${cost:.4f})")
+                if placeholder:
+                    os.remove(placeholder)
+                return result, {backend: cost}
+
+            selector.record(backend, False, latency_ms)
+            print(f"❌ {backend} TTS failed after {latency_ms:.0f} ms")
+            debug_info["fallback_reason"] = f"{backend} TTS failed"
+            if result:
+                placeholder = placeholder or result
+
+        if placeholder:
+            return placeholder, {"system": 0.0}
+        return None
+
+    def _synthesize_sentences(self, chunks: List[str], language_code: str, output_path: str, settings: dict,
+                              debug_info: dict, audio_format: str = 'wav') -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Assemble an utterance from sentence clips, synthesizing only the ones not cached.
+
+        The whole utterance comes from one backend so sentences never mix
+        voices: backends are tried in backend_order(), and one that fails any
+        sentence is abandoned for the next. Missing sentences are synthesized
+        concurrently; every clip is decoded to PCM at CHUNK_SAMPLE_RATE,
+        trimmed and loudness-normalized, and the joined utterance is encoded
+        as audio_format. Clips are cached under the backend that produced them,
+        which is recorded in debug_info["backend"].
+
+        Returns:
+            (output path, {service: estimated cost}) or None if no backend
+            produced every sentence
+        """
+        sentence_cache = get_sentence_cache()
+        adaptive = settings.get("selection_mode", DEFAULT_SELECTION_MODE) == "adaptive"
+        order = self.backend_order(settings)
+        debug_info["backend_order"] = order
+        debug_info["chunks"] = len(chunks)
+        print(f"🎯 TTS backend order: {' → '.join(order)}")
+
+        base, _ = os.path.splitext(output_path)
+        placeholder = None
+        for backend in order:
+            segments = [sentence_cache.get(backend, language_code, chunk) for chunk in chunks]
+            missing = [index for index, segment in enumerate(segments) if segment is None]
+            print(f"✂️ {backend}: {len(chunks)} chunks, {len(chunks) - len(missing)} cached, {len(missing)} to synthesize")
+
+            futures = {
+                index: _chunk_executor.submit(
+                    self._timed_backend, backend, chunks[index], language_code, f"{base}.{backend}.part{index}.wav"
+                )
+                for index in missing
             }
-        
+            results = {index: future.result() for index, future in futures.items()}
+            chunk_files = [path for path, _ in results.values() if path]
+
+            try:
+                speech = True
+                for index, (path, latency_ms) in results.items():
+                    samples = read_audio_file(path, CHUNK_SAMPLE_RATE) if path else None
+                    if path and (samples is None or len(samples) == 0):
+                        print(f"⚠️ Could not decode chunk {path}")
+                        samples = None
+                    real = samples is not None and path not in self.placeholder_paths
+                    if adaptive:
+                        cost = estimate_cost(backend, chunks[index]) if real else 0.0
+                        get_backend_selector().record(backend, real, latency_ms, cost)
+                    speech = speech and real
+                    if samples is not None:
+                        segments[index] = normalize_loudness(trim_silence(samples, CHUNK_SAMPLE_RATE))
+                    if real:
+                        sentence_cache.put(backend, language_code, chunks[index], segments[index])
+
+                if speech:
+                    result = self._join_segments(segments, base, audio_format)
+                    if not result:
+                        return None
+                    debug_info["backend"] = backend
+                    debug_info["cached_chunks"] = len(chunks) - len(missing)
+                    cost = sum(estimate_cost(backend, chunks[index]) for index in missing)
+                    print(f"✅ {backend} TTS produced all {len(chunks)} chunks (~${cost:.4f})")
+                    return result, ({backend: cost} if missing else {})
+
+                print(f"❌ {backend} TTS failed for part of the utterance")
+                debug_info["fallback_reason"] = f"{backend} TTS failed"
+                # Placeholder tones stand in for failed speech; kept only as a last resort
+                if placeholder is None and all(segment is not None for segment in segments):
+                    placeholder = segments
+            finally:
+                for path in chunk_files:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+        if placeholder is None:
+            return None
+        result = self._join_segments(placeholder, base, audio_format)
+        if not result:
+            return None
+        self.placeholder_paths.add(result)
+        return result, {"system": 0.0}
+
+    def _timed_backend(self, backend: str, text: str, language_code: str, output_path: str,
+                       audio_format: str = 'wav') -> Tuple[Optional[str], float]:
+        """Run one backend; returns (output path or None, latency in ms)."""
+        start = time.time()
+        result = self._run_backend(backend, text, language_code, output_path, audio_format)
+        return result, (time.time() - start) * 1000
+
+    def _join_segments(self, segments: List[np.ndarray], base: str, audio_format: str) -> Optional[str]:
+        """Join sentence clips into base + the extension of audio_format (WAV if it cannot be encoded)."""
+        joined = concatenate_segments(segments, CHUNK_SAMPLE_RATE)
+        result = write_audio_file(f"{base}{AUDIO_FORMATS[audio_format][1]}", joined, CHUNK_SAMPLE_RATE, audio_format)
+        if not result:
+            print(f"⚠️ No {audio_format} encoder available, writing WAV")
+            result = write_audio_file(f"{base}.wav", joined, CHUNK_SAMPLE_RATE)
+        print(f"✅ Joined {len(segments)} chunks into {result}")
+        return result
+
+    def _encode_output(self, path: str, audio_format: str) -> str:
+        """Re-encode a synthesized file to audio_format, keeping the original if that fails."""
+        if format_for_path(path) == audio_format:
+            return path
+
+        samples = read_audio_file(path, CHUNK_SAMPLE_RATE)
+        if samples is None or len(samples) == 0:
+            return path
+
+        encoded_path = write_audio_file(
+            f"{os.path.splitext(path)[0]}{AUDIO_FORMATS[audio_format][1]}", samples, CHUNK_SAMPLE_RATE, audio_format
+        )
+        if not encoded_path:
+            return path
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        if path in self.placeholder_paths:
+            self.placeholder_paths.add(encoded_path)
+        return encoded_path
+
     def _convert_aiff_to_wav(self, aiff_path: str) -> Optional[str]:
-        """Convert AIFF file to WAV using ffmpeg/sox (works with Python 3.13+)"""
+        """Convert AIFF file to WAV in-process (works with Python 3.13+)"""
         try:
             wav_path = aiff_path.replace('.aiff', '.wav')
-            # Use the existing _convert_to_wav method which handles ffmpeg/sox
+            # Use the existing _convert_to_wav method which decodes in memory
             converted_path = self._convert_to_wav(aiff_path, wav_path)
             if converted_path and os.path.exists(converted_path):
                 print(f"✅ Converted AIFF to WAV: {converted_path}")
@@ -460,7 +716,7 @@ class AdminControlledTTSSynthesizer:
                         # Convert AIFF to WAV for browser compatibility
                         print(f"🔄 Attempting to convert fallback AIFF to WAV: {aiff_path}")
                         try:
-                            wav_path = self.convert_aiff_to_wav(aiff_path)
+                            wav_path = self._convert_aiff_to_wav(aiff_path)
                             print(f"🔄 Fallback conversion result: {wav_path}")
                             
                             if wav_path and os.path.exists(wav_path):
@@ -490,48 +746,17 @@ class AdminControlledTTSSynthesizer:
                     return output_path
                     
             elif self.system == 'linux':
-                # Use web-based TTS for Linux (no dependencies required)
-                print("🌐 Using web-based TTS for Linux (no dependencies required)")
-                result = self._try_web_tts(text, language_code, output_path)
+                # Web TTS sounds more natural; espeak-ng is local and keeps working offline
+                if PREFER_LOCAL_TTS:
+                    result = self._try_espeak_tts(text, language_code, output_path) or self._try_web_tts(text, language_code, output_path)
+                else:
+                    print("🌐 Using web-based TTS for Linux (no dependencies required)")
+                    result = self._try_web_tts(text, language_code, output_path) or self._try_espeak_tts(text, language_code, output_path)
                 if result:
                     return result
                 
-                # Fallback to system TTS methods (commented out - kept for future use)
-                # voice = self.voice_map.get(language_code, {}).get('linux', 'english_rp')
-                # 
-                # # Try espeak first
-                # try:
-                #     cmd = ['espeak', '-v', voice, '-w', output_path, text]
-                #     result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                #     if result.returncode == 0 and os.path.exists(output_path):
-                #         print(f"✅ espeak TTS successful: {output_path}")
-                #         return output_path
-                # except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                #     print(f"⚠️ espeak failed: {e}")
-                # 
-                # # Try festival as fallback
-                # try:
-                #     cmd = ['festival', '--tts', '--pipe']
-                #     with open(output_path, 'wb') as f:
-                #         result = subprocess.run(cmd, input=text, stdout=f, stderr=subprocess.PIPE, text=True, timeout=10)
-                #     if result.returncode == 0 and os.path.exists(output_path):
-                #         print(f"✅ festival TTS successful: {output_path}")
-                #         return output_path
-                # except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                #     print(f"⚠️ festival failed: {e}")
-                # 
-                # # Try spd-say as another fallback
-                # try:
-                #     cmd = ['spd-say', '-w', '-o', output_path, text]
-                #     result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                #     if result.returncode == 0 and os.path.exists(output_path):
-                #         print(f"✅ spd-say TTS successful: {output_path}")
-                #         return output_path
-                # except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                #     print(f"⚠️ spd-say failed: {e}")
-                
-                # If web TTS fails, create a simple beep sound as final fallback
-                print("🔇 Web TTS failed, creating simple audio file...")
+                # If no speech engine worked, create a simple beep sound as final fallback
+                print("🔇 Web and local TTS failed, creating simple audio file...")
                 return self._create_simple_audio_file(text, output_path)
                     
         except Exception as e:
@@ -539,19 +764,29 @@ class AdminControlledTTSSynthesizer:
         
         return None
 
+    def _try_espeak_tts(self, text: str, language_code: str, output_path: str) -> Optional[str]:
+        """Try the local espeak-ng engine (FREE, offline)"""
+        if not espeak_synthesize or not espeak_available():
+            return None
+        voice = self.voice_map.get(language_code, {}).get('linux', 'english_rp')
+        wav_path = f"{os.path.splitext(output_path)[0]}.wav"
+        result = espeak_synthesize(text, voice, wav_path)
+        if result:
+            print(f"✅ espeak-ng TTS successful ({voice}): {result}")
+        return result
+
     def _try_web_tts(self, text: str, language_code: str, output_path: str) -> Optional[str]:
-        """Try web-based TTS using free online services (no dependencies required)"""
+        """
+        Try web-based TTS using free online services (no dependencies required).
+
+        These services reject requests over ~200 characters; synthesize_speech
+        splits longer text into chunks before it gets here.
+        """
         try:
             import urllib.request
             import urllib.parse
             import io
             
-            # Limit text length for web TTS (most services have limits)
-            max_length = 200
-            if len(text) > max_length:
-                text = text[:max_length] + "..."
-                print(f"🌐 Text truncated to {max_length} characters for web TTS")
-            
             # Map language codes to web TTS service language codes
             lang_map = {
                 'en': 'en',
@@ -575,23 +810,26 @@ class AdminControlledTTSSynthesizer:
             web_lang = lang_map.get(language_code, 'en')
             print(f"🌐 Web TTS: Using language '{web_lang}' for '{language_code}'")
             
-            # Try multiple free TTS services
-            services = [
-                self._try_google_translate_tts,
-                self._try_voicerss_tts,
-                self._try_responsivevoice_tts,
-                self._try_elevenlabs_free_tts
-            ]
-            
-            for service in services:
-                try:
-                    result = service(text, web_lang, output_path)
-                    if result:
-                        print(f"✅ Web TTS successful with {service.__name__}: {result}")
-                        return result
-                except Exception as e:
-                    print(f"⚠️ {service.__name__} failed: {e}")
-                    continue
+            # VoiceRSS and ResponsiveVoice are stubs that never return audio
+            services = {
+                "google_translate": self._try_google_translate_tts,
+                "elevenlabs": self._try_elevenlabs_free_tts
+            }
+
+            if WEB_TTS_MODE == "race":
+                result = self._race_web_tts(services, text, web_lang, output_path)
+                if result:
+                    return result
+            else:
+                for name, service in services.items():
+                    try:
+                        result = service(text, web_lang, output_path)
+                        if result:
+                            print(f"✅ Web TTS successful with {name}: {result}")
+                            return result
+                    except Exception as e:
+                        print(f"⚠️ {name} failed: {e}")
+                        continue
             
             print("⚠️ All web TTS services failed")
             return None
@@ -600,6 +838,55 @@ class AdminControlledTTSSynthesizer:
             print(f"🌐 Web TTS error: {e}")
             return None
 
+    def _race_web_tts(self, services: dict, text: str, lang: str, output_path: str) -> Optional[str]:
+        """
+        Start every web TTS provider at once and keep the first valid audio.
+
+        Each provider writes its own file; the winner's is moved to output_path
+        (with the extension it produced). Providers that have not started are
+        cancelled and files from ones still downloading are deleted when they finish.
+        """
+        base, _ = os.path.splitext(output_path)
+        futures = {
+            _web_tts_executor.submit(service, text, lang, f"{base}.web-{name}.wav"): name
+            for name, service in services.items()
+        }
+
+        winner = None
+        pending = set(futures)
+        while pending and not winner:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"⚠️ {futures[future]} failed: {e}")
+                    continue
+                if result and not winner:
+                    winner = (futures[future], result)
+                elif result:
+                    _discard_web_tts_file(future)
+
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(_discard_web_tts_file)
+
+        with _web_tts_lock:
+            _web_tts_stats["races"] += 1
+            if winner:
+                _web_tts_stats["wins"][winner[0]] = _web_tts_stats["wins"].get(winner[0], 0) + 1
+            else:
+                _web_tts_stats["failures"] += 1
+
+        if not winner:
+            return None
+
+        name, path = winner
+        final_path = f"{base}{os.path.splitext(path)[1]}"
+        os.replace(path, final_path)
+        print(f"✅ Web TTS race won by {name}: {final_path}")
+        return final_path
+
     def _try_google_translate_tts(self, text: str, lang: str, output_path: str) -> Optional[str]:
         """Try Google Translate TTS (free, no API key required)"""
         try:
@@ -607,12 +894,6 @@ class AdminControlledTTSSynthesizer:
             import urllib.parse
             import ssl
             
-            # Limit text length for Google Translate TTS (it has a limit)
-            max_length = 200
-            if len(text) > max_length:
-                text = text[:max_length]
-                print(f"🌐 Text truncated to {max_length} characters for Google Translate TTS")
-            
             # Google Translate TTS URL (updated format)
             encoded_text = urllib.parse.quote(text)
             url = f"https://translate.google.com/translate_tts?ie=UTF-8&tl={lang}&client=tw-ob&q={encoded_text}"
@@ -638,22 +919,17 @@ class AdminControlledTTSSynthesizer:
             print(f"🌐 Downloaded {len(audio_data)} bytes from Google Translate TTS")
             
             if len(audio_data) > 100:  # Basic check for valid audio data
-                # Save as MP3 first
-                mp3_path = output_path.replace('.aiff', '.mp3').replace('.wav', '.mp3')
+                # Decode the MP3 in memory and write WAV for browser compatibility
+                wav_path = self._save_as_wav(audio_data, output_path)
+                if wav_path:
+                    return wav_path
+
+                # If decoding fails, save the MP3 (browsers can play MP3)
+                mp3_path = f"{os.path.splitext(output_path)[0]}.mp3"
                 with open(mp3_path, 'wb') as f:
                     f.write(audio_data)
-                
-                print(f"🌐 Saved MP3 file: {mp3_path} ({len(audio_data)} bytes)")
-                
-                # Try to convert MP3 to WAV for browser compatibility
-                wav_path = self._convert_to_wav(mp3_path, output_path)
-                if wav_path and os.path.exists(wav_path):
-                    print(f"✅ Converted to WAV: {wav_path}")
-                    return wav_path
-                else:
-                    # If conversion fails, return the MP3 (browsers can play MP3)
-                    print(f"🌐 Using MP3 directly: {mp3_path}")
-                    return mp3_path
+                print(f"🌐 Using MP3 directly: {mp3_path} ({len(audio_data)} bytes)")
+                return mp3_path
             else:
                 print(f"⚠️ Google Translate TTS returned insufficient data: {len(audio_data)} bytes")
                 return None
@@ -697,12 +973,6 @@ class AdminControlledTTSSynthesizer:
             import urllib.parse
             import json
             
-            # Limit text length
-            max_length = 200
-            if len(text) > max_length:
-                text = text[:max_length]
-                print(f"🌐 Text truncated to {max_length} characters for ElevenLabs TTS")
-            
             # ElevenLabs free TTS endpoint (no API key required for basic usage)
             url = "https://api.elevenlabs.io/v1/text-to-speech/pNInz6obpgDQGcFmaJgB"
             
@@ -733,22 +1003,17 @@ class AdminControlledTTSSynthesizer:
             print(f"🌐 Downloaded {len(audio_data)} bytes from ElevenLabs TTS")
             
             if len(audio_data) > 100:  # Basic check for valid audio data
-                # Save as MP3
-                mp3_path = output_path.replace('.aiff', '.mp3').replace('.wav', '.mp3')
+                # Decode the MP3 in memory and write WAV for browser compatibility
+                wav_path = self._save_as_wav(audio_data, output_path)
+                if wav_path:
+                    return wav_path
+
+                # If decoding fails, save the MP3 (browsers can play MP3)
+                mp3_path = f"{os.path.splitext(output_path)[0]}.mp3"
                 with open(mp3_path, 'wb') as f:
                     f.write(audio_data)
-                
-                print(f"🌐 Saved MP3 file: {mp3_path} ({len(audio_data)} bytes)")
-                
-                # Try to convert to WAV
-                wav_path = self._convert_to_wav(mp3_path, output_path)
-                if wav_path and os.path.exists(wav_path):
-                    print(f"✅ Converted to WAV: {wav_path}")
-                    return wav_path
-                else:
-                    # If conversion fails, return the MP3
-                    print(f"🌐 Using MP3 directly: {mp3_path}")
-                    return mp3_path
+                print(f"🌐 Using MP3 directly: {mp3_path} ({len(audio_data)} bytes)")
+                return mp3_path
             else:
                 print(f"⚠️ ElevenLabs TTS returned insufficient data: {len(audio_data)} bytes")
                 return None
@@ -760,90 +1025,62 @@ class AdminControlledTTSSynthesizer:
     def _convert_to_wav(self, input_path: str, output_path: str) -> Optional[str]:
         """Convert audio file to WAV format for browser compatibility"""
         try:
-            import subprocess
-            
-            wav_path = output_path.replace('.aiff', '.wav').replace('.mp3', '.wav')
-            
-            # Try ffmpeg conversion first
-            try:
-                cmd = ['ffmpeg', '-i', input_path, '-acodec', 'pcm_s16le', '-ar', '22050', '-ac', '1', wav_path, '-y']
-                print(f"🔄 Attempting ffmpeg conversion: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-                
-                if result.returncode == 0 and os.path.exists(wav_path):
-                    file_size = os.path.getsize(wav_path)
-                    print(f"✅ Converted to WAV using ffmpeg: {wav_path} ({file_size} bytes)")
-                    # Clean up original file
-                    try:
-                        os.remove(input_path)
-                    except:
-                        pass
-                    return wav_path
-                else:
-                    print(f"⚠️ ffmpeg conversion failed: {result.stderr}")
-            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                print(f"⚠️ ffmpeg not available or failed: {e}")
-            
-            # Try using sox if available (alternative audio converter)
-            try:
-                cmd = ['sox', input_path, '-r', '22050', '-c', '1', '-b', '16', wav_path]
-                print(f"🔄 Attempting sox conversion: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-                
-                if result.returncode == 0 and os.path.exists(wav_path):
-                    file_size = os.path.getsize(wav_path)
-                    print(f"✅ Converted to WAV using sox: {wav_path} ({file_size} bytes)")
-                    # Clean up original file
+            with open(input_path, 'rb') as f:
+                audio_data = f.read()
+
+            wav_path = self._save_as_wav(audio_data, output_path)
+            if wav_path:
+                if os.path.abspath(wav_path) != os.path.abspath(input_path):
                     try:
                         os.remove(input_path)
-                    except:
+                    except OSError:
                         pass
-                    return wav_path
-                else:
-                    print(f"⚠️ sox conversion failed: {result.stderr}")
-            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                print(f"⚠️ sox not available or failed: {e}")
-            
-            # Try macOS built-in afconvert (for AIFF files on macOS)
+                return wav_path
+
+            # Try macOS built-in afconvert (for AIFF files on macOS without PyAV/ffmpeg)
             if self.system == 'darwin' and input_path.endswith('.aiff'):
+                wav_path = output_path.replace('.aiff', '.wav').replace('.mp3', '.wav')
                 try:
-                    cmd = ['afconvert', '-f', 'WAVE', '-d', 'LEI16@22050', '-c', '1', input_path, wav_path]
+                    cmd = ['afconvert', '-f', 'WAVE', '-d', f'LEI16@{WAV_SAMPLE_RATE}', '-c', '1', input_path, wav_path]
                     print(f"🔄 Attempting macOS afconvert conversion: {' '.join(cmd)}")
                     result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-                    
                     if result.returncode == 0 and os.path.exists(wav_path):
-                        file_size = os.path.getsize(wav_path)
-                        print(f"✅ Converted to WAV using macOS afconvert: {wav_path} ({file_size} bytes)")
-                        # Clean up original file
+                        print(f"✅ Converted to WAV using macOS afconvert: {wav_path}")
                         try:
                             os.remove(input_path)
-                        except:
+                        except OSError:
                             pass
                         return wav_path
-                    else:
-                        print(f"⚠️ afconvert conversion failed: {result.stderr}")
+                    print(f"⚠️ afconvert conversion failed: {result.stderr}")
                 except (subprocess.TimeoutExpired, FileNotFoundError) as e:
                     print(f"⚠️ afconvert not available or failed: {e}")
-            # If both ffmpeg and sox fail, try to use the file as-is if it's already supported
+
+            # If decoding fails, try to use the file as-is if it's already supported
             if input_path.endswith('.mp3') or input_path.endswith('.wav'):
                 print(f"🌐 Using original format (no conversion available): {input_path}")
                 return input_path
-            
-            print(f"⚠️ No audio conversion tools available, cannot convert {input_path}")
+
+            print(f"⚠️ No audio decoder available, cannot convert {input_path}")
             return None
-            
+
         except Exception as e:
             print(f"🌐 Audio conversion error: {e}")
             return None
 
+    def _save_as_wav(self, audio_data: bytes, output_path: str) -> Optional[str]:
+        """Decode compressed audio from memory and write it as a WAV file"""
+        wav_path = f"{os.path.splitext(output_path)[0]}.wav"
+        samples = decode_to_pcm(audio_data, WAV_SAMPLE_RATE)
+        if samples is None or len(samples) == 0:
+            return None
+
+        write_audio_file(wav_path, samples, WAV_SAMPLE_RATE)
+        print(f"✅ Converted to WAV in memory: {wav_path} ({os.path.getsize(wav_path)} bytes)")
+        return wav_path
+
     def _create_simple_audio_file(self, text: str, output_path: str) -> Optional[str]:
         """Create a simple audio file with speech-like patterns as fallback"""
         try:
-            import wave
-            import struct
-            import math
-            import random
-            
             # Ensure we create a WAV file for browser compatibility
             wav_path = output_path.replace('.aiff', '.wav') if output_path.endswith('.aiff') else output_path
             if not wav_path.endswith('.wav'):
@@ -852,50 +1089,19 @@ class AdminControlledTTSSynthesizer:
             # Create speech-like audio patterns
             sample_rate = 22050
             duration = min(len(text) * 0.08, 4.0)  # Duration based on text length, max 4 seconds
-            
-            num_samples = int(sample_rate * duration)
-            samples = []
-            
-            # Generate speech-like patterns with varying frequencies and amplitudes
-            for i in range(num_samples):
-                t = i / sample_rate
-                
-                # Create speech-like patterns with multiple harmonics
-                # Base frequency varies slightly (like human speech)
-                base_freq = 120 + 20 * math.sin(t * 2)  # Vary between 100-140 Hz
-                
-                # Add harmonics for more speech-like sound
-                sample = 0
-                sample += 0.4 * math.sin(2 * math.pi * base_freq * t)
-                sample += 0.2 * math.sin(2 * math.pi * base_freq * 2 * t)
-                sample += 0.1 * math.sin(2 * math.pi * base_freq * 3 * t)
-                
-                # Add some variation and envelope
-                envelope = math.exp(-t * 0.5)  # Decay envelope
-                variation = 1 + 0.1 * math.sin(t * 10)  # Small variations
-                
-                # Add some noise for more realistic speech-like quality
-                noise = 0.05 * (random.random() - 0.5)
-                
-                final_sample = int(32767 * 0.2 * envelope * variation * (sample + noise))
-                samples.append(max(-32767, min(32767, final_sample)))  # Clamp to 16-bit range
-            
-            # Write WAV file
-            with wave.open(wav_path, 'w') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(sample_rate)
-                wav_file.writeframes(struct.pack('<' + 'h' * len(samples), *samples))
+            write_audio_file(wav_path, speech_like_tone(duration, sample_rate), sample_rate)
             
             print(f"🔇 Created speech-like fallback audio file (WAV): {wav_path}")
+            self.placeholder_paths.add(wav_path)
             return wav_path
             
         except Exception as e:
             print(f"🔇 Failed to create fallback audio file: {e}")
             return None
 
-    def _try_google_cloud_tts(self, text: str, language_code: str, output_path: str) -> Optional[str]:
-        """Try Google Cloud TTS (CHEAP)"""
+    def _try_google_cloud_tts(self, text: str, language_code: str, output_path: str,
+                              audio_format: str = 'mp3') -> Optional[str]:
+        """Try Google Cloud TTS (CHEAP), encoded natively as audio_format"""
         print(f"☁️ _try_google_cloud_tts called with:")
         print(f"   text: '{text[:50]}...' (length: {len(text)})")
         print(f"   language_code: '{language_code}'")
@@ -907,13 +1113,13 @@ class AdminControlledTTSSynthesizer:
             return None
             
         try:
-            # Change extension to .mp3 for Google Cloud TTS
-            mp3_path = output_path.replace('.wav', '.mp3')
-            print(f"☁️ Calling google_synthesize with mp3_path: {mp3_path}")
-            result = google_synthesize(text, language_code, mp3_path)
+            # Match the extension to the encoding Google Cloud TTS returns
+            encoded_path = f"{os.path.splitext(output_path)[0]}{AUDIO_FORMATS[audio_format][1]}"
+            print(f"☁️ Calling google_synthesize with path: {encoded_path}")
+            result = google_synthesize(text, language_code, encoded_path, audio_format)
             print(f"☁️ google_synthesize result: {result}")
             if result:
-                return mp3_path
+                return encoded_path
             else:
                 print("❌ google_synthesize returned None")
         except Exception as e:
@@ -929,14 +1135,140 @@ class AdminControlledTTSSynthesizer:
             return None
             
         try:
-            result = gemini_synthesize(text, language_code, output_path)
+            # Gemini returns PCM saved as WAV; name it so _encode_output converts it
+            wav_path = f"{os.path.splitext(output_path)[0]}.wav"
+            result = gemini_synthesize(text, language_code, wav_path)
             if result:
-                return output_path
+                return wav_path
         except Exception as e:
             print(f"Gemini TTS error: {e}")
         
         return None
 
+    def synthesize_marked(self, texts: List[str], language_code: str, output_paths: List[str],
+                          audio_format: Optional[str] = None) -> Optional[List[dict]]:
+        """
+        Synthesize several same-language texts in one Google Cloud TTS request.
+
+        The SSML marks split the audio into one clip per text; each clip is
+        written to its output path (extension replaced to match audio_format).
+        Only used when Google Cloud is the active tier.
+
+        Returns:
+            One result dict per text (like synthesize_speech), or None if the
+            marked request failed and the texts should be synthesized one by one
+        """
+        audio_format = audio_format or DEFAULT_AUDIO_FORMAT
+        if (not google_synthesize_marked or not self.admin_dashboard.is_google_api_enabled()
+                or self.admin_dashboard.get_effective_tts() != "cloud"):
+            return None
+
+        clips = google_synthesize_marked(texts, language_code)
+        if not clips:
+            return None
+
+        rate = CHUNK_SAMPLE_RATE
+        results = []
+        for text, clip, output_path in zip(texts, clips, output_paths):
+            base, _ = os.path.splitext(output_path)
+            samples = trim_silence(clip, rate)
+            path = (write_audio_file(f"{base}{AUDIO_FORMATS[audio_format][1]}", samples, rate, audio_format)
+                    or write_audio_file(f"{base}.wav", samples, rate))
+            if not path:
+                return None
+            results.append({
+                "success": True,
+                "output_path": path,
+                "service_used": "google_cloud_ssml",
+                "placeholder": False,
+                "backend": "google_cloud",
+                "format": format_for_path(path),
+                "mime_type": mime_type_for_path(path),
+                "cost_estimate": f"{estimate_cost('google_cloud', text):.4f}"
+            })
+
+        total_cost = sum(estimate_cost('google_cloud', text) for text in texts)
+        self.admin_dashboard.track_usage("google_cloud", total_cost)
+        print(f"✅ Synthesized {len(texts)} items in one marked request (~${total_cost:.4f})")
+        return results
+
+    def _streams_gemini(self, settings: dict) -> bool:
+        """True if stream_speech relays Gemini output as it is produced."""
+        return bool(gemini_stream) and settings.get("active_tts", "system") == "gemini" \
+            and self.admin_dashboard.is_google_api_enabled()
+
+    def stream_backend_order(self) -> List[str]:
+        """Backends stream_speech may use, in order: a Gemini stream first, then regular synthesis."""
+        settings = self.admin_dashboard.get_tts_settings()
+        order = self.backend_order(settings)
+        if self._streams_gemini(settings):
+            order = ["gemini"] + [backend for backend in order if backend != "gemini"]
+        return order
+
+    def stream_speech(self, text: str, language_code: str = 'en', output_path: str = "response.wav") -> dict:
+        """
+        Synthesize speech for progressive playback.
+
+        When Gemini is the active tier and Google APIs are enabled, PCM chunks
+        are relayed as the model produces them and a copy is written to
+        output_path once the stream completes. Every other tier (and a Gemini
+        stream that fails before its first chunk) falls back to regular
+        synthesis and relays the finished file in chunks.
+
+        Returns:
+            Dictionary with success, service_used, mime_type ('audio/pcm' for
+            raw 16-bit mono PCM), sample_rate (PCM only) and a chunks iterator
+        """
+        if self._streams_gemini(self.admin_dashboard.get_tts_settings()):
+            try:
+                chunks = gemini_stream(text, language_code)
+                # Pull the first chunk here so failures can still fall back
+                first_chunk = next(chunks)
+                print(f"🌊 Gemini TTS streaming started ({len(first_chunk)} bytes in first chunk)")
+                return {
+                    "success": True,
+                    "service_used": "gemini",
+                    "backend": "gemini",
+                    "placeholder": False,
+                    "mime_type": "audio/pcm",
+                    "sample_rate": GeminiTTSSynthesizer.SAMPLE_RATE,
+                    "output_path": output_path,
+                    "chunks": self._relay_gemini_stream(text, first_chunk, chunks, output_path)
+                }
+            except StopIteration:
+                print("❌ Gemini TTS stream returned no audio")
+            except Exception as e:
+                print(f"❌ Gemini TTS streaming error: {e}")
+
+        result = self.synthesize_speech(text, language_code, output_path)
+        if not result.get('success') or not result.get('output_path'):
+            return {**result, "success": False, "chunks": iter(())}
+
+        path = result['output_path']
+        return {
+            **result,
+            "mime_type": mime_type_for_path(path) or 'application/octet-stream',
+            "sample_rate": None,
+            "chunks": relay_file(path)
+        }
+
+    def _relay_gemini_stream(self, text: str, first_chunk: bytes, chunks, output_path: str):
+        """Yield Gemini PCM chunks, then save them as a WAV file and record usage."""
+        audio = bytearray(first_chunk)
+        yield first_chunk
+        for chunk in chunks:
+            audio.extend(chunk)
+            yield chunk
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        write_audio_file(output_path, np.frombuffer(bytes(audio), dtype='<i2'), GeminiTTSSynthesizer.SAMPLE_RATE)
+
+        estimated_cost = len(text) * 0.015 / 1000
+        self.admin_dashboard.track_usage("gemini", estimated_cost)
+        print(f"✅ Gemini TTS stream complete: {len(audio)} bytes saved to {output_path}")
+
     def get_tts_status(self) -> dict:
         """Get current TTS system status"""
         return {
@@ -948,10 +1280,86 @@ class AdminControlledTTSSynthesizer:
             "usage_stats": self.admin_dashboard.get_usage_stats()
         }
 
-def synthesize_speech(text: str, language_code: str = 'en', output_path: str = "response.wav") -> Optional[str]:
+def _discard_web_tts_file(future):
+    """Delete the file written by a web TTS provider that lost the race."""
+    try:
+        result = future.result()
+        if result:
+            os.remove(result)
+    except Exception:
+        pass
+
+def get_web_tts_stats() -> dict:
+    """Return web TTS race counts and wins per provider."""
+    with _web_tts_lock:
+        return {**_web_tts_stats, "wins": dict(_web_tts_stats["wins"]), "mode": WEB_TTS_MODE}
+
+def synthesize_speech(text: str, language_code: str = 'en', output_path: str = "response.wav",
+                      audio_format: Optional[str] = None) -> Optional[str]:
     """Main function for TTS synthesis with admin control"""
     synthesizer = AdminControlledTTSSynthesizer()
-    return synthesizer.synthesize_speech(text, language_code, output_path)
+    return synthesizer.synthesize_speech(text, language_code, output_path, audio_format)
+
+def planned_backends() -> List[str]:
+    """Backends the next synthesis would try, in order (for finding existing audio)."""
+    return AdminControlledTTSSynthesizer().backend_order()
+
+def planned_stream_backends() -> List[str]:
+    """Backends a stream_speech call would use right now, in order."""
+    return AdminControlledTTSSynthesizer().stream_backend_order()
+
+def synthesize_many(items: List[Tuple[str, str, str]], audio_format: Optional[str] = None,
+                    use_ssml_marks: bool = False) -> List[dict]:
+    """
+    Synthesize several (text, language_code, output_path) items with one synthesizer.
+
+    Items are synthesized concurrently. With use_ssml_marks, items sharing a
+    language are first tried as a single marked Google Cloud TTS request.
+
+    Returns result dicts (as from synthesize_speech) in the order of items.
+    """
+    synthesizer = AdminControlledTTSSynthesizer()
+    results: List[Optional[dict]] = [None] * len(items)
+
+    if use_ssml_marks:
+        by_language: Dict[str, List[int]] = {}
+        for index, (_, language_code, _) in enumerate(items):
+            by_language.setdefault(language_code, []).append(index)
+        for language_code, indexes in by_language.items():
+            if len(indexes) < 2:
+                continue
+            marked = synthesizer.synthesize_marked(
+                [items[index][0] for index in indexes], language_code,
+                [items[index][2] for index in indexes], audio_format
+            )
+            for index, result in zip(indexes, marked or []):
+                results[index] = result
+
+    futures = {
+        index: _batch_executor.submit(synthesizer.synthesize_speech, text, language_code, output_path, audio_format)
+        for index, (text, language_code, output_path) in enumerate(items)
+        if results[index] is None
+    }
+    for index, future in futures.items():
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            results[index] = {"success": False, "error": str(e)}
+    return results
+
+def relay_file(path: str):
+    """Yield a synthesized file in fixed-size chunks (opened lazily, on first read)."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+def stream_speech(text: str, language_code: str = 'en', output_path: str = "response.wav") -> dict:
+    """Main function for streaming TTS synthesis with admin control"""
+    synthesizer = AdminControlledTTSSynthesizer()
+    return synthesizer.stream_speech(text, language_code, output_path)
 
 if __name__ == "__main__":
     # Test the system
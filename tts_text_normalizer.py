@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+TTS Text Normalizer
+Reduces tutor and feedback text to what should actually be spoken
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, Any
+
+# Mirrors LanguageTutor.SCRIPT_LANGUAGES: replies come back as "[Native Script] (Romanized)"
+SCRIPT_LANGUAGES = {'hi', 'ja', 'zh', 'ko', 'ar', 'ta', 'or', 'ml'}
+
+# Feedback highlighting: __grammar__, ~~phrasing~~, ==highlight==, **bold**
+_MARKUP = re.compile(r'(__|~~|==|\*\*)(.+?)\1', re.DOTALL)
+
+# A parenthetical (ASCII or full-width parentheses) with no nested parentheses
+_PARENTHETICAL = re.compile(r'\s*[(（]([^()（）]*)[)）]')
+
+# Square brackets from the "[Native Script]" answer template
+_BRACKETS = re.compile(r'[\[\]]')
+
+
+def _is_romanization(text: str) -> bool:
+    """True if text contains Latin letters and no letters from any other script."""
+    has_latin = False
+    for char in text:
+        if not char.isalpha():
+            continue
+        if 'LATIN' not in unicodedata.name(char, ''):
+            return False
+        has_latin = True
+    return has_latin
+
+
+class TTSTextNormalizer:
+    """Strips markup and, for script languages, romanized glosses before synthesis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.chars_in = 0
+        self.chars_saved = 0
+
+    def normalize(self, text: str, language_code: str = 'en') -> str:
+        """
+        Return the speakable part of text.
+
+        Markup delimiters are removed everywhere (their content is kept). For
+        script languages, parentheticals written only in Latin letters are
+        dropped, since they repeat the native text in romanization. If nothing
+        native remains (the text was only romanization), the markup-free text
+        is returned instead.
+        """
+        if not text:
+            return text or ''
+
+        cleaned = _MARKUP.sub(r'\2', unicodedata.normalize('NFC', text))
+        if language_code in SCRIPT_LANGUAGES:
+            native = _PARENTHETICAL.sub(
+                lambda match: '' if _is_romanization(match.group(1)) else match.group(0), cleaned
+            )
+            native = _BRACKETS.sub('', native)
+            if native.strip():
+                cleaned = native
+        cleaned = ' '.join(cleaned.split())
+
+        with self._lock:
+            self.texts += 1
+            self.chars_in += len(text)
+            self.chars_saved += max(len(text) - len(cleaned), 0)
+        return cleaned
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return how many characters normalization kept away from the TTS engines."""
+        with self._lock:
+            return {
+                "texts": self.texts,
+                "chars_in": self.chars_in,
+                "chars_saved": self.chars_saved,
+                "saved_ratio": round(self.chars_saved / self.chars_in, 3) if self.chars_in else 0.0
+            }
+
+
+# Global normalizer instance
+text_normalizer = None
+
+def get_text_normalizer() -> TTSTextNormalizer:
+    """Get or create the global normalizer instance."""
+    global text_normalizer
+    if text_normalizer is None:
+        text_normalizer = TTSTextNormalizer()
+    return text_normalizer
+
+
+def normalize_for_tts(text: str, language_code: str = 'en') -> str:
+    """Convenience function using the global normalizer."""
+    return get_text_normalizer().normalize(text, language_code)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+TTS Warm-up
+Pre-renders common phrases per language after boot so their first use is a cache hit
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List
+
+from admin_dashboard import AdminDashboard
+from artifact_index import get_artifact_index, tts_filename
+from gemini_client import create_tutor
+from tts_synthesizer_admin_controlled import synthesize_many, planned_backends, DEFAULT_AUDIO_FORMAT
+from tts_text_normalizer import normalize_for_tts
+
+# Lines the tutor falls back to when Gemini is unavailable (see gemini_client)
+FALLBACK_LINES = [
+    "Let's keep practicing together!",
+    "I'm here to help you practice!",
+    "Keep practicing!",
+    "Keep practicing - you're doing well!",
+]
+
+# Typical opening line per language; also the default warm-up languages
+GREETINGS = {
+    'en': "Hello! How are you today?",
+    'es': "¡Hola! ¿Cómo estás hoy?",
+    'fr': "Bonjour ! Comment ça va aujourd'hui ?",
+    'tl': "Kumusta ka ngayon?",
+    'ja': "こんにちは！今日は元気ですか？",
+    'ko': "안녕하세요! 오늘 어떻게 지내세요?",
+    'zh': "你好！你今天怎么样？",
+    'hi': "नमस्ते! आज आप कैसे हैं?",
+    'ta': "வணக்கம்! இன்று எப்படி இருக்கிறீர்கள்?",
+    'ml': "നമസ്കാരം! ഇന്ന് സുഖമാണോ?",
+    'or': "ନମସ୍କାର! ଆଜି କେମିତି ଅଛନ୍ତି?",
+}
+
+
+def collect_phrases(language_code: str, extra_phrases: Optional[List[str]] = None) -> List[str]:
+    """
+    Return the normalized, de-duplicated warm-up phrases for a language.
+
+    Combines the fallback lines, the greeting, the tutor's fallback
+    suggestions, the native part of its script suggestion examples and any
+    configured extra phrases.
+    """
+    phrases = list(FALLBACK_LINES)
+    if language_code in GREETINGS:
+        phrases.append(GREETINGS[language_code])
+    try:
+        tutor = create_tutor(language_code)
+        phrases.extend(suggestion["text"] for suggestion in tutor.get_fallback_suggestions())
+        # Example lines look like "native - romanized - translation"
+        for line in tutor.get_script_suggestion_example().splitlines():
+            native = line.split(' - ')[0].strip()
+            if native:
+                phrases.append(native)
+    except Exception as e:
+        print(f"⚠️ [TTS_WARMUP] Could not collect tutor phrases for {language_code}: {e}")
+    phrases.extend(extra_phrases or [])
+
+    normalized = [normalize_for_tts(phrase, language_code) for phrase in phrases if phrase]
+    return list(dict.fromkeys(phrase for phrase in normalized if phrase.strip()))
+
+
+class TTSWarmup:
+    """Background job that renders the warm-up phrases through the normal TTS path"""
+
+    def __init__(self, delay_seconds: Optional[float] = None, batch_size: int = 8):
+        self.delay_seconds = delay_seconds if delay_seconds is not None else float(
+            os.getenv('TTS_WARMUP_DELAY_SECONDS', '10')
+        )
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self.progress = {
+            "state": "idle",
+            "total": 0,
+            "completed": 0,
+            "rendered": 0,
+            "cached": 0,
+            "failed": 0,
+            "current_language": None,
+            "started": None,
+            "finished": None
+        }
+
+    def start(self):
+        """Start the warm-up thread (idempotent)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self.progress["state"] = "pending"
+            self._thread = threading.Thread(target=self._run, name="tts-warmup", daemon=True)
+            self._thread.start()
+
+    def _update(self, **changes):
+        with self._lock:
+            self.progress.update(changes)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.progress[key] += amount
+            self.progress["completed"] += amount
+
+    def _run(self):
+        time.sleep(self.delay_seconds)
+        try:
+            self.run()
+        except Exception as e:
+            print(f"❌ [TTS_WARMUP] Failed: {e}")
+            self._update(state="failed", finished=time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+    def run(self):
+        """Render every configured phrase that is not already an artifact."""
+        dashboard = AdminDashboard()
+        settings = dashboard.get_tts_warmup_settings()
+        if not settings.get("enabled", True):
+            self._update(state="disabled")
+            return
+
+        backends = planned_backends()
+        audio_format = DEFAULT_AUDIO_FORMAT
+        languages = settings.get("languages") or list(GREETINGS)
+        plan = {
+            language: collect_phrases(language, settings.get("phrases", {}).get(language))
+            for language in languages
+        }
+        self._update(
+            state="running", total=sum(len(phrases) for phrases in plan.values()),
+            completed=0, rendered=0, cached=0, failed=0,
+            started=time.strftime('%Y-%m-%dT%H:%M:%S'), finished=None
+        )
+        print(f"🔥 [TTS_WARMUP] Warming {self.progress['total']} phrases in {len(plan)} languages ({backends[0]}, {audio_format})")
+
+        index = get_artifact_index()
+        os.makedirs('tts_output', exist_ok=True)
+        for language, phrases in plan.items():
+            self._update(current_language=language)
+            todo = []
+            for phrase in phrases:
+                filename, _ = index.find_tts(backends, language, audio_format, phrase)
+                if filename:
+                    self._count("cached")
+                else:
+                    filename = tts_filename(backends[0], language, audio_format, phrase)
+                    todo.append((phrase, language, os.path.join('tts_output', filename)))
+
+            for start in range(0, len(todo), self.batch_size):
+                batch = todo[start:start + self.batch_size]
+                for (phrase, _, _), result in zip(batch, synthesize_many(batch, audio_format)):
+                    if result.get("success") and not result.get("placeholder"):
+                        index.publish(result, phrase, language)
+                        self._count("rendered")
+                    else:
+                        # Silence and placeholder tones must not be served as the phrase's audio
+                        if result.get("output_path"):
+                            try:
+                                os.remove(result["output_path"])
+                            except OSError:
+                                pass
+                        self._count("failed")
+
+        self._update(state="done", current_language=None, finished=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        print(f"🔥 [TTS_WARMUP] Done: {self.progress['rendered']} rendered, "
+              f"{self.progress['cached']} already cached, {self.progress['failed']} failed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return warm-up progress."""
+        with self._lock:
+            return dict(self.progress)
+
+
+# Global warm-up instance
+tts_warmup = None
+
+def get_tts_warmup() -> TTSWarmup:
+    """Get or create the global warm-up instance."""
+    global tts_warmup
+    if tts_warmup is None:
+        tts_warmup = TTSWarmup()
+    return tts_warmup